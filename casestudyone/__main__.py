@@ -0,0 +1,5 @@
+import sys
+
+from casestudyone.python.Cli import main
+
+sys.exit(main())
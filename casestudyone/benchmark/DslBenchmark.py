@@ -0,0 +1,110 @@
+import argparse
+import json
+import platform
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from casestudyone.python.FastRegexParser import FastRegexParser
+from casestudyone.python.RegexEmitter import RegexEmitter
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.test.RuleGenerator import RuleGenerator, RuleShape
+
+SCENARIOS: Dict[str, RuleShape] = {
+    'small': RuleShape(alternatives=2, clauses=1),
+    'wide': RuleShape(alternatives=12, clauses=2, predefined=0.05),
+    'long': RuleShape(alternatives=3, clauses=20, predefined=0.02),
+    'nested': RuleShape(alternatives=3, depth=2, clauses=2, predefined=0.05),
+    'quantified': RuleShape(alternatives=4, clauses=5, occurs=(2, 6), quantified=0.9, predefined=0.0),
+}
+
+# Every metric is microseconds per rule, or per text for matching, so lower is better for all of them.
+METRICS = ('parse_us', 'parsy_parse_us', 'translate_us', 'compile_us', 'match_us')
+
+
+def best_of(repeat: int, run: Callable[[], None], prepare: Callable[[], None] = lambda: None) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        prepare()
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(shape: RuleShape, rule_count: int, text_count: int, repeat: int) -> Dict[str, float]:
+    generator = RuleGenerator(shape)
+    rules = generator.rules(rule_count)
+    trees = [FastRegexParser.parse_ast(rule) for rule in rules]
+    regexes = [RegexEmitter.emit(tree) for tree in trees]
+    patterns = [re.compile(regex) for regex in regexes]
+    corpora = [generator.corpus(regex, text_count) for regex in regexes]
+
+    def match_all():
+        for pattern, texts in zip(patterns, corpora):
+            for text in texts:
+                pattern.fullmatch(text)
+
+    microseconds = 1e6 / rule_count
+    return {
+        'parse_us': microseconds * best_of(repeat, lambda: list(map(FastRegexParser.parse_ast, rules))),
+        'parsy_parse_us': microseconds * best_of(repeat, lambda: list(map(RegexParser.rule_parser.parse, rules))),
+        # Clause translations are cached, so the cache is cleared to time the translation itself.
+        'translate_us': microseconds * best_of(repeat, lambda: list(map(RegexEmitter.emit, trees)),
+                                               RegexEmitter.cache_clear),
+        'compile_us': microseconds * best_of(repeat, lambda: list(map(re.compile, regexes)), re.purge),
+        'match_us': 1e6 / (rule_count * text_count) * best_of(repeat, match_all),
+        'rule_chars': sum(map(len, rules)) / rule_count,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    regressions = []
+    for scenario, metrics in results.items():
+        for metric in METRICS:
+            before = baseline.get(scenario, {}).get(metric)
+            if before and metrics[metric] > before * (1 + tolerance):
+                regressions.append('{0} {1}: {2:.2f} -> {3:.2f} ({4:+.0%})'.format(
+                    scenario, metric, before, metrics[metric], metrics[metric] / before - 1))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Time parsing, translation, compilation and matching of generated DSL rules.')
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--rules', type=int, default=200, help='rules per scenario')
+    parser.add_argument('--texts', type=int, default=50, help='texts matched against every rule')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='a JSON file written by an earlier --output to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='slowdown of a metric against the baseline that counts as a regression')
+    arguments = parser.parse_args(argv)
+
+    results = {}
+    print('{0:<12}{1:>10}{2:>16}{3:>14}{4:>12}{5:>10}'.format('scenario', *METRICS))
+    for scenario in arguments.scenarios:
+        results[scenario] = measure(SCENARIOS[scenario], arguments.rules, arguments.texts, arguments.repeat)
+        print('{0:<12}{1:>10.1f}{2:>16.1f}{3:>14.1f}{4:>12.1f}{5:>10.2f}'.format(
+            scenario, *(results[scenario][metric] for metric in METRICS)))
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'rules': arguments.rules, 'texts': arguments.texts,
+                       'shapes': {scenario: SCENARIOS[scenario]._asdict() for scenario in results},
+                       'results': results}, file, indent=2)
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            regressions = compare(results, json.load(file)['results'], arguments.tolerance)
+        for regression in regressions:
+            print('regression: ' + regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import argparse
+import time
+from typing import Callable, List
+
+from casestudyone.python.FastRegexParser import FastRegexParser
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.test.RuleGenerator import RuleGenerator, RuleShape
+
+
+def measure(parse: Callable[[str], str], rules: List[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for rule in rules:
+            parse(rule)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the parsy grammar with the hand-written parser.')
+    parser.add_argument('--rules', type=int, default=2000)
+    parser.add_argument('--clauses', type=int, default=10)
+    parser.add_argument('--alternatives', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    shape = RuleShape(alternatives=arguments.alternatives, depth=2, clauses=arguments.clauses, varied=True)
+    rules = RuleGenerator(shape).rules(arguments.rules)
+    for rule in rules:
+        assert FastRegexParser.parse(rule) == RegexParser.regex_parser.parse(rule), rule
+
+    size = sum(len(rule) for rule in rules)
+    parsy_seconds = measure(RegexParser.regex_parser.parse, rules, arguments.repeat)
+    fast_seconds = measure(FastRegexParser.parse, rules, arguments.repeat)
+    print("{0} rules, {1:,} characters".format(len(rules), size))
+    print("parsy:        {0:8.3f}s  {1:12,.0f} chars/sec".format(parsy_seconds, size / parsy_seconds))
+    print("hand-written: {0:8.3f}s  {1:12,.0f} chars/sec".format(fast_seconds, size / fast_seconds))
+    print("speedup:      {0:8.1f}x".format(parsy_seconds / fast_seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from casestudyone.python.RuleClient import RuleClient
+from casestudyone.python.RuleService import RuleService
+
+RULES = {
+    'error': 'starts with "ERROR"\nfollowed with anything\nends with "failed" or "timeout"',
+    'email': 'starts with something\nfollowed with "@"\nfollowed with something\nfollowed with "."\n'
+             'ends with "com" or "de" or "net"',
+}
+TEXTS = ['ERROR disk failed', 'INFO user login', 'name@gmx.de', 'ERROR memory timeout', 'nobody@example.ch']
+
+
+def percentile(latencies, share: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+async def measure(arguments: argparse.Namespace):
+    service = RuleService(RULES, workers=arguments.workers)
+    service.compile_rules()
+    with tempfile.TemporaryDirectory() as directory:
+        server = await service.start_unix(os.path.join(directory, 'rules.sock'))
+        client = await RuleClient.connect_unix(os.path.join(directory, 'rules.sock'))
+        rules = list(RULES)
+        latencies = []
+        for index in range(arguments.warmup + arguments.requests):
+            started = time.perf_counter()
+            await client.match(TEXTS[index % len(TEXTS)], rule=rules[index % len(rules)])
+            if index >= arguments.warmup:
+                latencies.append((time.perf_counter() - started) * 1e6)
+        print("single requests: p50 {0:.0f} µs, p99 {1:.0f} µs, mean {2:.0f} µs".format(
+            percentile(latencies, 0.5), percentile(latencies, 0.99), statistics.mean(latencies)))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client.match(TEXTS[index % len(TEXTS)], rule='error')
+                               for index in range(arguments.requests)))
+        seconds = time.perf_counter() - started
+        print("{0} concurrent requests: {1:.0f} matches/s in {2} batches".format(
+            arguments.requests, arguments.requests / seconds, service.requests - arguments.warmup - arguments.requests))
+
+        await client.close()
+        server.close()
+        await server.wait_closed()
+    service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the latency of a warm RuleService over a unix socket.')
+    parser.add_argument('--requests', type=int, default=10_000)
+    parser.add_argument('--warmup', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    asyncio.run(measure(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import random
+import time
+from typing import List
+
+from casestudyone.python.DslCompiler import DslCompiler
+from casestudyone.python.RuleSet import RuleSet
+from casestudyone.test.RuleGenerator import RuleGenerator, RuleShape
+
+WORDS = ['ERROR', 'WARN', 'INFO', 'disk', 'memory', 'timeout', 'user', 'admin', 'login', 'failed', 'ok', 'retry']
+# Rules over the words of the records, most of whose items are literals.
+RULE_SHAPE = RuleShape(alternatives=2, clauses=2, quantified=0.0, predefined=0.1, words=tuple(WORDS + [' ']))
+
+
+def generate_records(count: int, generator: random.Random) -> List[str]:
+    return [' '.join(generator.choice(WORDS + ['42', 'x']) for _ in range(generator.randint(2, 8)))
+            for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare RuleSet with one re.fullmatch call per rule.')
+    parser.add_argument('--records', type=int, default=2000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    arguments = parser.parse_args()
+
+    generator = random.Random(3)
+    records = generate_records(arguments.records, generator)
+    warm_up = generate_records(arguments.records, random.Random(4))
+    print("{0:>6} {1:>12} {2:>14} {3:>8} {4:>12}".format('rules', 'naive rec/s', 'ruleset rec/s', 'speedup',
+                                                        'warm-up s'))
+    for size in arguments.sizes:
+        rules = {'rule{0}'.format(index): dsl
+                 for index, dsl in enumerate(RuleGenerator(RULE_SHAPE, seed=size).rules(size))}
+        patterns = [(name, DslCompiler.compile_dsl(dsl)) for name, dsl in rules.items()]
+
+        # Range patterns are compiled on first use; warm them up on other records so only matching is timed.
+        started = time.perf_counter()
+        rule_set = RuleSet(rules)
+        for record in warm_up:
+            rule_set.matches(record)
+        warm_up_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        naive = [[name for name, pattern in patterns if pattern.fullmatch(record)] for record in records]
+        naive_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        combined = [rule_set.matches(record) for record in records]
+        combined_seconds = time.perf_counter() - started
+
+        assert naive == combined
+        print("{0:>6} {1:>12,.0f} {2:>14,.0f} {3:>7.1f}x {4:>12.2f}".format(
+            size, len(records) / naive_seconds, len(records) / combined_seconds, naive_seconds / combined_seconds,
+            warm_up_seconds))
+
+
+if __name__ == '__main__':
+    main()
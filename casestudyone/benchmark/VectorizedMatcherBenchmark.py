@@ -0,0 +1,54 @@
+import argparse
+import random
+import re
+import time
+
+import pandas as pd
+
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.python.VectorizedMatcher import VectorizedMatcher
+
+WORDS = ['ERROR', 'WARN', 'INFO', 'disk', 'memory', 'user', 'login', 'failed', 'ok', '42', 'x']
+RULES = {
+    'common literal': 'starts with "ERROR"\nfollowed with anything\nends with "failed"',
+    'rare literal': 'followed with anything\nfollowed with "disk timeout"\nends with anything',
+    'no literal': 'starts with letters\nfollowed with numbers\nends with anything',
+}
+
+
+def generate_column(rows: int, missing: float, seed: int = 11) -> pd.Series:
+    generator = random.Random(seed)
+    return pd.Series([' '.join(generator.choice(WORDS) for _ in range(generator.randint(2, 8)))
+                      if generator.random() >= missing else None for _ in range(rows)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare VectorizedMatcher with Series.apply(re.fullmatch).')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--missing', type=float, default=0.01, help='share of missing entries')
+    arguments = parser.parse_args()
+
+    column = generate_column(arguments.rows, arguments.missing)
+    print("{0:<16}{1:>10}{2:>16}{3:>12}{4:>9}".format('rule', 'apply s', 'str.fullmatch s', 'vector s', 'speedup'))
+    for name, dsl in RULES.items():
+        regex = RegexParser.regex_parser.parse(dsl)
+
+        started = time.perf_counter()
+        naive = column.apply(lambda value: isinstance(value, str) and re.fullmatch(regex, value) is not None)
+        naive_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        column.str.fullmatch(regex, na=False)
+        pandas_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        vectorized = VectorizedMatcher(dsl).mask(column)
+        vectorized_seconds = time.perf_counter() - started
+
+        assert naive.tolist() == vectorized.tolist(), name
+        print("{0:<16}{1:>10.2f}{2:>16.2f}{3:>12.2f}{4:>8.1f}x".format(
+            name, naive_seconds, pandas_seconds, vectorized_seconds, naive_seconds / vectorized_seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+from casestudyone.python.DslAst import Alternation, EndsWith, FollowedWith, InnerRegex, Item, Predefined, \
+    Quantified, Rule, StartsWith, Term, intern
+
+
+class AstBuilder:
+    @staticmethod
+    def build_term(term: str, quantification: Optional[str]) -> Item:
+        node = intern(Term(term[1:-1]))
+        if quantification is not None:
+            return intern(Quantified(node, quantification))
+        return node
+
+    @staticmethod
+    def build_predefined(name: str) -> Predefined:
+        return intern(Predefined(name))
+
+    @staticmethod
+    def build_alternation(content: List[Item]) -> Alternation:
+        return intern(Alternation(tuple(content)))
+
+    @staticmethod
+    def build_inner_regex(followed_with: List[FollowedWith]) -> InnerRegex:
+        return intern(InnerRegex(tuple(followed_with)))
+
+    @staticmethod
+    def starts_with_builder(content: List[Item]) -> StartsWith:
+        return intern(StartsWith(AstBuilder.build_alternation(content)))
+
+    @staticmethod
+    def followed_with_builder(content: List[Item]) -> FollowedWith:
+        return intern(FollowedWith(AstBuilder.build_alternation(content)))
+
+    @staticmethod
+    def ends_with_builder(content: List[Item]) -> EndsWith:
+        return intern(EndsWith(AstBuilder.build_alternation(content)))
+
+    @staticmethod
+    def build_rule(starts_with_opt: Optional[StartsWith], followed_with_opt: Optional[List[FollowedWith]],
+                   ends_with_opt: Optional[EndsWith]) -> Rule:
+        return intern(Rule(starts_with_opt, tuple(followed_with_opt or ()), ends_with_opt))
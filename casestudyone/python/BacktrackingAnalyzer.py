@@ -0,0 +1,247 @@
+import math
+from typing import List, NamedTuple, Optional, Tuple
+
+from casestudyone.python.CharSet import CharSet, EMPTY
+from casestudyone.python.RegexSyntaxTree import Alternation, Anchor, Group, Node, RegexSyntaxTree, Repeat, Sequence, \
+    SINGLE_CHARACTER_NODES
+
+LINEAR = 'linear'
+POLYNOMIAL = 'polynomial'
+EXPONENTIAL = 'exponential'
+
+NESTED_QUANTIFIERS = 'nested quantifiers'
+ADJACENT_QUANTIFIERS = 'adjacent quantifiers'
+
+
+class Finding(NamedTuple):
+    kind: str
+    fragment: str
+    message: str
+
+
+class BacktrackingReport(NamedTuple):
+    pattern: str
+    complexity: str
+    degree: Optional[int]
+    findings: Tuple[Finding, ...]
+
+    @property
+    def bound(self) -> str:
+        # Steps of one failing match attempt at a fixed position; search adds a factor n for the start positions.
+        if self.complexity == EXPONENTIAL:
+            return 'O(2^n)'
+        return 'O(n)' if self.degree == 1 else 'O(n^{0})'.format(self.degree)
+
+    def __str__(self):
+        lines = ['{0} {1}: {2}'.format(self.complexity, self.bound, self.pattern)]
+        lines.extend('  {0} at {1}: {2}'.format(finding.kind, finding.fragment, finding.message)
+                     for finding in self.findings)
+        return '\n'.join(lines)
+
+
+class BacktrackingAnalyzer:
+    """Static worst case analysis of backtracking in generated patterns, and a rewrite that removes the
+    backtracking which can never lead to a match.
+
+    Two quantifiers that can both consume the same characters, with only such characters between them, can
+    split an input in O(n) ways each, so a chain of k of them costs O(n^k) when the rest of the pattern fails.
+    An unbounded repetition whose body can end in a quantifier that may also start the next iteration can split
+    the input in exponentially many ways. Both are reported conservatively: a finding means the shape is there,
+    not that every input triggers it.
+    """
+
+    @staticmethod
+    def analyze(regex: str) -> BacktrackingReport:
+        tree = RegexSyntaxTree.parse(regex)
+        findings: List[Finding] = []
+        degree = max(1, BacktrackingAnalyzer.degree(tree, findings))
+        if degree == math.inf:
+            return BacktrackingReport(regex, EXPONENTIAL, None, tuple(findings))
+        return BacktrackingReport(regex, POLYNOMIAL if degree > 1 else LINEAR, degree, tuple(findings))
+
+    @staticmethod
+    def degree(node: Node, findings: List[Finding]) -> float:
+        if isinstance(node, Sequence):
+            return BacktrackingAnalyzer.sequence_degree(BacktrackingAnalyzer.flatten(node.items), findings)
+        if isinstance(node, Alternation):
+            return max(BacktrackingAnalyzer.degree(branch, findings) for branch in node.branches)
+        if isinstance(node, Group):
+            return BacktrackingAnalyzer.degree(node.body, findings)
+        if isinstance(node, Repeat):
+            inner = BacktrackingAnalyzer.degree(node.body, findings)
+            if BacktrackingAnalyzer.is_unbounded(node) and BacktrackingAnalyzer.ambiguous_iteration(
+                    BacktrackingAnalyzer.flatten(RegexSyntaxTree.sequence_items(node.body)),
+                    BacktrackingAnalyzer.first(node.body)[0]):
+                findings.append(Finding(
+                    NESTED_QUANTIFIERS, RegexSyntaxTree.emit(node),
+                    'one repetition can end where the next begins, so the input splits in exponentially many ways'))
+                return math.inf
+            return inner
+        return 0
+
+    @staticmethod
+    def sequence_degree(items: Tuple[Node, ...], findings: List[Finding]) -> float:
+        best = max((BacktrackingAnalyzer.degree(item, findings) for item in items), default=0)
+        chain, previous, previous_chars, gap = 0, None, EMPTY, EMPTY
+        for item in items:
+            loose = BacktrackingAnalyzer.loose_chars(item)
+            if not loose:
+                gap = gap.union(BacktrackingAnalyzer.chars(item))
+                continue
+            if previous is not None and gap.issubset(previous_chars) and previous_chars.intersects(loose) \
+                    and previous_chars.intersects(BacktrackingAnalyzer.first(item)[0]):
+                chain += 1
+                findings.append(Finding(
+                    ADJACENT_QUANTIFIERS, RegexSyntaxTree.emit(previous) + ' ... ' + RegexSyntaxTree.emit(item),
+                    'both quantifiers can consume the same characters, so every split between them is tried'))
+            else:
+                chain = 1
+            best = max(best, chain)
+            previous, previous_chars, gap = item, loose, EMPTY
+        return best
+
+    @staticmethod
+    def ambiguous_iteration(items: Tuple[Node, ...], body_first: CharSet) -> bool:
+        # True if an unbounded quantifier, followed by nothing that it could not consume itself, can also consume
+        # the first character of the next iteration.
+        for index, item in enumerate(items):
+            if isinstance(item, Group) and isinstance(item.body, Alternation) and not item.atomic:
+                if any(BacktrackingAnalyzer.ambiguous_iteration(
+                        BacktrackingAnalyzer.flatten(branch.items) + items[index + 1:], body_first)
+                        for branch in item.body.branches):
+                    return True
+            elif BacktrackingAnalyzer.is_unbounded(item) and not item.possessive:
+                body_chars = BacktrackingAnalyzer.chars(item.body)
+                rest = Sequence(items[index + 1:])
+                if body_chars.intersects(body_first) and (BacktrackingAnalyzer.first(rest)[1]
+                                                          or BacktrackingAnalyzer.chars(rest).issubset(body_chars)):
+                    return True
+        return False
+
+    @staticmethod
+    def flatten(items: Tuple[Node, ...]) -> Tuple[Node, ...]:
+        # Groups only capture, they do not change how the engine backtracks, so their sequences are spliced in.
+        result: List[Node] = []
+        for item in items:
+            if isinstance(item, Group) and not item.atomic and isinstance(item.body, Sequence):
+                result.extend(BacktrackingAnalyzer.flatten(item.body.items))
+            else:
+                result.append(item)
+        return tuple(result)
+
+    @staticmethod
+    def is_unbounded(node: Node) -> bool:
+        return isinstance(node, Repeat) and node.max is None
+
+    @staticmethod
+    def loose_chars(node: Node) -> CharSet:
+        # Characters consumed by unbounded quantifiers in the node that the engine may backtrack into.
+        if BacktrackingAnalyzer.is_unbounded(node) and not node.possessive:
+            return BacktrackingAnalyzer.chars(node.body)
+        if isinstance(node, Group) and node.atomic or isinstance(node, Repeat) and node.possessive:
+            return EMPTY
+        result = EMPTY
+        for child in RegexSyntaxTree.children(node):
+            result = result.union(BacktrackingAnalyzer.loose_chars(child))
+        return result
+
+    @staticmethod
+    def chars(node: Node) -> CharSet:
+        if isinstance(node, SINGLE_CHARACTER_NODES):
+            return CharSet.of_node(node)
+        result = EMPTY
+        for child in RegexSyntaxTree.children(node):
+            result = result.union(BacktrackingAnalyzer.chars(child))
+        return result
+
+    @staticmethod
+    def first(node: Node) -> Tuple[CharSet, bool]:
+        # The characters a match of the node can start with, and whether it can match the empty string.
+        # $ also matches before a final newline, so it is counted as possibly followed by one.
+        if isinstance(node, SINGLE_CHARACTER_NODES):
+            return CharSet.of_node(node), False
+        if isinstance(node, Anchor):
+            return (CharSet.of_chars('\n') if node.kind == '$' else EMPTY), True
+        if isinstance(node, Sequence):
+            result = EMPTY
+            for item in node.items:
+                item_first, nullable = BacktrackingAnalyzer.first(item)
+                result = result.union(item_first)
+                if not nullable:
+                    return result, False
+            return result, True
+        if isinstance(node, Alternation):
+            result, any_nullable = EMPTY, False
+            for branch in node.branches:
+                branch_first, nullable = BacktrackingAnalyzer.first(branch)
+                result, any_nullable = result.union(branch_first), any_nullable or nullable
+            return result, any_nullable
+        if isinstance(node, Group):
+            return BacktrackingAnalyzer.first(node.body)
+        if isinstance(node, Repeat):
+            body_first, nullable = BacktrackingAnalyzer.first(node.body)
+            return body_first, nullable or node.min == 0
+        raise TypeError("not a regex syntax node: {0!r}".format(node))
+
+    @staticmethod
+    def rewrite(regex: str) -> str:
+        """Makes quantifiers possessive and alternations atomic where backtracking into them can never
+        succeed: the characters they could give back cannot start whatever follows them."""
+        tree = RegexSyntaxTree.parse(regex)
+        return RegexSyntaxTree.emit(BacktrackingAnalyzer.rewrite_node(tree, EMPTY))
+
+    @staticmethod
+    def rewrite_node(node: Node, follow: CharSet) -> Node:
+        # follow holds every character that can come right after the node, including the first character of
+        # whatever encloses it; characters after the end of the pattern never help a match, so they are left out.
+        if isinstance(node, Sequence):
+            items: List[Node] = []
+            for item in reversed(node.items):
+                items.insert(0, BacktrackingAnalyzer.rewrite_node(item, follow))
+                item_first, nullable = BacktrackingAnalyzer.first(item)
+                follow = item_first.union(follow) if nullable else item_first
+            return Sequence(tuple(items))
+        if isinstance(node, Alternation):
+            return Alternation(tuple(BacktrackingAnalyzer.rewrite_node(branch, follow) for branch in node.branches))
+        if isinstance(node, Group):
+            body = BacktrackingAnalyzer.rewrite_node(node.body, follow)
+            if node.atomic or not BacktrackingAnalyzer.is_exclusive_alternation(body):
+                return Group(body, node.capturing, node.name, node.atomic)
+            if node.capturing:
+                return Group(Group(body, capturing=False, atomic=True), node.capturing, node.name)
+            return Group(body, capturing=False, atomic=True)
+        if isinstance(node, Repeat):
+            body_first, body_nullable = BacktrackingAnalyzer.first(node.body)
+            inner_follow = follow.union(body_first) if node.max is None or node.max > 1 else follow
+            body = BacktrackingAnalyzer.rewrite_node(node.body, inner_follow)
+            possessive = node.possessive or (
+                    not node.lazy and node.min != node.max and not body_nullable
+                    and not body_first.intersects(follow) and BacktrackingAnalyzer.is_deterministic(body))
+            return Repeat(body, node.min, node.max, node.lazy, possessive, node.source)
+        return node
+
+    @staticmethod
+    def is_exclusive_alternation(node: Node) -> bool:
+        # At most one branch can start at any position and each branch matches in at most one way.
+        if not isinstance(node, Alternation):
+            return False
+        seen = EMPTY
+        for branch in node.branches:
+            branch_first, nullable = BacktrackingAnalyzer.first(branch)
+            if nullable or seen.intersects(branch_first) or not BacktrackingAnalyzer.is_deterministic(branch):
+                return False
+            seen = seen.union(branch_first)
+        return True
+
+    @staticmethod
+    def is_deterministic(node: Node) -> bool:
+        # True if the node can match in at most one way from a given position, so the engine never re-enters it.
+        if isinstance(node, Sequence):
+            return all(BacktrackingAnalyzer.is_deterministic(item) for item in node.items)
+        if isinstance(node, Alternation):
+            return False
+        if isinstance(node, Group):
+            return node.atomic or BacktrackingAnalyzer.is_deterministic(node.body)
+        if isinstance(node, Repeat):
+            return node.possessive or (node.min == node.max and BacktrackingAnalyzer.is_deterministic(node.body))
+        return True
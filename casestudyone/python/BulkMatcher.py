@@ -0,0 +1,114 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, TextIO, Union
+
+from casestudyone.python.DslCompiler import DslCompiler
+
+MATCH_MODES = ('fullmatch', 'search')
+
+_worker_match = None
+
+
+def _init_worker(dsl: str, mode: str):
+    global _worker_match
+    _worker_match = getattr(DslCompiler.compile_rule(dsl), mode)
+
+
+def _match_chunk(lines: List[str]) -> List[bool]:
+    return [_worker_match(line) is not None for line in lines]
+
+
+class LineResult(NamedTuple):
+    line_number: int
+    line: str
+    matched: bool
+
+
+class MatchStats:
+    def __init__(self):
+        self.lines = 0
+        self.matches = 0
+        self.seconds = 0.0
+
+    @property
+    def lines_per_second(self) -> float:
+        return self.lines / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self):
+        return "{0} lines, {1} matches in {2:.3f}s ({3:,.0f} lines/sec)".format(
+            self.lines, self.matches, self.seconds, self.lines_per_second)
+
+
+class BulkMatcher:
+    def __init__(self, dsl: str, mode: str = 'fullmatch', processes: Optional[int] = None,
+                 chunk_size: int = 10_000, max_pending_chunks: Optional[int] = None):
+        if mode not in MATCH_MODES:
+            raise ValueError("mode must be one of {0}, got {1!r}".format(MATCH_MODES, mode))
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1, got {0}".format(chunk_size))
+        # Translate in the parent first so that DSL errors surface before any worker is started.
+        self.match_line = getattr(DslCompiler.compile_rule(dsl), mode)
+        self.dsl = dsl
+        self.mode = mode
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+        self.stats = MatchStats()
+
+    def match_lines(self, lines: Iterable[str]) -> Iterator[LineResult]:
+        self.stats = MatchStats()
+        started = time.perf_counter()
+        line_number = 0
+        try:
+            for chunk, matches in self._match_chunks(BulkMatcher._strip_newlines(lines)):
+                for line, matched in zip(chunk, matches):
+                    line_number += 1
+                    yield LineResult(line_number, line, matched)
+                self.stats.lines += len(chunk)
+                self.stats.matches += sum(matches)
+        finally:
+            self.stats.seconds = time.perf_counter() - started
+
+    def matching_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        return (result.line for result in self.match_lines(lines) if result.matched)
+
+    def match_file(self, file: Union[str, TextIO], encoding: str = 'utf-8') -> Iterator[LineResult]:
+        if not isinstance(file, str):
+            yield from self.match_lines(file)
+            return
+        with open(file, encoding=encoding, newline='') as text:
+            yield from self.match_lines(text)
+
+    def _match_chunks(self, lines: Iterable[str]):
+        chunks = BulkMatcher._chunked(lines, self.chunk_size)
+        if self.processes is not None and self.processes <= 1:
+            for chunk in chunks:
+                yield chunk, [self.match_line(line) is not None for line in chunk]
+            return
+
+        workers = self.processes or os.cpu_count() or 1
+        max_pending = self.max_pending_chunks or 2 * workers
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.dsl, self.mode)) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(_match_chunk, chunk)))
+                if len(pending) >= max_pending:
+                    chunk, future = pending.popleft()
+                    yield chunk, future.result()
+            while pending:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+
+    @staticmethod
+    def _chunked(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+        iterator = iter(lines)
+        while chunk := list(islice(iterator, size)):
+            yield chunk
+
+    @staticmethod
+    def _strip_newlines(lines: Iterable[str]) -> Iterator[str]:
+        return (line.rstrip('\r\n') for line in lines)
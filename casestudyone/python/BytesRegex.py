@@ -0,0 +1,135 @@
+import re
+from typing import List, Tuple
+
+from casestudyone.python.CharSet import CharSet
+from casestudyone.python.RegexSyntaxTree import Alternation, Anchor, Group, Node, RegexSyntaxTree, Repeat, Sequence, \
+    SINGLE_CHARACTER_NODES
+
+ByteRanges = List[Tuple[int, int]]
+
+# Every scalar value that has a UTF-8 encoding of more than one byte, i.e. all of them above ASCII but surrogates.
+NON_ASCII = CharSet([(0x80, 0xD7FF), (0xE000, 0x10FFFF)])
+NEVER = '(?!)'
+SINGLE_BYTE_PATTERN: re.Pattern = re.compile(r'\[[^\]]*\]|\\x[0-9a-f]{2}|[0-9A-Za-z]')
+
+
+class BytesRegex:
+    """Translates a generated str pattern into a bytes pattern over UTF-8 input that matches the same texts.
+
+    Characters become their UTF-8 byte sequences and classes become alternations of byte ranges, so \\d, \\s
+    and \\w keep their Unicode meaning. Only a greedy unbounded repetition of a class that contains every
+    non-ASCII character is relaxed to a byte class: on valid UTF-8 it stops at the same character boundaries
+    and sre runs a byte class much faster than the alternation. In line mode no node can consume a newline,
+    and ^/$ are meant to be compiled with re.MULTILINE.
+    """
+
+    @staticmethod
+    def translate(regex: str, line_mode: bool = False) -> bytes:
+        return BytesRegex.emit(RegexSyntaxTree.parse(regex), line_mode).encode('ascii')
+
+    @staticmethod
+    def emit(node: Node, line_mode: bool) -> str:
+        if isinstance(node, SINGLE_CHARACTER_NODES):
+            return BytesRegex.emit_char_set(BytesRegex.char_set(node, line_mode))
+        if isinstance(node, Anchor):
+            return node.kind
+        if isinstance(node, Sequence):
+            return ''.join(BytesRegex.emit(item, line_mode) for item in node.items)
+        if isinstance(node, Alternation):
+            return '|'.join(BytesRegex.emit(branch, line_mode) for branch in node.branches)
+        if isinstance(node, Group):
+            if node.atomic:
+                prefix = '(?>'
+            elif node.name is not None:
+                prefix = '(?P<{0}>'.format(node.name)
+            else:
+                prefix = '(' if node.capturing else '(?:'
+            return prefix + BytesRegex.emit(node.body, line_mode) + ')'
+        if isinstance(node, Repeat):
+            if isinstance(node.body, SINGLE_CHARACTER_NODES):
+                char_set = BytesRegex.char_set(node.body, line_mode)
+                ascii_ranges = BytesRegex.ascii_ranges(char_set)
+                if node.max is None and not node.lazy and NON_ASCII.issubset(char_set):
+                    body = BytesRegex.emit_byte_class(ascii_ranges + [(0x80, 0xFF)])
+                elif node.max is None and not node.lazy and not node.possessive and node.min <= 1 and ascii_ranges \
+                        and char_set.intersects(NON_ASCII):
+                    # (?:a|m)* loops through the engine once per character. a*(?:ma*)* matches the same, with
+                    # the same greedy order, but runs of ASCII go through the fast single class repeat.
+                    ascii_class = BytesRegex.emit_byte_class(ascii_ranges)
+                    multi_byte = BytesRegex.emit_char_set(char_set.intersection(NON_ASCII))
+                    unrolled = '{0}*(?:{1}{0}*)*'.format(ascii_class, multi_byte)
+                    if node.min == 1:
+                        unrolled = '(?:{0}|{1}){2}'.format(ascii_class, multi_byte, unrolled)
+                    return '(?:{0})'.format(unrolled)
+                else:
+                    body = BytesRegex.emit_char_set(char_set)
+                if not SINGLE_BYTE_PATTERN.fullmatch(body):
+                    body = '(?:{0})'.format(body)
+            else:
+                body = BytesRegex.emit(node.body, line_mode)
+                if not RegexSyntaxTree.is_atom(node.body):
+                    body = '(?:{0})'.format(body)
+            return body + RegexSyntaxTree.emit_quantifier(node)
+        raise TypeError("not a regex syntax node: {0!r}".format(node))
+
+    @staticmethod
+    def char_set(node: Node, line_mode: bool) -> CharSet:
+        char_set = CharSet.of_node(node)
+        return char_set.intersection(CharSet.of_chars('\n').complement()) if line_mode else char_set
+
+    @staticmethod
+    def emit_char_set(char_set: CharSet) -> str:
+        if len(char_set.intervals) == 1 and char_set.intervals[0][0] == char_set.intervals[0][1]:
+            return ''.join(BytesRegex.escape_byte(byte) for byte in chr(char_set.intervals[0][0]).encode('utf-8'))
+        branches = []
+        ascii_ranges = BytesRegex.ascii_ranges(char_set)
+        if ascii_ranges:
+            branches.append(BytesRegex.emit_byte_class(ascii_ranges))
+        for low, high in char_set.intersection(NON_ASCII).intervals:
+            for sequence in utf8_sequences(low, high):
+                branches.append(''.join(BytesRegex.emit_byte_class([byte_range]) for byte_range in sequence))
+        if not branches:
+            return NEVER
+        return branches[0] if len(branches) == 1 else '(?:{0})'.format('|'.join(branches))
+
+    @staticmethod
+    def ascii_ranges(char_set: CharSet) -> ByteRanges:
+        return list(char_set.intersection(CharSet([(0, 0x7F)])).intervals)
+
+    @staticmethod
+    def emit_byte_class(ranges: ByteRanges) -> str:
+        if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+            return BytesRegex.escape_byte(ranges[0][0])
+        return '[{0}]'.format(''.join(
+            '\\x{0:02x}'.format(low) if low == high else '\\x{0:02x}-\\x{1:02x}'.format(low, high)
+            for low, high in ranges))
+
+    @staticmethod
+    def escape_byte(byte: int) -> str:
+        return chr(byte) if chr(byte).isalnum() and byte < 0x80 else '\\x{0:02x}'.format(byte)
+
+
+def utf8_sequences(low: int, high: int) -> List[ByteRanges]:
+    # Splits a range of scalar values into ranges whose UTF-8 encodings are byte-wise ranges of equal length,
+    # e.g. U+0080..U+07FF is [\xc2-\xdf][\x80-\xbf].
+    result: List[ByteRanges] = []
+    pending = [(low, high)]
+    while pending:
+        low, high = pending.pop()
+        split = next((boundary for boundary in (0x7F, 0x7FF, 0xFFFF) if low <= boundary < high), None)
+        if split is not None:
+            pending.extend([(split + 1, high), (low, split)])
+            continue
+        for continuation_bytes in (1, 2, 3):
+            mask = (1 << (6 * continuation_bytes)) - 1
+            if low & ~mask != high & ~mask:
+                if low & mask:
+                    pending.extend([((low | mask) + 1, high), (low, low | mask)])
+                    break
+                if high & mask != mask:
+                    pending.extend([(high & ~mask, high), (low, (high & ~mask) - 1)])
+                    break
+        else:
+            encoded_low, encoded_high = chr(low).encode('utf-8'), chr(high).encode('utf-8')
+            result.append(list(zip(encoded_low, encoded_high)))
+    return result
@@ -0,0 +1,102 @@
+import re
+import sys
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+from casestudyone.python.RegexSyntaxTree import AnyChar, CharClass, Literal, Node
+
+Interval = Tuple[int, int]
+
+
+class CharSet:
+    """An exact set of code points as sorted, disjoint, non-adjacent closed intervals."""
+
+    __slots__ = ('intervals',)
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        merged = []
+        for low, high in sorted(intervals):
+            if merged and low <= merged[-1][1] + 1:
+                if high > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], high)
+            else:
+                merged.append((low, high))
+        self.intervals: Tuple[Interval, ...] = tuple(merged)
+
+    @staticmethod
+    def of_chars(chars: Iterable[str]) -> 'CharSet':
+        return CharSet((ord(char), ord(char)) for char in chars)
+
+    @staticmethod
+    def of_node(node: Node) -> 'CharSet':
+        # The characters a single character node can consume, with the flags generated patterns use (none).
+        if isinstance(node, Literal):
+            return CharSet.of_chars(node.char)
+        if isinstance(node, AnyChar):
+            return CharSet.of_chars('\n').complement()
+        if isinstance(node, CharClass):
+            members = CharSet(
+                [(ord(char), ord(char)) for char in node.chars]
+                + [(ord(low), ord(high)) for low, high in node.ranges]
+                + [interval for category in node.categories for interval in category_intervals(category)])
+            return members.complement() if node.negated else members
+        raise TypeError("not a single character node: {0!r}".format(node))
+
+    def union(self, other: 'CharSet') -> 'CharSet':
+        return CharSet(self.intervals + other.intervals)
+
+    def intersection(self, other: 'CharSet') -> 'CharSet':
+        result, index, other_index = [], 0, 0
+        while index < len(self.intervals) and other_index < len(other.intervals):
+            low = max(self.intervals[index][0], other.intervals[other_index][0])
+            high = min(self.intervals[index][1], other.intervals[other_index][1])
+            if low <= high:
+                result.append((low, high))
+            if self.intervals[index][1] < other.intervals[other_index][1]:
+                index += 1
+            else:
+                other_index += 1
+        return CharSet(result)
+
+    def complement(self) -> 'CharSet':
+        result, start = [], 0
+        for low, high in self.intervals:
+            if low > start:
+                result.append((start, low - 1))
+            start = high + 1
+        if start <= sys.maxunicode:
+            result.append((start, sys.maxunicode))
+        return CharSet(result)
+
+    def intersects(self, other: 'CharSet') -> bool:
+        return bool(self.intersection(other))
+
+    def issubset(self, other: 'CharSet') -> bool:
+        return self.intersection(other) == self
+
+    def __contains__(self, char: str) -> bool:
+        code = ord(char)
+        return any(low <= code <= high for low, high in self.intervals)
+
+    def __bool__(self):
+        return bool(self.intervals)
+
+    def __eq__(self, other):
+        return isinstance(other, CharSet) and self.intervals == other.intervals
+
+    def __hash__(self):
+        return hash(self.intervals)
+
+    def __repr__(self):
+        return 'CharSet({0!r})'.format(self.intervals)
+
+
+EMPTY = CharSet()
+
+
+@lru_cache(maxsize=None)
+def category_intervals(category: str) -> Tuple[Interval, ...]:
+    # \d, \s and \w are Unicode aware in str patterns, so the runs are read off the re module itself.
+    every_code_point = ''.join(map(chr, range(sys.maxunicode + 1)))
+    return tuple((ord(match.group()[0]), ord(match.group()[-1]))
+                 for match in re.finditer('\\{0}+'.format(category), every_code_point))
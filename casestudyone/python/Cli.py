@@ -0,0 +1,190 @@
+import argparse
+import asyncio
+import json
+import sys
+from typing import List, Optional
+
+from casestudyone.python.BacktrackingAnalyzer import BacktrackingAnalyzer, EXPONENTIAL
+from casestudyone.python.BulkMatcher import BulkMatcher, MATCH_MODES
+from casestudyone.python.DslCompiler import DslCompiler
+from casestudyone.python.MappedGrep import MappedGrep
+from casestudyone.python.RecordExtractor import EXTRACT_MODES, RecordExtractor
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.python.RuleService import RuleService
+from common.python.GrammarProfiler import GrammarProfiler, SORT_KEYS
+
+
+def run_match(arguments: argparse.Namespace) -> int:
+    matcher = BulkMatcher(arguments.dsl, mode=arguments.mode, processes=arguments.processes,
+                          chunk_size=arguments.chunk_size)
+    lines = sys.stdin if arguments.file == '-' else open(arguments.file, encoding=arguments.encoding, newline='')
+    selected = 0
+    try:
+        for result in matcher.match_lines(lines):
+            if result.matched != arguments.invert:
+                selected += 1
+                if not arguments.count:
+                    sys.stdout.write(result.line + '\n')
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+    if arguments.count:
+        sys.stdout.write("{0}\n".format(selected))
+    print(matcher.stats, file=sys.stderr)
+    return 0 if selected else 1
+
+
+def run_extract(arguments: argparse.Namespace) -> int:
+    extractor = RecordExtractor(arguments.dsl, mode=arguments.mode, alternatives=arguments.alternatives)
+    lines = sys.stdin if arguments.file == '-' else open(arguments.file, encoding=arguments.encoding, newline='')
+    try:
+        if arguments.format == 'csv':
+            written = extractor.write_csv(lines, sys.stdout)
+        else:
+            written = extractor.write_jsonl(lines, sys.stdout)
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+    print("{0} records from {1} lines".format(written, extractor.lines), file=sys.stderr)
+    return 0 if written else 1
+
+
+def run_analyze(arguments: argparse.Namespace) -> int:
+    report = DslCompiler.analyze(arguments.dsl)
+    print(report)
+    print('rewritten: {0}'.format(BacktrackingAnalyzer.rewrite(report.pattern)))
+    return 1 if report.complexity == EXPONENTIAL else 0
+
+
+def run_profile(arguments: argparse.Namespace) -> int:
+    with GrammarProfiler(RegexParser) as profiler:
+        for _ in range(arguments.repeat):
+            RegexParser.regex_parser.parse(arguments.dsl)
+    sys.stdout.write(profiler.report(arguments.sort))
+    if arguments.collapsed is not None:
+        with open(arguments.collapsed, 'w', encoding='utf-8') as output:
+            profiler.write_collapsed(output)
+    return 0
+
+
+def run_grep(arguments: argparse.Namespace) -> int:
+    grep = MappedGrep(arguments.dsl, line_mode=not arguments.whole, line_regexp=arguments.line_regexp)
+    output = sys.stdout.buffer
+    selected = 0
+    for path in arguments.files:
+        prefix = path.encode() + b':' if len(arguments.files) > 1 else b''
+        with MappedGrep.map_file(path) as buffer:
+            if arguments.count:
+                count = grep.count(buffer)
+                output.write(prefix + b'%d\n' % count)
+                selected += count
+                continue
+            for match in grep.scan(buffer):
+                selected += 1
+                if arguments.offsets:
+                    output.write(prefix + b'%d:%d\n' % (match.start, match.end))
+                else:
+                    output.write(prefix + buffer[match.line_start:match.line_end] + b'\n')
+    output.flush()
+    return 0 if selected else 1
+
+
+async def serve(service: RuleService, arguments: argparse.Namespace):
+    if arguments.socket is not None:
+        server = await service.start_unix(arguments.socket)
+    else:
+        server = await service.start_tcp(arguments.host, arguments.port)
+    addresses = ', '.join(str(listening.getsockname()) for listening in server.sockets)
+    print('serving {0} rules on {1}'.format(len(service.rules), addresses), file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def run_serve(arguments: argparse.Namespace) -> int:
+    rules = {}
+    if arguments.rules is not None:
+        with open(arguments.rules, encoding='utf-8') as file:
+            rules = json.load(file)
+    service = RuleService(rules, workers=arguments.workers, max_pending=arguments.max_pending)
+    service.compile_rules()
+    try:
+        asyncio.run(serve(service, arguments))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m casestudyone',
+                                     description='Apply regex DSL rules to text.')
+    parser.add_argument('--translation-cache', metavar='DIRECTORY', default=None,
+                        help='keep translated rules in DIRECTORY across runs')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    match = commands.add_parser('match', help='match every line of a file against one DSL rule')
+    match.add_argument('dsl', help='the DSL rule, e.g. \'starts with "ERROR" followed with anything\'')
+    match.add_argument('file', nargs='?', default='-', help='input file, "-" or omitted for stdin')
+    match.add_argument('--mode', choices=MATCH_MODES, default='fullmatch')
+    match.add_argument('--processes', type=int, default=None,
+                       help='worker processes, 1 to match in-process (default: cpu count)')
+    match.add_argument('--chunk-size', type=int, default=10_000)
+    match.add_argument('--encoding', default='utf-8')
+    match.add_argument('-v', '--invert', action='store_true', help='select non-matching lines')
+    match.add_argument('-c', '--count', action='store_true', help='only print the number of selected lines')
+    match.set_defaults(handler=run_match)
+
+    grep = commands.add_parser('grep', help='scan memory-mapped UTF-8 files for one DSL rule')
+    grep.add_argument('dsl', help='the DSL rule')
+    grep.add_argument('files', nargs='+', help='input files')
+    grep.add_argument('--whole', action='store_true',
+                      help='match against the whole file instead of line by line, reporting every match')
+    grep.add_argument('-x', '--line-regexp', action='store_true', help='the whole line has to match')
+    output = grep.add_mutually_exclusive_group()
+    output.add_argument('-c', '--count', action='store_true', help='only print the number of matches per file')
+    output.add_argument('-b', '--offsets', action='store_true',
+                        help='only print the start:end byte offsets of every match')
+    grep.set_defaults(handler=run_grep)
+
+    extract = commands.add_parser('extract', help='write one record per matching line, with a field per clause')
+    extract.add_argument('dsl', help='the DSL rule')
+    extract.add_argument('file', nargs='?', default='-', help='input file, "-" or omitted for stdin')
+    extract.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl')
+    extract.add_argument('--mode', choices=EXTRACT_MODES, default='fullmatch')
+    extract.add_argument('--alternatives', action='store_true',
+                         help='add a field per alternative of every clause')
+    extract.add_argument('--encoding', default='utf-8')
+    extract.set_defaults(handler=run_extract)
+
+    analyze = commands.add_parser('analyze', help='report the worst case backtracking of one DSL rule')
+    analyze.add_argument('dsl', help='the DSL rule')
+    analyze.set_defaults(handler=run_analyze)
+
+    profile = commands.add_parser('profile', help='time every combinator of the parsy grammar on one DSL rule')
+    profile.add_argument('dsl', help='the DSL rule')
+    profile.add_argument('--repeat', type=int, default=100, help='parse the rule this many times')
+    profile.add_argument('--sort', choices=SORT_KEYS, default='self_seconds')
+    profile.add_argument('--collapsed', metavar='FILE', default=None,
+                         help='also write collapsed stacks in microseconds, e.g. for flamegraph.pl')
+    profile.set_defaults(handler=run_profile)
+
+    serve = commands.add_parser('serve', help='answer match requests for warm, compiled rules over a local socket')
+    address = serve.add_mutually_exclusive_group(required=True)
+    address.add_argument('--socket', metavar='PATH', help='listen on a unix socket')
+    address.add_argument('--port', type=int, help='listen on a TCP port')
+    serve.add_argument('--host', default='127.0.0.1', help='TCP address to listen on (default: %(default)s)')
+    serve.add_argument('--rules', metavar='FILE', default=None,
+                       help='JSON object of rule ids to DSL rules, compiled before the first request')
+    serve.add_argument('--workers', type=int, default=4, help='threads that translate and match')
+    serve.add_argument('--max-pending', type=int, default=64,
+                       help='requests in flight before the server stops reading')
+    serve.set_defaults(handler=run_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arguments = create_argument_parser().parse_args(argv)
+    if arguments.translation_cache is not None:
+        DslCompiler.use_translation_cache(arguments.translation_cache)
+    return arguments.handler(arguments)
@@ -0,0 +1,36 @@
+import re
+from typing import AnyStr, Optional, Tuple, Union
+
+from casestudyone.python.LiteralExtractor import LiteralExtractor
+
+
+class CompiledRule:
+    def __init__(self, pattern: re.Pattern, required_literals: Optional[Tuple[str, ...]] = None):
+        self.pattern = pattern
+        if required_literals is None:
+            regex = pattern.pattern if isinstance(pattern.pattern, str) else pattern.pattern.decode('utf-8')
+            required_literals = LiteralExtractor.required_literals(regex)
+        self.required_literals: Tuple[str, ...] = required_literals
+        self.required_bytes: Tuple[bytes, ...] = tuple(literal.encode('utf-8') for literal in required_literals)
+
+    @staticmethod
+    def compile(regex: AnyStr) -> 'CompiledRule':
+        return CompiledRule(re.compile(regex))
+
+    def might_match(self, text: Union[str, bytes]) -> bool:
+        for literal in (self.required_literals if isinstance(text, str) else self.required_bytes):
+            if text.find(literal) < 0:
+                return False
+        return True
+
+    def fullmatch(self, text: AnyStr) -> Optional[re.Match]:
+        return self.pattern.fullmatch(text) if self.might_match(text) else None
+
+    def match(self, text: AnyStr) -> Optional[re.Match]:
+        return self.pattern.match(text) if self.might_match(text) else None
+
+    def search(self, text: AnyStr) -> Optional[re.Match]:
+        return self.pattern.search(text) if self.might_match(text) else None
+
+    def __repr__(self):
+        return 'CompiledRule({0!r}, required_literals={1!r})'.format(self.pattern.pattern, self.required_literals)
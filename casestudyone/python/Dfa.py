@@ -0,0 +1,376 @@
+import sys
+from array import array
+from bisect import bisect_right
+from functools import reduce
+from operator import or_
+from typing import Dict, FrozenSet, List, Tuple, Union
+
+from casestudyone.python.CharSet import CharSet
+from casestudyone.python.RegexSyntaxTree import Alternation, Anchor, Group, Node, RegexSyntaxError, RegexSyntaxTree, \
+    Repeat, Sequence, SINGLE_CHARACTER_NODES
+
+# A bounded repetition is expanded into one copy of its body per repetition, so "occurs 1..5000" would build a
+# huge automaton; above this count the rule is rejected and stays with the re backend. The number of states of
+# one DFA is capped as well, because the subset construction can blow up on repetitions after a wildcard.
+MAX_REPETITIONS = 1000
+MAX_STATES = 20_000
+# Matching checks for the dead and the matched state once per block of characters instead of after every one.
+BLOCK_SIZE = 4096
+NEWLINE = ord('\n')
+# bytes are decoded with surrogateescape, which turns every byte of an invalid UTF-8 sequence into one of these.
+ESCAPED_BYTES = (0xDC80, 0xDCFF)
+
+# The NFA states of a DFA state carry where they stand relative to a $: free, right after a $ that did not hold
+# at the end of the text yet (only the final newline may follow), or after that final newline.
+FREE, AFTER_DOLLAR, AT_END = 0, 1, 2
+# What a DFA state accepts: a match ending here, a match ending here if only the final newline follows, and a
+# match ending here if the text ends here.
+ACCEPTS, ACCEPTS_BEFORE_FINAL_NEWLINE, ACCEPTS_AT_END = 1, 2, 4
+
+Item = Tuple[int, int]
+# Stands in for the NFA states of the one state of a prefix DFA that has matched already.
+MATCHED: FrozenSet[Item] = frozenset([(-1, FREE)])
+
+
+class DfaLimitError(ValueError):
+    pass
+
+
+class Nfa:
+    """A Thompson NFA over code points, built from the regex syntax tree of a generated pattern."""
+
+    def __init__(self, node: Node):
+        self.epsilon: List[List[int]] = []
+        self.anchors: List[List[Tuple[str, int]]] = []
+        self.edges: List[List[Tuple[int, int, int]]] = []
+        self.start = self.state()
+        self.accept = self.build(self.start, node)
+
+    def state(self) -> int:
+        self.epsilon.append([])
+        self.anchors.append([])
+        self.edges.append([])
+        return len(self.edges) - 1
+
+    def build(self, start: int, node: Node) -> int:
+        # Returns the state reached after node, threading its states from start.
+        if isinstance(node, SINGLE_CHARACTER_NODES):
+            end = self.state()
+            self.edges[start].extend((low, high, end) for low, high in CharSet.of_node(node).intervals)
+            return end
+        if isinstance(node, Anchor):
+            end = self.state()
+            self.anchors[start].append((node.kind, end))
+            return end
+        if isinstance(node, Sequence):
+            for item in node.items:
+                start = self.build(start, item)
+            return start
+        if isinstance(node, Alternation):
+            end = self.state()
+            for branch in node.branches:
+                self.epsilon[self.build(start, branch)].append(end)
+            return end
+        if isinstance(node, Group):
+            if node.atomic:
+                raise RegexSyntaxError("atomic groups are not supported by the DFA backend")
+            return self.build(start, node.body)
+        if isinstance(node, Repeat):
+            return self.build_repeat(start, node)
+        raise TypeError("not a regex syntax node: {0!r}".format(node))
+
+    def build_repeat(self, start: int, node: Repeat) -> int:
+        # Greedy and lazy repetitions match the same texts; a possessive one may not.
+        if node.possessive:
+            raise RegexSyntaxError("possessive repetitions are not supported by the DFA backend")
+        if max(node.min, node.max or 0) > MAX_REPETITIONS:
+            raise DfaLimitError("repetition {0} exceeds the DFA backend limit of {1}".format(
+                RegexSyntaxTree.emit_quantifier(node), MAX_REPETITIONS))
+        for _ in range(node.min):
+            start = self.build(start, node.body)
+        if node.max is None:
+            loop = self.state()
+            self.epsilon[start].append(loop)
+            self.epsilon[self.build(loop, node.body)].append(loop)
+            return loop
+        # x{2,5} is xx(x(x(x)?)?)?: every optional copy can only follow the one before it, which keeps the
+        # automaton linear in the count instead of offering every count from the first copy on.
+        end = self.state()
+        self.epsilon[start].append(end)
+        for _ in range(node.max - node.min):
+            start = self.build(start, node.body)
+            self.epsilon[start].append(end)
+        return end
+
+    def closure(self, items, at_start: bool) -> FrozenSet[Item]:
+        result = set(items)
+        stack = list(result)
+        while stack:
+            state, position = stack.pop()
+            following = [(target, position) for target in self.epsilon[state]]
+            for kind, target in self.anchors[state]:
+                if kind == '$':
+                    following.append((target, AT_END if position == AT_END else AFTER_DOLLAR))
+                elif at_start:
+                    following.append((target, position))
+            for item in following:
+                if item not in result:
+                    result.add(item)
+                    stack.append(item)
+        return frozenset(result)
+
+
+class Alphabet:
+    """Splits the code points into classes that no edge of an NFA tells apart.
+
+    The bounds of the edges cut the code points into runs, and runs that the same edges cover share a class,
+    so that the many ranges of the digits, say, stay one class. The newline gets a class of its own. A text is
+    turned into its classes with one str.translate; in bytes, the escaped bytes of invalid UTF-8 map to one
+    more class that no edge has, so that they cannot be part of a match.
+    """
+
+    def __init__(self, nfa: Nfa):
+        edges = [(state, low, high, target) for state, state_edges in enumerate(nfa.edges)
+                 for low, high, target in state_edges]
+        self.boundaries = sorted({0, NEWLINE, NEWLINE + 1} | {low for _, low, _, _ in edges}
+                                 | {high + 1 for _, _, high, _ in edges} - {sys.maxunicode + 1})
+        covering: List[List[Tuple[int, int]]] = [[] for _ in self.boundaries]
+        covering[self.run_of(NEWLINE)].append((-1, -1))
+        for state, low, high, target in edges:
+            for run in range(self.run_of(low), self.run_of(high) + 1):
+                covering[run].append((state, target))
+        classes: Dict[Tuple[Tuple[int, int], ...], int] = {}
+        self.run_classes = [classes.setdefault(tuple(edges), len(classes)) for edges in covering]
+        self.invalid_class = len(classes)
+        self.class_count = self.invalid_class + 1
+        self.newline_class = self.class_of(NEWLINE)
+        ends = self.boundaries[1:] + [sys.maxunicode + 1]
+        self.text_table = ''.join(chr(character_class) * (end - start)
+                                  for character_class, start, end in zip(self.run_classes, self.boundaries, ends))
+        self.bytes_table = (self.text_table[:ESCAPED_BYTES[0]] + chr(self.invalid_class) * 128
+                            + self.text_table[ESCAPED_BYTES[1] + 1:])
+
+    def run_of(self, code_point: int) -> int:
+        return bisect_right(self.boundaries, code_point) - 1
+
+    def class_of(self, code_point: int) -> int:
+        return self.run_classes[self.run_of(code_point)]
+
+    def edge_classes(self, low: int, high: int) -> FrozenSet[int]:
+        return frozenset(self.run_classes[run] for run in range(self.run_of(low), self.run_of(high) + 1))
+
+    def classes(self, text: Union[str, bytes]):
+        if isinstance(text, str):
+            translated = text.translate(self.text_table)
+        else:
+            translated = bytes(text).decode('utf-8', 'surrogateescape').translate(self.bytes_table)
+        if self.class_count <= 256:
+            return translated.encode('latin-1')
+        return memoryview(translated.encode('utf-32-le')).cast('I')
+
+
+class Dfa:
+    """A minimized DFA over the classes of an alphabet in a flat array table.
+
+    The table holds one row of class_count entries per state, and every entry is the offset of the target row,
+    so a step is a single lookup: row = table[row + class]. Row 0 is the dead state. A DFA for prefix matches
+    (match and search) turns every accepting state into one matched state that never leaves, so that both
+    end states stop the scan.
+    """
+
+    def __init__(self, nfa: Nfa, alphabet: Alphabet, prefix: bool, unanchored: bool):
+        self.alphabet = alphabet
+        self.class_count = alphabet.class_count
+        newline = alphabet.newline_class
+        free_moves: List[Dict[int, Tuple[Item, ...]]] = []
+        for edges in nfa.edges:
+            targets: Dict[int, List[Item]] = {}
+            for low, high, target in edges:
+                for character_class in alphabet.edge_classes(low, high):
+                    targets.setdefault(character_class, []).append((target, FREE))
+            free_moves.append({character_class: tuple(items) for character_class, items in targets.items()})
+        moves_of: Dict[Item, Dict[int, Tuple[Item, ...]]] = {}
+
+        def item_moves(item: Item) -> Dict[int, Tuple[Item, ...]]:
+            if item not in moves_of:
+                state, position = item
+                if position == FREE:
+                    moves_of[item] = free_moves[state]
+                elif position == AFTER_DOLLAR and newline in free_moves[state]:
+                    moves_of[item] = {newline: tuple((target, AT_END) for target, _ in free_moves[state][newline])}
+                else:
+                    moves_of[item] = {}
+            return moves_of[item]
+
+        # A DFA state is known by the NFA states in it that can still step and by what it accepts: subsets that
+        # agree on both behave the same, however many other states they hold. The closure of a set is the
+        # union of the closures of its states, so what every single state reaches is computed once.
+        def reach(items, at_start: bool = False) -> Tuple[FrozenSet[Item], int]:
+            closure = nfa.closure(items, at_start)
+            return frozenset(item for item in closure if item_moves(item)), Dfa.accepted(nfa, closure)
+
+        reach_of: Dict[Item, Tuple[FrozenSet[Item], int]] = {}
+        # Searching starts a match at every position but the first over again, where ^ does not hold.
+        restart = reach([(nfa.start, FREE)]) if unanchored else (frozenset(), 0)
+        dead = (frozenset(), 0)
+        ids: Dict[Tuple[FrozenSet[Item], int], int] = {dead: 0}
+        keys: List[Tuple[FrozenSet[Item], int]] = [dead]
+
+        def state_id(stepping: FrozenSet[Item], accepted: int) -> int:
+            key = (MATCHED, ACCEPTS | ACCEPTS_BEFORE_FINAL_NEWLINE | ACCEPTS_AT_END) \
+                if prefix and accepted & ACCEPTS else (stepping, accepted)
+            if key not in ids:
+                if len(keys) >= MAX_STATES:
+                    raise DfaLimitError("the DFA needs more than {0} states".format(MAX_STATES))
+                ids[key] = len(keys)
+                keys.append(key)
+            return ids[key]
+
+        start = state_id(*reach([(nfa.start, FREE)], at_start=True))
+        missing = state_id(*restart)
+        successors: Dict[FrozenSet[Item], int] = {}
+        rows: List[List[int]] = []
+        flags: List[int] = []
+        while len(rows) < len(keys):
+            stepping, accepted = keys[len(rows)]
+            flags.append(accepted)
+            if stepping is MATCHED:
+                rows.append([len(rows)] * self.class_count)
+                continue
+            targets: Dict[int, List[Item]] = {}
+            for item in stepping:
+                for character_class, following in item_moves(item).items():
+                    targets.setdefault(character_class, []).extend(following)
+            row = [missing] * self.class_count
+            for character_class, following in targets.items():
+                # Wide classes such as the dot lead many states to the same NFA states.
+                following = frozenset(following)
+                if following not in successors:
+                    reached = [restart]
+                    for item in following:
+                        if item not in reach_of:
+                            reach_of[item] = reach([item])
+                        reached.append(reach_of[item])
+                    successors[following] = state_id(frozenset().union(*(items for items, _ in reached)),
+                                                     reduce(or_, (flag for _, flag in reached)))
+                row[character_class] = successors[following]
+            rows.append(row)
+
+        block_of, self.state_count = Dfa.minimize(rows, flags)
+        self.table = array('q', bytes(8 * self.state_count * self.class_count))
+        block_flags = bytearray(self.state_count)
+        for state, row in enumerate(rows):
+            offset = block_of[state] * self.class_count
+            block_flags[block_of[state]] = flags[state]
+            for character_class, target in enumerate(row):
+                self.table[offset + character_class] = block_of[target] * self.class_count
+        self.flags = bytes(block_flags)
+        self.start = block_of[start] * self.class_count
+        stop_states = [0] + [block_of[ids[key]] for key in keys if key[0] is MATCHED]
+        self.stop_rows = frozenset(state * self.class_count for state in stop_states)
+
+    @staticmethod
+    def accepted(nfa: Nfa, items: FrozenSet[Item]) -> int:
+        return ((ACCEPTS if (nfa.accept, FREE) in items else 0)
+                | (ACCEPTS_BEFORE_FINAL_NEWLINE if (nfa.accept, AFTER_DOLLAR) in items else 0)
+                | (ACCEPTS_AT_END if any(state == nfa.accept for state, _ in items) else 0))
+
+    @staticmethod
+    def minimize(rows: List[List[int]], flags: List[int]) -> Tuple[List[int], int]:
+        # Hopcroft's partition refinement: states start out split by what they accept, and every block that
+        # some states of another block step into on a class, and others do not, is split; of the two halves
+        # only the smaller is used to split further. Returns the block of every state and the number of
+        # blocks; the dead state 0 stays in block 0.
+        predecessors: List[Dict[int, List[int]]] = [{} for _ in range(len(rows[0]))]
+        for state, row in enumerate(rows):
+            for character_class, target in enumerate(row):
+                predecessors[character_class].setdefault(target, []).append(state)
+        block_of = Dfa.renumber(flags)
+        blocks: List[set] = [set() for _ in range(max(block_of) + 1)]
+        for state, block in enumerate(block_of):
+            blocks[block].add(state)
+        pending = [(block, character_class) for block in range(len(blocks)) for character_class in range(len(rows[0]))]
+        while pending:
+            splitter, character_class = pending.pop()
+            touched: Dict[int, set] = {}
+            for target in blocks[splitter]:
+                for state in predecessors[character_class].get(target, ()):
+                    touched.setdefault(block_of[state], set()).add(state)
+            for block, inside in touched.items():
+                if len(inside) == len(blocks[block]):
+                    continue
+                smaller = inside if 2 * len(inside) <= len(blocks[block]) else blocks[block] - inside
+                blocks[block] -= smaller
+                blocks.append(smaller)
+                for state in smaller:
+                    block_of[state] = len(blocks) - 1
+                pending.extend((len(blocks) - 1, other) for other in range(len(rows[0])))
+        block_of = Dfa.renumber(block_of)
+        return block_of, max(block_of) + 1
+
+    @staticmethod
+    def renumber(signatures: list) -> List[int]:
+        numbers: dict = {}
+        return [numbers.setdefault(signature, len(numbers)) for signature in signatures]
+
+    def end_row(self, classes, end: int) -> int:
+        # The row after the first end classes; stops early in a stop row.
+        table = self.table
+        row = self.start
+        for block in range(0, end, BLOCK_SIZE):
+            for character_class in classes[block:min(block + BLOCK_SIZE, end)]:
+                row = table[row + character_class]
+            if row in self.stop_rows:
+                break
+        return row
+
+    def fullmatch(self, text: Union[str, bytes]) -> bool:
+        classes = self.alphabet.classes(text)
+        row = self.end_row(classes, len(classes))
+        return bool(self.flags[row // self.class_count] & ACCEPTS_AT_END)
+
+    def prefix_match(self, text: Union[str, bytes]) -> bool:
+        # Whether a match ends anywhere: with a final newline a $ also holds right before it.
+        classes = self.alphabet.classes(text)
+        if not classes or classes[-1] != self.alphabet.newline_class:
+            row = self.end_row(classes, len(classes))
+            return bool(self.flags[row // self.class_count] & (ACCEPTS | ACCEPTS_AT_END))
+        row = self.end_row(classes, len(classes) - 1)
+        if self.flags[row // self.class_count] & (ACCEPTS | ACCEPTS_BEFORE_FINAL_NEWLINE):
+            return True
+        row = self.table[row + self.alphabet.newline_class]
+        return bool(self.flags[row // self.class_count] & ACCEPTS_AT_END)
+
+
+class DfaMatcher:
+    """Matches a generated pattern in time linear in the length of the text, without backtracking.
+
+    Every DSL rule translates to a regular language, so the pattern is compiled into minimized DFAs over code
+    points, one per mode on first use. Texts can be str or UTF-8 bytes; bytes of invalid UTF-8 sequences cannot
+    be part of a match. The results are booleans that agree with re: ^ only holds at the start of the text, $ at
+    its end or before a final newline, and . does not match a newline. Possessive repetitions and atomic groups
+    raise RegexSyntaxError; repetitions above MAX_REPETITIONS and DFAs above MAX_STATES raise DfaLimitError.
+    """
+
+    def __init__(self, regex: str):
+        self.regex = regex
+        self.nfa = Nfa(RegexSyntaxTree.parse(regex))
+        self.alphabet = Alphabet(self.nfa)
+        self.dfas: Dict[str, Dfa] = {}
+
+    def dfa(self, mode: str) -> Dfa:
+        if mode not in self.dfas:
+            self.dfas[mode] = Dfa(self.nfa, self.alphabet, prefix=mode != 'fullmatch', unanchored=mode == 'search')
+        return self.dfas[mode]
+
+    def fullmatch(self, text: Union[str, bytes]) -> bool:
+        return self.dfa('fullmatch').fullmatch(text)
+
+    def match(self, text: Union[str, bytes]) -> bool:
+        return self.dfa('match').prefix_match(text)
+
+    def search(self, text: Union[str, bytes]) -> bool:
+        return self.dfa('search').prefix_match(text)
+
+    def __repr__(self):
+        return 'DfaMatcher({0!r})'.format(self.regex)
@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+from weakref import WeakValueDictionary
+
+from casestudyone.python.Constants import Constants
+
+
+class AstNode:
+    # Nodes are immutable and interned, so children of equal nodes are the very same objects. Equality and
+    # hashing therefore only look one level deep, and the hash is computed once when the node is created.
+
+    def __post_init__(self):
+        key = tuple(self.__dict__.values())
+        object.__setattr__(self, '_key', key)
+        object.__setattr__(self, '_hash', hash((type(self).__name__,) + key))
+
+    def __eq__(self, other):
+        return self is other or (type(self) is type(other) and self._key == other._key)
+
+    def __hash__(self):
+        return self._hash
+
+
+@dataclass(frozen=True, eq=False)
+class Term(AstNode):
+    text: str
+
+
+@dataclass(frozen=True, eq=False)
+class Predefined(AstNode):
+    name: str
+
+    @property
+    def pattern(self) -> str:
+        return PREDEFINED_PATTERNS[self.name]
+
+
+@dataclass(frozen=True, eq=False)
+class Quantified(AstNode):
+    term: Term
+    quantifier: str
+
+    @property
+    def minimum(self) -> int:
+        return 0 if self.quantifier == Constants.INDEFINITELY else int(self.quantifier[1:-1].split(',')[0])
+
+    @property
+    def maximum(self) -> Optional[int]:
+        return None if self.quantifier == Constants.INDEFINITELY else int(self.quantifier[1:-1].split(',')[-1])
+
+
+@dataclass(frozen=True, eq=False)
+class InnerRegex(AstNode):
+    clauses: Tuple['FollowedWith', ...]
+
+
+Item = Union[Term, Predefined, Quantified, InnerRegex]
+
+
+@dataclass(frozen=True, eq=False)
+class Alternation(AstNode):
+    items: Tuple[Item, ...]
+
+
+@dataclass(frozen=True, eq=False)
+class StartsWith(AstNode):
+    alternation: Alternation
+
+
+@dataclass(frozen=True, eq=False)
+class FollowedWith(AstNode):
+    alternation: Alternation
+
+
+@dataclass(frozen=True, eq=False)
+class EndsWith(AstNode):
+    alternation: Alternation
+
+
+@dataclass(frozen=True, eq=False)
+class Rule(AstNode):
+    starts_with: Optional[StartsWith]
+    followed_with: Tuple[FollowedWith, ...]
+    ends_with: Optional[EndsWith]
+
+
+Clause = Union[StartsWith, FollowedWith, EndsWith]
+
+PREDEFINED_PATTERNS = {
+    "anything": Constants.ANYTHING_PATTERN,
+    "something": Constants.SOMETHING_PATTERN,
+    "letters": Constants.ANY_LETTERS_PATTERN,
+    "numbers": Constants.ANY_NUMBER_PATTERN,
+}
+
+# Keyed by the type and the children of a node rather than by the node, which the key would keep alive. An entry
+# goes when its node does, and with it the references to the children.
+_interned_nodes: WeakValueDictionary = WeakValueDictionary()
+
+
+def intern(node: AstNode) -> AstNode:
+    key = (type(node), node._key)
+    existing = _interned_nodes.get(key)
+    if existing is not None:
+        return existing
+    _interned_nodes[key] = node
+    return node
@@ -0,0 +1,97 @@
+import re
+from typing import Optional
+
+from casestudyone.python.BacktrackingAnalyzer import BacktrackingAnalyzer, BacktrackingReport
+from casestudyone.python.CompiledRule import CompiledRule
+from casestudyone.python.Dfa import DfaMatcher
+from casestudyone.python.FastRegexParser import FastRegexParser
+from casestudyone.python.NamedGroups import NamedGroups
+from casestudyone.python.PatternCache import CacheInfo, PatternCache
+from casestudyone.python.RegexOptimizer import RegexOptimizer
+from casestudyone.python.TranslationCache import TranslationCache
+
+
+class DslCompiler:
+    pattern_cache: PatternCache = PatternCache(max_size=4096)
+    translation_cache: Optional[TranslationCache] = None
+
+    # Indentation in front of "followed with"/"ends with" is always consumed by whitespace_opt_parser.
+    # Quoted terms are matched first so that whitespace inside a term is never touched.
+    insignificant_indentation_pattern: re.Pattern = re.compile(r'("[^"]*")|\n[ \t]+(?=followed with |ends with )')
+
+    @staticmethod
+    def normalize(dsl: str) -> str:
+        return DslCompiler.insignificant_indentation_pattern.sub(
+            lambda match: match.group(1) or '\n', dsl.lstrip())
+
+    @staticmethod
+    def translate(dsl: str, optimize: bool = False, atomic: bool = False) -> str:
+        return DslCompiler.compile_dsl(dsl, optimize, atomic).pattern
+
+    @staticmethod
+    def compile_dsl(dsl: str, optimize: bool = False, atomic: bool = False) -> re.Pattern:
+        return DslCompiler.compile_rule(dsl, optimize, atomic).pattern
+
+    @staticmethod
+    def compile_rule(dsl: str, optimize: bool = False, atomic: bool = False) -> CompiledRule:
+        # The original text is parsed on a miss so that error positions refer to what the caller wrote.
+        return DslCompiler.pattern_cache.get_or_create(
+            (DslCompiler.normalize(dsl), optimize, atomic),
+            lambda: CompiledRule.compile(DslCompiler.build_regex(dsl, optimize, atomic)))
+
+    @staticmethod
+    def compile_dfa(dsl: str) -> DfaMatcher:
+        # The same translation for the DFA backend, which matches in linear time without backtracking.
+        return DslCompiler.pattern_cache.get_or_create(
+            (DslCompiler.normalize(dsl), 'dfa'), lambda: DfaMatcher(DslCompiler.build_regex(dsl)))
+
+    @staticmethod
+    def translate_named(dsl: str, alternatives: bool = False) -> str:
+        return DslCompiler.compile_named(dsl, alternatives).pattern.pattern
+
+    @staticmethod
+    def compile_named(dsl: str, alternatives: bool = False) -> CompiledRule:
+        # The translation with one named group per clause (and per alternative) and no other captures.
+        return DslCompiler.pattern_cache.get_or_create(
+            (DslCompiler.normalize(dsl), 'named', alternatives),
+            lambda: CompiledRule.compile(
+                NamedGroups.name_groups(DslCompiler.build_regex(dsl), FastRegexParser.parse_ast(dsl), alternatives)))
+
+    @staticmethod
+    def build_regex(dsl: str, optimize: bool = False, atomic: bool = False) -> str:
+        if DslCompiler.translation_cache is None:
+            return DslCompiler.translate_dsl(dsl, optimize, atomic)
+        return DslCompiler.translation_cache.get_or_translate(
+            dsl, optimize, atomic, lambda: DslCompiler.translate_dsl(dsl, optimize, atomic))
+
+    @staticmethod
+    def translate_dsl(dsl: str, optimize: bool = False, atomic: bool = False) -> str:
+        regex = FastRegexParser.parse(dsl)
+        if optimize:
+            regex = RegexOptimizer.optimize(regex)
+        # Possessive quantifiers and atomic groups need Python 3.11; the rewrite only adds them where the
+        # engine would otherwise backtrack in vain, so the pattern matches exactly the same.
+        return BacktrackingAnalyzer.rewrite(regex) if atomic else regex
+
+    @staticmethod
+    def analyze(dsl: str) -> BacktrackingReport:
+        return BacktrackingAnalyzer.analyze(DslCompiler.translate(dsl))
+
+    @staticmethod
+    def cache_info() -> CacheInfo:
+        return DslCompiler.pattern_cache.info()
+
+    @staticmethod
+    def cache_clear():
+        DslCompiler.pattern_cache.clear()
+
+    @staticmethod
+    def use_translation_cache(directory: Optional[str]) -> Optional[TranslationCache]:
+        # Translations are then read from and added to a file in directory; None turns the file cache off.
+        DslCompiler.translation_cache = None if directory is None else TranslationCache(directory)
+        DslCompiler.pattern_cache.clear()
+        return DslCompiler.translation_cache
+
+
+def compile_dsl(dsl: str, optimize: bool = False, atomic: bool = False) -> re.Pattern:
+    return DslCompiler.compile_dsl(dsl, optimize, atomic)
@@ -0,0 +1,182 @@
+import re
+from typing import List, Optional, Tuple
+
+from casestudyone.python.AstBuilder import AstBuilder
+from casestudyone.python.Constants import Constants
+from casestudyone.python.DslAst import FollowedWith, Predefined, Rule
+from casestudyone.python.RegexEmitter import RegexEmitter
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.python.SemanticModelBuilder import SemanticModelBuilder
+
+# Every helper takes the input and a start index and returns (value, next_index), or None on failure.
+# The helpers mirror the combinators of RegexParser one to one, including the order in which alternatives
+# are tried and where they backtrack, so the AstBuilder actions run exactly as they do in parsy.
+Step = Optional[Tuple[object, int]]
+
+
+class FastRegexParser:
+    whitespace_pattern: re.Pattern = re.compile(r'\s+')
+    quantification_pattern: re.Pattern = re.compile(r'(\d+)\.\.(\d+)')
+    predefined_terms: Tuple[Tuple[str, Predefined], ...] = tuple(
+        (name, AstBuilder.build_predefined(name)) for name in ("anything", "something", "letters", "numbers"))
+
+    @staticmethod
+    def parse(dsl: str) -> str:
+        rule, index = FastRegexParser.parse_rule(dsl)
+        # parsy runs the emitting map before it checks for the end of input, so emit first as well.
+        regex = RegexEmitter.emit(rule)
+        if index != len(dsl):
+            # Syntax errors are rare; let parsy produce its exact error message.
+            return RegexParser.regex_parser.parse(dsl)
+        return regex
+
+    @staticmethod
+    def parse_ast(dsl: str) -> Rule:
+        rule, index = FastRegexParser.parse_rule(dsl)
+        if index != len(dsl):
+            return RegexParser.rule_parser.parse(dsl)
+        return rule
+
+    @staticmethod
+    def parse_rule(text: str) -> Tuple[Rule, int]:
+        index = FastRegexParser.skip_whitespace(text, 0)
+        starts_with = FastRegexParser.starts_with(text, index)
+        if starts_with is not None:
+            starts_with, index = starts_with
+        index = FastRegexParser.skip_whitespace(text, index)
+        followed_with: List[FollowedWith] = []
+        while (step := FastRegexParser.followed_with(text, index)) is not None:
+            followed_with.append(step[0])
+            index = step[1]
+        index = FastRegexParser.skip_whitespace(text, index)
+        ends_with = FastRegexParser.ends_with(text, index)
+        if ends_with is not None:
+            ends_with, index = ends_with
+        return AstBuilder.build_rule(starts_with, followed_with, ends_with), index
+
+    @staticmethod
+    def skip_whitespace(text: str, index: int) -> int:
+        match = FastRegexParser.whitespace_pattern.match(text, index)
+        return match.end() if match else index
+
+    @staticmethod
+    def skip_new_line(text: str, index: int) -> int:
+        return index + 1 if text.startswith('\n', index) else index
+
+    @staticmethod
+    def starts_with(text: str, index: int) -> Step:
+        if not text.startswith("starts with ", index):
+            return None
+        content, index = FastRegexParser.split_by_or(text, index + 12)
+        return AstBuilder.starts_with_builder(content), FastRegexParser.skip_new_line(text, index)
+
+    @staticmethod
+    def followed_with(text: str, index: int) -> Step:
+        index = FastRegexParser.skip_whitespace(text, index)
+        if not text.startswith("followed with ", index):
+            return None
+        content, index = FastRegexParser.split_by_or(text, index + 14)
+        return AstBuilder.followed_with_builder(content), FastRegexParser.skip_new_line(text, index)
+
+    @staticmethod
+    def ends_with(text: str, index: int) -> Step:
+        if not text.startswith("ends with ", index):
+            return None
+        content, index = FastRegexParser.split_by_or(text, index + 10)
+        return AstBuilder.ends_with_builder(content), FastRegexParser.skip_new_line(text, index)
+
+    @staticmethod
+    def split_by_or(text: str, index: int) -> Tuple[list, int]:
+        # An inner regex holds followed with clauses, which hold alternations again. Instead of recursing, the
+        # alternation and clauses around every open inner regex are kept on a stack, so the nesting depth is
+        # neither bounded by the recursion limit nor more expensive than its length.
+        stack: List[Tuple[list, int, List[FollowedWith]]] = []
+        content, end, position = [], index, index
+        while True:
+            if text.startswith('inner regex(', position):
+                stack.append((content, end, []))
+                clause_start = FastRegexParser.clause_start(text, position + 12)
+                if clause_start is not None:
+                    content, end, position = [], clause_start, clause_start
+                    continue
+                content, end, item = FastRegexParser.close_inner_regex(text, position + 12, stack)
+            else:
+                item = FastRegexParser.predefined_or_term(text, position)
+            while True:
+                if item is not None:
+                    content.append(item[0])
+                    end = item[1]
+                    after_or = FastRegexParser.or_keyword(text, end)
+                    if after_or is not None:
+                        position = after_or
+                        break
+                if not stack:
+                    return content, end
+                # The alternation ended, and with it a followed with clause of the innermost open inner regex.
+                stack[-1][2].append(AstBuilder.followed_with_builder(content))
+                position = FastRegexParser.skip_new_line(text, end)
+                clause_start = FastRegexParser.clause_start(text, position)
+                if clause_start is not None:
+                    content, end, position = [], clause_start, clause_start
+                    break
+                content, end, item = FastRegexParser.close_inner_regex(text, position, stack)
+
+    @staticmethod
+    def clause_start(text: str, index: int) -> Optional[int]:
+        index = FastRegexParser.skip_whitespace(text, index)
+        return index + 14 if text.startswith("followed with ", index) else None
+
+    @staticmethod
+    def close_inner_regex(text: str, index: int, stack: list) -> Tuple[list, int, Step]:
+        # Returns the enclosing alternation and the inner regex as its next item, or None if it is not closed.
+        content, end, followed_with = stack.pop()
+        inner_regex = AstBuilder.build_inner_regex(followed_with)
+        if not text.startswith(')', index):
+            return content, end, None
+        return content, end, (inner_regex, index + 1)
+
+    @staticmethod
+    def or_keyword(text: str, index: int) -> Optional[int]:
+        index = FastRegexParser.skip_whitespace(text, index)
+        if not text.startswith('or', index):
+            return None
+        return FastRegexParser.skip_whitespace(text, index + 2)
+
+    @staticmethod
+    def predefined_or_term(text: str, index: int) -> Step:
+        for keyword, pattern in FastRegexParser.predefined_terms:
+            if text.startswith(keyword, index):
+                return pattern, index + len(keyword)
+        return FastRegexParser.term(text, index)
+
+    @staticmethod
+    def term(text: str, index: int) -> Step:
+        if not text.startswith('"', index):
+            return None
+        end = text.find('"', index + 1)
+        if end <= index + 1:
+            return None
+        term = text[index:end + 1]
+        index = end + 1
+        quantification = FastRegexParser.quantification(text, index)
+        if quantification is not None:
+            quantification, index = quantification
+        return AstBuilder.build_term(term, quantification), index
+
+    @staticmethod
+    def quantification(text: str, index: int) -> Step:
+        if not text.startswith(" occurs ", index):
+            return None
+        index += 8
+        if text.startswith('indefinitely', index):
+            return Constants.INDEFINITELY, index + 12
+        match = FastRegexParser.quantification_pattern.match(text, index)
+        if match is None:
+            return None
+        return SemanticModelBuilder.build_quantification(
+            FastRegexParser.line_info(text, index), match.group(0),
+            FastRegexParser.line_info(text, match.end())), match.end()
+
+    @staticmethod
+    def line_info(text: str, index: int) -> Tuple[int, int]:
+        return text.count('\n', 0, index), index - (text.rfind('\n', 0, index) + 1)
@@ -0,0 +1,188 @@
+import sys
+from typing import List, NamedTuple, Optional, Tuple
+
+from casestudyone.python.AstBuilder import AstBuilder
+from casestudyone.python.DslAst import Clause, EndsWith, FollowedWith, Rule, StartsWith
+from casestudyone.python.FastRegexParser import FastRegexParser
+from casestudyone.python.RegexEmitter import RegexEmitter
+from casestudyone.python.SemanticError import SemanticError
+from casestudyone.python.SemanticModelBuilder import SemanticModelBuilder
+
+# Where a rule is in the starts with / followed with* / ends with grammar, i.e. which clauses may come next.
+BEFORE_FIRST_CLAUSE, AFTER_CLAUSE, AFTER_ENDS_WITH = 0, 1, 2
+# The horizon of a clause that may have read to the end of the text, wherever that is after an edit.
+UNBOUNDED = sys.maxsize
+
+
+class ClauseSpan(NamedTuple):
+    # start is the end of the previous clause, so the spans tile the text up to the trailing whitespace.
+    # Parsing the clause reads nothing at or after horizon.
+    start: int
+    end: int
+    horizon: int
+    clause: Clause
+    regex: str
+
+    def shifted(self, delta: int) -> 'ClauseSpan':
+        return ClauseSpan(self.start + delta, self.end + delta, self.horizon + delta, self.clause, self.regex)
+
+
+class Translation(NamedTuple):
+    text: str
+    clauses: Tuple[ClauseSpan, ...]
+    rule: Rule
+    regex: str
+    reparsed: int
+
+
+class IncrementalTranslator:
+    """Re-translates a rule after an edit by parsing only the clauses the edit can affect.
+
+    Clauses before the edit are kept if their own text is unchanged and the probes that ended them, for a
+    new line, a following "or" or " occurs ", still fail. From the first affected clause on, clauses are
+    parsed again until one ends exactly where an old clause after the edit started; the clauses from there on
+    are reused, shifted by the length change.
+    The translated fragment of every reused clause is reused as well.
+
+    The result is the one a full parse gives. Texts that do not parse are handed to a full parse, so errors
+    are raised exactly as FastRegexParser and RegexParser raise them.
+    """
+
+    @staticmethod
+    def translate(text: str) -> Translation:
+        return IncrementalTranslator.build(text, [], 0, ())
+
+    @staticmethod
+    def update(previous: Translation, start: int, end: int, replacement: str) -> Translation:
+        if not 0 <= start <= end <= len(previous.text):
+            raise ValueError("edit range {0}..{1} is outside the text of length {2}".format(
+                start, end, len(previous.text)))
+        text = previous.text[:start] + replacement + previous.text[end:]
+        delta = len(replacement) - (end - start)
+
+        kept: List[ClauseSpan] = []
+        for span in previous.clauses:
+            if span.horizon > start and not IncrementalTranslator.still_ends(text, span, start):
+                break
+            kept.append(span)
+        # Only clauses whose whole span, including the whitespace in front of them, comes after the edit.
+        reusable = tuple(span.shifted(delta) for span in previous.clauses[len(kept):] if span.start >= end)
+        index = kept[-1].end if kept else 0
+        return IncrementalTranslator.build(text, kept, index, reusable)
+
+    @staticmethod
+    def build(text: str, clauses: List[ClauseSpan], index: int, reusable: Tuple[ClauseSpan, ...]) -> Translation:
+        from_scratch = not clauses and not reusable
+        reparsed = 0
+        state = IncrementalTranslator.state_after(clauses)
+        reusable_by_start = {span.start: position for position, span in enumerate(reusable)}
+        try:
+            while True:
+                position = reusable_by_start.get(index)
+                if position is not None and IncrementalTranslator.allowed(reusable[position].clause, state):
+                    clauses.extend(reusable[position:])
+                    break
+                span = IncrementalTranslator.parse_clause(text, index, state)
+                if span is None:
+                    break
+                clauses.append(span)
+                reparsed += 1
+                index = span.end
+                state = IncrementalTranslator.state_after(clauses)
+        except SemanticError:
+            # A semantic error, e.g. a quantification in the wrong order; the full parse reports it.
+            clauses = None
+
+        if clauses is None or IncrementalTranslator.rule_end(text, clauses) != len(text):
+            return IncrementalTranslator.full_translation(text, from_scratch)
+        return IncrementalTranslator.assemble(text, tuple(clauses), reparsed)
+
+    @staticmethod
+    def full_translation(text: str, from_scratch: bool) -> Translation:
+        # The text is translated again without the old clauses, which ends up here from scratch if that fails as
+        # well. Only then is the text parsed as a whole, once: that raises the error of a text that does not parse,
+        # and a text that does parse gets a translation without clauses, so the next update parses it whole, too.
+        if not from_scratch:
+            return IncrementalTranslator.translate(text)
+        rule = FastRegexParser.parse_ast(text)
+        reparsed = (rule.starts_with is not None) + len(rule.followed_with) + (rule.ends_with is not None)
+        return Translation(text, (), rule, RegexEmitter.emit(rule), reparsed)
+
+    @staticmethod
+    def parse_clause(text: str, index: int, state: int) -> Optional[ClauseSpan]:
+        # The same order of attempts as FastRegexParser.parse_rule; its optional whitespace skips are
+        # idempotent, so every clause may skip the whitespace in front of it itself.
+        step = None
+        if state == BEFORE_FIRST_CLAUSE:
+            step = FastRegexParser.starts_with(text, FastRegexParser.skip_whitespace(text, index))
+        if step is None and state != AFTER_ENDS_WITH:
+            step = FastRegexParser.followed_with(text, index)
+            if step is None:
+                step = FastRegexParser.ends_with(text, FastRegexParser.skip_whitespace(text, index))
+        if step is None:
+            return None
+        clause, end = step
+        # A clause without items gave up on an item at its end, after reading an unknown stretch of text.
+        horizon = IncrementalTranslator.horizon(text, end) if clause.alternation.items else UNBOUNDED
+        return ClauseSpan(index, end, horizon, clause, RegexEmitter.emit_clause(clause))
+
+    @staticmethod
+    def horizon(text: str, end: int) -> int:
+        # After its content a clause probes for a new line, for " occurs " and, past the whitespace, for "or";
+        # a probe reads up to the first character that differs. A probe that succeeds goes on to scan far ahead.
+        content_end = end - 1 if text.startswith('\n', end - 1) else end
+        following = FastRegexParser.skip_whitespace(text, content_end)
+        if text.startswith('or', following) or text.startswith(' occurs ', content_end):
+            return UNBOUNDED
+        return max(end, IncrementalTranslator.probe_end(text, following, 'or'),
+                   IncrementalTranslator.probe_end(text, content_end, ' occurs '))
+
+    @staticmethod
+    def probe_end(text: str, index: int, literal: str) -> int:
+        length = 0
+        while length < len(literal) and text.startswith(literal[length], index + length):
+            length += 1
+        return index + length + 1
+
+    @staticmethod
+    def still_ends(text: str, span: ClauseSpan, start: int) -> bool:
+        # For a clause that ends before an edit its probes read into: the probes fail on the new text as well.
+        end = span.end
+        content_end = end - 1 if text.startswith('\n', end - 1) else end
+        if content_end >= start or not span.clause.alternation.items:
+            return False
+        following = FastRegexParser.skip_whitespace(text, content_end)
+        return not (text.startswith('or', following) or text.startswith(' occurs ', content_end)
+                    or (content_end == end and text.startswith('\n', end)))
+
+    @staticmethod
+    def rule_end(text: str, clauses: List[ClauseSpan]) -> int:
+        # Whitespace after the last clause is only skipped while an ends with clause may still follow.
+        if clauses and isinstance(clauses[-1].clause, EndsWith):
+            return clauses[-1].end
+        return FastRegexParser.skip_whitespace(text, clauses[-1].end if clauses else 0)
+
+    @staticmethod
+    def state_after(clauses: List[ClauseSpan]) -> int:
+        if not clauses:
+            return BEFORE_FIRST_CLAUSE
+        return AFTER_ENDS_WITH if isinstance(clauses[-1].clause, EndsWith) else AFTER_CLAUSE
+
+    @staticmethod
+    def allowed(clause: Clause, state: int) -> bool:
+        if state == AFTER_ENDS_WITH:
+            return False
+        return state == BEFORE_FIRST_CLAUSE or not isinstance(clause, StartsWith)
+
+    @staticmethod
+    def assemble(text: str, clauses: Tuple[ClauseSpan, ...], reparsed: int) -> Translation:
+        starts_with = clauses[0] if clauses and isinstance(clauses[0].clause, StartsWith) else None
+        ends_with = clauses[-1] if clauses and isinstance(clauses[-1].clause, EndsWith) else None
+        followed_with = [span for span in clauses if isinstance(span.clause, FollowedWith)]
+        rule = AstBuilder.build_rule(starts_with and starts_with.clause,
+                                     [span.clause for span in followed_with],
+                                     ends_with and ends_with.clause)
+        regex = SemanticModelBuilder.build_regex(starts_with and starts_with.regex,
+                                                 [span.regex for span in followed_with],
+                                                 ends_with and ends_with.regex)
+        return Translation(text, clauses, rule, regex, reparsed)
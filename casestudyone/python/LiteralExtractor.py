@@ -0,0 +1,66 @@
+from typing import List, Optional, Tuple
+
+from casestudyone.python.RegexSyntaxTree import Alternation, Anchor, Group, Literal, Node, RegexSyntaxError, \
+    RegexSyntaxTree, Repeat, Sequence
+
+# (exact, required): exact is the only string the node can match, or None if there are several.
+# required lists literal strings that every match of the node contains.
+Analysis = Tuple[Optional[str], List[str]]
+
+
+class LiteralExtractor:
+    @staticmethod
+    def required_literals(regex: str) -> Tuple[str, ...]:
+        try:
+            tree = RegexSyntaxTree.parse(regex)
+        except RegexSyntaxError:
+            return ()
+        exact, required = LiteralExtractor.analyze(tree)
+        if exact:
+            required = required + [exact]
+        # Longer literals reject more candidates, so they are checked first; contained ones are redundant.
+        literals = sorted(dict.fromkeys(literal for literal in required if literal), key=len, reverse=True)
+        return tuple(literal for index, literal in enumerate(literals)
+                     if not any(literal in longer for longer in literals[:index]))
+
+    @staticmethod
+    def analyze(node: Node) -> Analysis:
+        if isinstance(node, Literal):
+            return node.char, []
+        if isinstance(node, Anchor):
+            return '', []
+        if isinstance(node, Group):
+            return LiteralExtractor.analyze(node.body)
+        if isinstance(node, Sequence):
+            return LiteralExtractor.analyze_sequence(node)
+        if isinstance(node, Alternation):
+            analyses = [LiteralExtractor.analyze(branch) for branch in node.branches]
+            exact = analyses[0][0]
+            if exact is not None and all(analysis[0] == exact for analysis in analyses):
+                return exact, []
+            return None, []
+        if isinstance(node, Repeat):
+            if node.min == 0:
+                return None, []
+            exact, required = LiteralExtractor.analyze(node.body)
+            if exact is not None and node.min == node.max:
+                return exact * node.min, []
+            return None, required + ([exact * node.min] if exact else [])
+        return None, []
+
+    @staticmethod
+    def analyze_sequence(node: Sequence) -> Analysis:
+        required: List[str] = []
+        run: Optional[str] = ''
+        for item in node.items:
+            exact, item_required = LiteralExtractor.analyze(item)
+            required.extend(item_required)
+            if exact is not None:
+                run = (run or '') + exact
+                continue
+            if run:
+                required.append(run)
+            run = None
+        if run is None:
+            return None, required
+        return run, required
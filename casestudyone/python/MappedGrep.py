@@ -0,0 +1,84 @@
+import mmap
+import re
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional, Union
+
+from casestudyone.python.BytesRegex import BytesRegex
+from casestudyone.python.DslCompiler import DslCompiler
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class GrepMatch(NamedTuple):
+    start: int
+    end: int
+    line_start: int
+    line_end: int
+
+
+class MappedGrep:
+    """Scans UTF-8 files for one DSL rule without decoding them: the rule is translated once, compiled as a
+    bytes pattern and run directly over a memory map of the file.
+
+    In line mode the pattern cannot cross a newline, ^ and $ mean line start and line end (re.MULTILINE) and
+    every line is reported once. With line_regexp the whole line has to match. In whole-buffer mode the file
+    is one text and every non-overlapping match is reported.
+    """
+
+    def __init__(self, dsl: str, line_mode: bool = True, line_regexp: bool = False):
+        compiled_rule = DslCompiler.compile_rule(dsl)
+        regex = BytesRegex.translate(compiled_rule.pattern.pattern, line_mode)
+        if line_regexp:
+            regex = b'^(?:' + regex + b')$'
+        self.dsl = dsl
+        self.line_mode = line_mode
+        self.pattern: re.Pattern = re.compile(regex, re.MULTILINE if line_mode else 0)
+        self.required_literal: Optional[bytes] = next(
+            (literal for literal in compiled_rule.required_bytes if not line_mode or b'\n' not in literal), None)
+
+    def scan(self, buffer: Buffer) -> Iterator[GrepMatch]:
+        # One pass of find over a buffer that lacks a required literal is much cheaper than the pattern scan.
+        if self.required_literal is not None and buffer.find(self.required_literal) < 0:
+            return
+        if not self.line_mode:
+            for match in self.pattern.finditer(buffer):
+                # The engine also tries the empty match between the bytes of a character, str patterns do not.
+                start = match.start()
+                if start == match.end() and start < len(buffer) and 0x80 <= buffer[start] <= 0xBF:
+                    continue
+                yield GrepMatch(match.start(), match.end(), match.start(), match.end())
+            return
+        # A newline at the end of the buffer ends its last line; no empty line follows it, and an empty buffer
+        # has no lines at all.
+        if not buffer:
+            return
+        lines_end = len(buffer) - 1 if buffer[-1:] == b'\n' else len(buffer)
+        position = 0
+        while position <= lines_end:
+            match = self.pattern.search(buffer, position)
+            if match is None or match.start() > lines_end:
+                return
+            line_start, line_end = MappedGrep.line_bounds(buffer, match.start())
+            yield GrepMatch(match.start(), match.end(), line_start, line_end)
+            position = line_end + 1
+
+    @staticmethod
+    def line_bounds(buffer: Buffer, offset: int):
+        line_end = buffer.find(b'\n', offset)
+        return buffer.rfind(b'\n', 0, offset) + 1, len(buffer) if line_end < 0 else line_end
+
+    def count(self, buffer: Buffer) -> int:
+        return sum(1 for _ in self.scan(buffer))
+
+    @staticmethod
+    @contextmanager
+    def map_file(path: str) -> Iterator[Buffer]:
+        with open(path, 'rb') as file:
+            # An empty file cannot be mapped, and there is nothing to scan in it anyway.
+            if file.seek(0, 2) == 0:
+                yield b''
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    buffer.madvise(mmap.MADV_SEQUENTIAL)
+                yield buffer
@@ -0,0 +1,55 @@
+from typing import List, Tuple
+
+from casestudyone.python.DslAst import Clause, InnerRegex, Rule
+from casestudyone.python.RegexSyntaxTree import Alternation, Anchor, Group, RegexSyntaxTree, Sequence
+
+# Every clause is emitted as one top-level capturing group, in the order of the rule. Renaming exactly these
+# groups, after all other captures (like the three inside Constants.ANY_NUMBER_PATTERN) were made non-capturing,
+# leaves a pattern that matches the same language and whose groups are nothing but the clauses of the rule.
+
+
+class NamedGroups:
+    @staticmethod
+    def clause_names(rule: Rule) -> Tuple[str, ...]:
+        names = [] if rule.starts_with is None else ['starts_with']
+        names.extend('followed_with_{0}'.format(index) for index in range(1, len(rule.followed_with) + 1))
+        if rule.ends_with is not None:
+            names.append('ends_with')
+        return tuple(names)
+
+    @staticmethod
+    def clauses(rule: Rule) -> Tuple[Clause, ...]:
+        return tuple(clause for clause in (rule.starts_with, *rule.followed_with, rule.ends_with)
+                     if clause is not None)
+
+    @staticmethod
+    def alternative_name(clause_name: str, index: int) -> str:
+        return '{0}_alt{1}'.format(clause_name, index)
+
+    @staticmethod
+    def name_groups(regex: str, rule: Rule, alternatives: bool = False) -> str:
+        node = RegexSyntaxTree.without_captures(RegexSyntaxTree.parse(regex))
+        items = RegexSyntaxTree.sequence_items(node)
+        groups = [index for index, item in enumerate(items) if not isinstance(item, Anchor)]
+        names = NamedGroups.clause_names(rule)
+        if len(groups) != len(names) or any(not isinstance(items[index], Group) for index in groups):
+            raise ValueError("the clauses of the rule do not map to the groups of {0!r}".format(regex))
+        named: List = list(items)
+        for index, name, clause in zip(groups, names, NamedGroups.clauses(rule)):
+            body = items[index].body
+            if alternatives:
+                body = NamedGroups.name_alternatives(body, clause, name)
+            named[index] = Group(body, name=name)
+        return RegexSyntaxTree.emit(Sequence(tuple(named)))
+
+    @staticmethod
+    def name_alternatives(body, clause: Clause, clause_name: str):
+        # Alternatives are only named where the branches are exactly the items of the clause. Inner regex blocks
+        # and terms that contain a raw "|" do not line up and keep the clause group alone.
+        items = clause.alternation.items
+        branches = body.branches if isinstance(body, Alternation) else (body,)
+        if len(branches) != len(items) or any(isinstance(item, InnerRegex) for item in items):
+            return body
+        named = tuple(Sequence((Group(branch, name=NamedGroups.alternative_name(clause_name, index)),))
+                      for index, branch in enumerate(branches, start=1))
+        return named[0] if len(named) == 1 else Alternation(named)
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Hashable, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    max_size: int
+    current_size: int
+
+
+class PatternCache:
+    def __init__(self, max_size: int = 1024):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1, got {0}".format(max_size))
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], object]):
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        # The factory runs outside the lock: translating a rule can take a while and may raise.
+        value = factory()
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._entries[key] = value
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def get(self, key: Hashable):
+        # The value, or None on a miss, for callers that create the value in steps of their own and put() it.
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def resize(self, max_size: int):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1, got {0}".format(max_size))
+        with self._lock:
+            self.max_size = max_size
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.max_size, len(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,65 @@
+import csv
+from json.encoder import encode_basestring
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from casestudyone.python.DslCompiler import DslCompiler
+
+EXTRACT_MODES = ('fullmatch', 'match', 'search')
+
+Record = Tuple[Optional[str], ...]
+
+
+class RecordExtractor:
+    def __init__(self, dsl: str, mode: str = 'fullmatch', alternatives: bool = False):
+        if mode not in EXTRACT_MODES:
+            raise ValueError("mode must be one of {0}, got {1!r}".format(EXTRACT_MODES, mode))
+        self.rule = DslCompiler.compile_named(dsl, alternatives)
+        self.mode = mode
+        # Every group is named, so groups() already returns the fields in order.
+        self.fields: Tuple[str, ...] = tuple(sorted(self.rule.pattern.groupindex,
+                                                    key=self.rule.pattern.groupindex.__getitem__))
+        self.match = getattr(self.rule.pattern, mode)
+        self.lines = 0
+
+    def records(self, lines: Iterable[str]) -> Iterator[Record]:
+        # One regex pass per line; the line ending is excluded through endpos instead of a stripped copy.
+        might_match, match = self.rule.might_match, self.match
+        self.lines = 0
+        for line in lines:
+            self.lines += 1
+            if not might_match(line):
+                continue
+            end = len(line)
+            if line.endswith('\n'):
+                end -= 2 if line.endswith('\r\n') else 1
+            found = match(line, 0, end)
+            if found is not None:
+                yield found.groups()
+
+    def dicts(self, lines: Iterable[str]) -> Iterator[Dict[str, Optional[str]]]:
+        fields = self.fields
+        return (dict(zip(fields, record)) for record in self.records(lines))
+
+    def write_jsonl(self, lines: Iterable[str], output: TextIO) -> int:
+        # The keys are encoded once; per record only the values are encoded and handed to writelines.
+        keys = ['{0}{1}: '.format('{' if index == 0 else ', ', encode_basestring(field))
+                for index, field in enumerate(self.fields)]
+        written = 0
+        parts = [''] * (2 * len(keys)) + ['}\n' if keys else '{}\n']
+        for index, key in enumerate(keys):
+            parts[2 * index] = key
+        for record in self.records(lines):
+            for index, value in enumerate(record):
+                parts[2 * index + 1] = 'null' if value is None else encode_basestring(value)
+            output.writelines(parts)
+            written += 1
+        return written
+
+    def write_csv(self, lines: Iterable[str], output: TextIO) -> int:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(self.fields)
+        written = 0
+        for record in self.records(lines):
+            writer.writerow(record)
+            written += 1
+        return written
@@ -0,0 +1,81 @@
+from typing import List, Tuple, Union
+
+from casestudyone.python.DslAst import Clause, EndsWith, InnerRegex, Item, Predefined, Quantified, Rule, \
+    StartsWith, Term
+from casestudyone.python.PatternCache import CacheInfo, PatternCache
+from casestudyone.python.SemanticModelBuilder import SemanticModelBuilder
+
+
+class RegexEmitter:
+    @staticmethod
+    def emit(rule: Rule) -> str:
+        return SemanticModelBuilder.build_regex(
+            RegexEmitter.emit_clause(rule.starts_with) if rule.starts_with is not None else None,
+            [RegexEmitter.emit_clause(clause) for clause in rule.followed_with],
+            RegexEmitter.emit_clause(rule.ends_with) if rule.ends_with is not None else None)
+
+    clause_cache: PatternCache = PatternCache(max_size=65536)
+
+    # Inner clauses whose translation is longer are not cached, so a deeply nested rule is neither joined again
+    # at every level nor kept in the cache once per level.
+    max_cached_inner_length: int = 4096
+
+    @staticmethod
+    def emit_clause(clause: Clause) -> str:
+        # Clauses of inner regexes stay in the fragments as placeholders and are expanded from an explicit
+        # stack, so deep nesting neither recurses nor copies the text of a clause into every enclosing one.
+        # A (clause, first part, length so far) marker below the fragments of a clause stores its translation.
+        parts: List[str] = []
+        length = 0
+        stack: List[Union[str, Clause, Tuple[Clause, int, int]]] = [clause]
+        while stack:
+            fragment = stack.pop()
+            if isinstance(fragment, str):
+                parts.append(fragment)
+                length += len(fragment)
+            elif isinstance(fragment, tuple):
+                emitted, start, start_length = fragment
+                if emitted is clause or length - start_length <= RegexEmitter.max_cached_inner_length:
+                    parts[start:] = [''.join(parts[start:])]
+                    RegexEmitter.clause_cache.put(emitted, parts[start])
+            else:
+                cached = RegexEmitter.clause_cache.get(fragment)
+                if cached is not None:
+                    parts.append(cached)
+                    length += len(cached)
+                    continue
+                stack.append((fragment, len(parts), length))
+                stack.extend(reversed(RegexEmitter.clause_fragments(fragment)))
+        return ''.join(parts)
+
+    @staticmethod
+    def cache_info() -> CacheInfo:
+        return RegexEmitter.clause_cache.info()
+
+    @staticmethod
+    def cache_clear():
+        RegexEmitter.clause_cache.clear()
+
+    @staticmethod
+    def clause_fragments(clause: Clause) -> List[Union[str, Clause]]:
+        content = [list(item.clauses) if isinstance(item, InnerRegex) else RegexEmitter.emit_item(item)
+                   for item in clause.alternation.items]
+        if isinstance(clause, StartsWith):
+            return SemanticModelBuilder.starts_with_fragments(content)
+        if isinstance(clause, EndsWith):
+            return SemanticModelBuilder.ends_with_fragments(content)
+        return SemanticModelBuilder.followed_with_fragments(content)
+
+    @staticmethod
+    def emit_item(item: Item) -> str:
+        if isinstance(item, Term):
+            return SemanticModelBuilder.build_single_term(RegexEmitter.map_term(item), None)
+        if isinstance(item, Quantified):
+            return SemanticModelBuilder.build_single_term(RegexEmitter.map_term(item.term), item.quantifier)
+        if isinstance(item, Predefined):
+            return item.pattern
+        raise TypeError("not a DSL term: {0!r}".format(item))
+
+    @staticmethod
+    def map_term(term: Term) -> str:
+        return SemanticModelBuilder.map_term('"{0}"'.format(term.text))
@@ -0,0 +1,134 @@
+from typing import List, Tuple
+
+from casestudyone.python.RegexSyntaxTree import Alternation, CharClass, Group, Literal, Node, RegexSyntaxError, \
+    RegexSyntaxTree, Repeat, Sequence, SINGLE_CHARACTER_NODES
+
+Items = Tuple[Node, ...]
+
+
+class RegexOptimizer:
+    """Rewrites generated patterns for matching speed. Unnamed groups stop capturing, so only use the result
+    where callers do not read numbered groups. The set of matched strings, and which match the engine returns
+    first, stay the same: alternatives keep their order and only single-character atoms are factored out."""
+
+    @staticmethod
+    def optimize(pattern: str) -> str:
+        try:
+            tree = RegexSyntaxTree.parse(pattern)
+        except RegexSyntaxError:
+            return pattern
+        return RegexSyntaxTree.emit(RegexOptimizer.optimize_node(tree))
+
+    @staticmethod
+    def optimize_node(node: Node) -> Node:
+        if isinstance(node, Sequence):
+            return RegexOptimizer.simplify_items(RegexOptimizer.optimize_items(node.items))
+        if isinstance(node, Alternation):
+            branches: List[Items] = []
+            for branch in node.branches:
+                branches.extend(RegexOptimizer.alternatives_of(RegexOptimizer.optimize_node(branch)))
+            return RegexOptimizer.factor(branches)
+        if isinstance(node, Group):
+            body = RegexOptimizer.optimize_node(node.body)
+            if node.name is None and not node.atomic:
+                return Group(body, capturing=False)
+            return Group(body, node.capturing, node.name, node.atomic)
+        if isinstance(node, Repeat):
+            body = RegexOptimizer.optimize_node(node.body)
+            items = RegexOptimizer.items_of(body)
+            if len(items) == 1 and RegexSyntaxTree.is_atom(items[0]):
+                body = items[0]
+            elif not isinstance(body, Group):
+                body = Group(body, capturing=False)
+            return Repeat(body, node.min, node.max, node.lazy, node.possessive, node.source)
+        return node
+
+    @staticmethod
+    def optimize_items(items: Items) -> Items:
+        result: List[Node] = []
+        for item in items:
+            result.extend(RegexOptimizer.items_of(RegexOptimizer.optimize_node(item)))
+        return tuple(result)
+
+    @staticmethod
+    def is_plain_group(node: Node) -> bool:
+        return isinstance(node, Group) and not node.capturing and node.name is None and not node.atomic
+
+    @staticmethod
+    def items_of(node: Node) -> Items:
+        # The items a node contributes when it is spliced into an enclosing sequence.
+        if RegexOptimizer.is_plain_group(node) and isinstance(node.body, Sequence):
+            return node.body.items
+        if isinstance(node, Sequence):
+            return node.items
+        if isinstance(node, Alternation):
+            return Group(node, capturing=False),
+        return node,
+
+    @staticmethod
+    def alternatives_of(node: Node) -> List[Items]:
+        # The branches a node contributes when it is spliced into an enclosing alternation.
+        if isinstance(node, Alternation):
+            return [branch.items for branch in node.branches]
+        items = RegexOptimizer.items_of(node)
+        if len(items) == 1 and RegexOptimizer.is_plain_group(items[0]) and isinstance(items[0].body, Alternation):
+            return [branch.items for branch in items[0].body.branches]
+        return [items]
+
+    @staticmethod
+    def simplify_items(items: Items) -> Node:
+        if len(items) == 1 and RegexOptimizer.is_plain_group(items[0]) and isinstance(items[0].body, Alternation):
+            return items[0].body
+        return Sequence(items)
+
+    @staticmethod
+    def factor(branches: List[Items]) -> Node:
+        branches = RegexOptimizer.factor_prefixes(branches)
+        if len(branches) == 1:
+            return Sequence(branches[0])
+
+        suffix: List[Node] = []
+        while all(branch and isinstance(branch[-1], SINGLE_CHARACTER_NODES) and branch[-1] == branches[0][-1]
+                  for branch in branches):
+            suffix.insert(0, branches[0][-1])
+            branches = [branch[:-1] for branch in branches]
+        if not suffix:
+            return RegexOptimizer.alternation(branches)
+        head = RegexOptimizer.factor(branches)
+        return Sequence(RegexOptimizer.items_of(head) + tuple(suffix))
+
+    @staticmethod
+    def factor_prefixes(branches: List[Items]) -> List[Items]:
+        # An order preserving trie: only neighbouring branches that start with the same atom are merged.
+        result: List[Items] = []
+        start = 0
+        while start < len(branches):
+            first = branches[start][0] if branches[start] else None
+            end = start + 1
+            if isinstance(first, SINGLE_CHARACTER_NODES):
+                while end < len(branches) and branches[end] and branches[end][0] == first:
+                    end += 1
+            if end - start == 1:
+                result.append(branches[start])
+            else:
+                tails = RegexOptimizer.factor([branch[1:] for branch in branches[start:end]])
+                result.append((first,) + RegexOptimizer.items_of(tails))
+            start = end
+        return result
+
+    @staticmethod
+    def alternation(branches: List[Items]) -> Node:
+        if all(len(branch) == 1 and isinstance(branch[0], Literal) for branch in branches):
+            # Each branch consumes exactly one character, so a class matches the same and never backtracks.
+            return Sequence((CharClass.from_members(branch[0].char for branch in branches),))
+        if len(branches) == 2 and not branches[1] and branches[0]:
+            return Sequence((Repeat(RegexOptimizer.repeat_body(branches[0]), 0, 1),))
+        if len(branches) == 2 and not branches[0] and branches[1]:
+            return Sequence((Repeat(RegexOptimizer.repeat_body(branches[1]), 0, 1, lazy=True),))
+        return Alternation(tuple(Sequence(branch) for branch in branches))
+
+    @staticmethod
+    def repeat_body(items: Items) -> Node:
+        if len(items) == 1 and RegexSyntaxTree.is_atom(items[0]):
+            return items[0]
+        return Group(Sequence(items), capturing=False)
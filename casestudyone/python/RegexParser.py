@@ -1,60 +1,96 @@
-from parsy import Parser, forward_declaration, regex, string, whitespace, seq
+from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+from casestudyone.python.AstBuilder import AstBuilder
 from casestudyone.python.Constants import Constants
+from casestudyone.python.RegexEmitter import RegexEmitter
 from casestudyone.python.SemanticModelBuilder import SemanticModelBuilder
+from common.python.LazyGrammar import LazyGrammar
+
+if TYPE_CHECKING:
+    from parsy import Parser
+
+
+class RegexParser(metaclass=LazyGrammar):
+    @staticmethod
+    def build_grammar() -> dict:
+        from parsy import Parser, Result, forward_declaration, regex, string, whitespace, seq
+
+        from casestudyone.python.FastRegexParser import FastRegexParser
+        from common.python.Dispatch import dispatch
+
+        def without_recursion_limit(parser: Parser) -> Parser:
+            # The grammar recurses once per level of inner regexes. Rules nested too deep for the recursion limit
+            # are parsed by the hand-written parser, which keeps its own stack and builds the same rule.
+            @Parser
+            def rule(stream, index):
+                try:
+                    return parser(stream, index)
+                except RecursionError:
+                    value, end = FastRegexParser.parse_rule(stream[index:])
+                    return Result.success(index + end, value)
+
+            return rule
+
+        quantification_pattern: Parser = regex('(\\d+)\\.\\.(\\d+)').desc(
+            'a correct quantification pattern such as 1..2 with only positive values and in correct order')
+
+        occurs_parser = string(" occurs ")
+        indefinitely_parser = regex('indefinitely').result(Constants.INDEFINITELY)
+        quantification_parser: Parser = occurs_parser.then(
+            indefinitely_parser | quantification_pattern.mark().map(lambda x: SemanticModelBuilder.
+                                                                    build_quantification(x[0], x[1], x[2])))
+
+        term_pattern: Parser = regex('"[^"]+"').desc('term surrounded by double quotes e.g "hello world"')
+        term_parser: Parser = seq(term_pattern, quantification_parser.optional()).combine(
+            lambda term, quantification: AstBuilder.build_term(term, quantification))
+
+        anything_parser: Parser = string("anything").result(AstBuilder.build_predefined("anything"))
+        something_parser: Parser = string("something").result(AstBuilder.build_predefined("something"))
+        letters_parser: Parser = string("letters").result(AstBuilder.build_predefined("letters"))
+        numbers_parser: Parser = string("numbers").result(AstBuilder.build_predefined("numbers"))
+        predefined_terms: tuple = ("anything", "something", "letters", "numbers")
+        predefined_terms_parser: Parser = dispatch(
+            (("anything",), anything_parser), (("something",), something_parser), (("letters",), letters_parser),
+            (("numbers",), numbers_parser))
+
+        new_line_opt_parser: Parser = string('\n').desc('new line').optional()
+        whitespace_opt_parser: Parser = whitespace.desc('whitespace').optional()
+
+        inner_regex_parser: forward_declaration = forward_declaration()
+
+        or_parser: Parser = whitespace.optional().then(string('or')).skip(
+            whitespace.optional())
+        item_parser: Parser = dispatch(
+            (('inner regex(',), inner_regex_parser), (predefined_terms, predefined_terms_parser), (('"',), term_parser))
+        split_by_or_parser: Parser = Parser.sep_by(item_parser, or_parser)
+
+        starts_with_parser: Parser = string("starts with ").then(split_by_or_parser.map(
+            lambda content: AstBuilder.starts_with_builder(content))).skip(new_line_opt_parser)
+
+        followed_with_parser: Parser = whitespace_opt_parser.then(
+            string("followed with ")).then(split_by_or_parser.map(
+            lambda content: AstBuilder.followed_with_builder(content))).skip(new_line_opt_parser)
+
+        ends_with_parser: Parser = string("ends with ").then(split_by_or_parser.map(
+            lambda content: AstBuilder.ends_with_builder(content))).skip(new_line_opt_parser)
+
+        inner_regex_parser.become(
+            string('inner regex(').desc(
+                'inner regex(followed with "Example" followed with "Example2")').then(
+                followed_with_parser.many().map(lambda followed_with: AstBuilder.build_inner_regex(followed_with)))
+            .skip(string(')')))
+
+        rule_parser: Parser = without_recursion_limit(seq(whitespace_opt_parser.then(
+            starts_with_parser.optional()),
+            whitespace_opt_parser.then(followed_with_parser.many().optional()),
+            whitespace_opt_parser.then(ends_with_parser.optional())
+        ).combine(
+            lambda starts_with_opt, followed_with_opt, ends_with_opt:
+            AstBuilder.build_rule(starts_with_opt, followed_with_opt, ends_with_opt)))
 
+        regex_parser: Parser = rule_parser.map(lambda rule: RegexEmitter.emit(rule))
 
-class RegexParser:
-    quantification_pattern: Parser = regex('(\\d+)\\.\\.(\\d+)').desc(
-        'a correct quantification pattern such as 1..2 with only positive values and in correct order')
-
-    occurs_parser = string(" occurs ")
-    indefinitely_parser = regex('indefinitely').result(Constants.INDEFINITELY)
-    quantification_parser: Parser = occurs_parser.then(
-        indefinitely_parser | quantification_pattern.mark().map(lambda x: SemanticModelBuilder.
-                                                                build_quantification(x[0], x[1], x[2])))
-
-    term_pattern: Parser = regex('"[^"]+"').desc('term surrounded by double quotes e.g "hello world"')
-    term_parser: Parser = seq(term_pattern, quantification_parser.optional()).combine(lambda term, quantification:
-                                                                                      SemanticModelBuilder.build_single_term(
-                                                                                          SemanticModelBuilder.map_term(
-                                                                                              term), quantification))
-
-    anything_parser: Parser = string("anything").result(Constants.ANYTHING_PATTERN)
-    something_parser: Parser = string("something").result(Constants.SOMETHING_PATTERN)
-    letters_parser: Parser = string("letters").result(Constants.ANY_LETTERS_PATTERN)
-    numbers_parser: Parser = string("numbers").result(Constants.ANY_NUMBER_PATTERN)
-    predefined_terms_parser: Parser = anything_parser | something_parser | letters_parser | numbers_parser
-
-    new_line_opt_parser: Parser = string('\n').desc('new line').optional()
-    whitespace_opt_parser: Parser = whitespace.desc('whitespace').optional()
-
-    inner_regex_parser: forward_declaration = forward_declaration()
-
-    or_parser: Parser = whitespace.optional().then(string('or')).skip(
-        whitespace.optional())
-    split_by_or_parser: Parser = Parser.sep_by(inner_regex_parser | predefined_terms_parser | term_parser, or_parser)
-
-    starts_with_parser: Parser = string("starts with ").then(split_by_or_parser.map(
-        lambda content: SemanticModelBuilder.starts_with_builder(content))).skip(new_line_opt_parser)
-
-    followed_with_parser: Parser = whitespace_opt_parser.then(
-        string("followed with ")).then(split_by_or_parser.map(
-        lambda content: SemanticModelBuilder.followed_with_builder(content))).skip(new_line_opt_parser)
-
-    ends_with_parser: Parser = string("ends with ").then(split_by_or_parser.map(
-        lambda content: SemanticModelBuilder.ends_with_builder(content))).skip(new_line_opt_parser)
-
-    inner_regex_parser.become(
-        string('inner regex(').desc(
-            'inner regex(followed with "Example" followed with "Example2")').then(followed_with_parser.many())
-        .skip(string(')')))
-
-    regex_parser: Parser = seq(whitespace_opt_parser.then(
-        starts_with_parser.optional()),
-        whitespace_opt_parser.then(followed_with_parser.many().optional()),
-        whitespace_opt_parser.then(ends_with_parser.optional())
-    ).combine(
-        lambda starts_with_opt, followed_with_opt, ends_with_opt:
-        SemanticModelBuilder
-        .build_regex(starts_with_opt, followed_with_opt, ends_with_opt))
+        return {name: parser for name, parser in locals().items()
+                if isinstance(parser, Parser) and parser is not whitespace}
@@ -0,0 +1,353 @@
+import re
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Optional, Tuple, Union
+
+# A small model of the regular expression subset that SemanticModelBuilder emits: literals, character classes,
+# the dot, ^ and $, groups, alternation and greedy/lazy/possessive repetition. It is used to analyse and rewrite
+# generated patterns. Anything outside the subset raises RegexSyntaxError so callers can fall back to the
+# pattern they started from.
+
+SPECIAL_CHARACTERS: str = '.^$*+?{}[]\\|()'
+CLASS_SPECIAL_CHARACTERS: str = '\\]^-['
+CATEGORIES: str = 'dDsSwW'
+REPEAT_BRACES_PATTERN: re.Pattern = re.compile(r'\{([0-9]*)(?:(,)([0-9]*))?\}')
+
+
+class RegexSyntaxError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Literal:
+    char: str
+
+
+@dataclass(frozen=True)
+class CharClass:
+    source: str
+    chars: FrozenSet[str] = frozenset()
+    ranges: Tuple[Tuple[str, str], ...] = ()
+    categories: FrozenSet[str] = frozenset()
+    negated: bool = False
+
+    @staticmethod
+    def from_members(chars=(), ranges=(), categories=(), negated: bool = False) -> 'CharClass':
+        chars, ranges, categories = frozenset(chars), tuple(ranges), frozenset(categories)
+        if not negated and not chars and not ranges and len(categories) == 1:
+            source = '\\' + next(iter(categories))
+        else:
+            source = '[{0}{1}{2}{3}]'.format(
+                '^' if negated else '',
+                ''.join('{0}-{1}'.format(escape_class_char(low), escape_class_char(high)) for low, high in ranges),
+                ''.join(escape_class_char(char) for char in sorted(chars)),
+                ''.join('\\' + category for category in sorted(categories)))
+        return CharClass(source, chars, ranges, categories, negated)
+
+
+@dataclass(frozen=True)
+class AnyChar:
+    pass
+
+
+@dataclass(frozen=True)
+class Anchor:
+    kind: str
+
+
+@dataclass(frozen=True)
+class Sequence:
+    items: Tuple['Node', ...] = ()
+
+
+@dataclass(frozen=True)
+class Alternation:
+    branches: Tuple[Sequence, ...]
+
+
+@dataclass(frozen=True)
+class Group:
+    body: 'Node'
+    capturing: bool = True
+    name: Optional[str] = None
+    atomic: bool = False
+
+
+@dataclass(frozen=True)
+class Repeat:
+    body: 'Node'
+    min: int
+    max: Optional[int]
+    lazy: bool = False
+    possessive: bool = False
+    source: Optional[str] = field(default=None, compare=False)
+
+
+Node = Union[Literal, CharClass, AnyChar, Anchor, Sequence, Alternation, Group, Repeat]
+SINGLE_CHARACTER_NODES = (Literal, CharClass, AnyChar)
+
+
+def escape_literal(char: str) -> str:
+    return '\\' + char if char in SPECIAL_CHARACTERS else char
+
+
+def escape_class_char(char: str) -> str:
+    return '\\' + char if char in CLASS_SPECIAL_CHARACTERS else char
+
+
+class RegexSyntaxTree:
+    @staticmethod
+    def parse(pattern: str) -> Node:
+        parser = _PatternParser(pattern)
+        node = parser.parse_alternation()
+        if parser.index != len(pattern):
+            raise RegexSyntaxError("unbalanced parenthesis at {0} in {1!r}".format(parser.index, pattern))
+        return node
+
+    @staticmethod
+    def emit(node: Node) -> str:
+        if isinstance(node, Literal):
+            return escape_literal(node.char)
+        if isinstance(node, CharClass):
+            return node.source
+        if isinstance(node, AnyChar):
+            return '.'
+        if isinstance(node, Anchor):
+            return node.kind
+        if isinstance(node, Sequence):
+            return ''.join(RegexSyntaxTree.emit(item) for item in node.items)
+        if isinstance(node, Alternation):
+            return '|'.join(RegexSyntaxTree.emit(branch) for branch in node.branches)
+        if isinstance(node, Group):
+            if node.atomic:
+                prefix = '(?>'
+            elif node.name is not None:
+                prefix = '(?P<{0}>'.format(node.name)
+            else:
+                prefix = '(' if node.capturing else '(?:'
+            return prefix + RegexSyntaxTree.emit(node.body) + ')'
+        if isinstance(node, Repeat):
+            body = RegexSyntaxTree.emit(node.body)
+            if not RegexSyntaxTree.is_atom(node.body):
+                body = '(?:{0})'.format(body)
+            return body + RegexSyntaxTree.emit_quantifier(node)
+        raise TypeError("not a regex syntax node: {0!r}".format(node))
+
+    @staticmethod
+    def emit_quantifier(node: Repeat) -> str:
+        if node.source is not None:
+            quantifier = node.source
+        elif (node.min, node.max) == (0, None):
+            quantifier = '*'
+        elif (node.min, node.max) == (1, None):
+            quantifier = '+'
+        elif (node.min, node.max) == (0, 1):
+            quantifier = '?'
+        elif node.min == node.max:
+            quantifier = '{{{0}}}'.format(node.min)
+        else:
+            quantifier = '{{{0},{1}}}'.format(node.min, '' if node.max is None else node.max)
+        return quantifier + ('?' if node.lazy else '+' if node.possessive else '')
+
+    @staticmethod
+    def is_atom(node: Node) -> bool:
+        return isinstance(node, (Literal, CharClass, AnyChar, Group))
+
+    @staticmethod
+    def sequence_items(node: Node) -> Tuple[Node, ...]:
+        return node.items if isinstance(node, Sequence) else (node,)
+
+    @staticmethod
+    def children(node: Node) -> Tuple[Node, ...]:
+        if isinstance(node, Sequence):
+            return node.items
+        if isinstance(node, Alternation):
+            return node.branches
+        if isinstance(node, (Group, Repeat)):
+            return node.body,
+        return ()
+
+    @staticmethod
+    def without_captures(node: Node) -> Node:
+        if isinstance(node, Sequence):
+            return Sequence(tuple(RegexSyntaxTree.without_captures(item) for item in node.items))
+        if isinstance(node, Alternation):
+            return Alternation(tuple(RegexSyntaxTree.without_captures(branch) for branch in node.branches))
+        if isinstance(node, Group):
+            return Group(RegexSyntaxTree.without_captures(node.body), capturing=False, atomic=node.atomic)
+        if isinstance(node, Repeat):
+            return Repeat(RegexSyntaxTree.without_captures(node.body), node.min, node.max, node.lazy,
+                          node.possessive, node.source)
+        return node
+
+    @staticmethod
+    def walk(node: Node):
+        stack: List[Node] = [node]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(RegexSyntaxTree.children(current)))
+
+
+class _PatternParser:
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.index = 0
+
+    def peek(self) -> Optional[str]:
+        return self.pattern[self.index] if self.index < len(self.pattern) else None
+
+    def error(self, message: str) -> RegexSyntaxError:
+        return RegexSyntaxError("{0} at {1} in {2!r}".format(message, self.index, self.pattern))
+
+    def parse_alternation(self) -> Node:
+        branches = [self.parse_sequence()]
+        while self.peek() == '|':
+            self.index += 1
+            branches.append(self.parse_sequence())
+        return branches[0] if len(branches) == 1 else Alternation(tuple(branches))
+
+    def parse_sequence(self) -> Sequence:
+        items: List[Node] = []
+        while self.peek() not in (None, '|', ')'):
+            atom = self.parse_atom()
+            items.append(self.parse_quantifiers(atom))
+        return Sequence(tuple(items))
+
+    def parse_quantifiers(self, atom: Node) -> Node:
+        start = self.index
+        char = self.peek()
+        if char == '*':
+            bounds = (0, None)
+            self.index += 1
+        elif char == '+':
+            bounds = (1, None)
+            self.index += 1
+        elif char == '?':
+            bounds = (0, 1)
+            self.index += 1
+        elif char == '{' and (bounds := self.parse_braces()) is not None:
+            pass
+        else:
+            return atom
+        if isinstance(atom, Anchor):
+            raise self.error("nothing to repeat")
+        source = self.pattern[start:self.index]
+        lazy = possessive = False
+        if self.peek() == '?':
+            lazy = True
+            self.index += 1
+        elif self.peek() == '+':
+            possessive = True
+            self.index += 1
+        if self.peek() in ('*', '+', '?') or (self.peek() == '{' and self.parse_braces(advance=False) is not None):
+            raise self.error("multiple repeat")
+        return Repeat(atom, bounds[0], bounds[1], lazy, possessive, source)
+
+    def parse_braces(self, advance: bool = True) -> Optional[Tuple[int, Optional[int]]]:
+        match = REPEAT_BRACES_PATTERN.match(self.pattern, self.index)
+        if match is None or match.group(0) == '{}':
+            return None
+        low, comma, high = match.groups()
+        minimum = int(low) if low else 0
+        maximum = (int(high) if high else None) if comma else minimum
+        if maximum is not None and maximum < minimum:
+            raise self.error("min repeat greater than max repeat")
+        if advance:
+            self.index = match.end()
+        return minimum, maximum
+
+    def parse_atom(self) -> Node:
+        char = self.pattern[self.index]
+        if char == '(':
+            return self.parse_group()
+        if char == '[':
+            return self.parse_class()
+        if char == '.':
+            self.index += 1
+            return AnyChar()
+        if char in '^$':
+            self.index += 1
+            return Anchor(char)
+        if char in '*+?':
+            raise self.error("nothing to repeat")
+        if char == '{' and self.parse_braces(advance=False) is not None:
+            raise self.error("nothing to repeat")
+        if char == '\\':
+            return self.parse_escape(in_class=False)
+        self.index += 1
+        return Literal(char)
+
+    def parse_group(self) -> Group:
+        self.index += 1
+        capturing, name, atomic = True, None, False
+        if self.pattern.startswith('?:', self.index):
+            capturing = False
+            self.index += 2
+        elif self.pattern.startswith('?>', self.index):
+            capturing, atomic = False, True
+            self.index += 2
+        elif self.pattern.startswith('?P<', self.index):
+            end = self.pattern.find('>', self.index)
+            if end == -1 or not self.pattern[self.index + 3:end].isidentifier():
+                raise self.error("bad group name")
+            name = self.pattern[self.index + 3:end]
+            self.index = end + 1
+        elif self.peek() == '?':
+            raise self.error("unsupported group extension")
+        body = self.parse_alternation()
+        if self.peek() != ')':
+            raise self.error("missing ), unterminated subpattern")
+        self.index += 1
+        return Group(body, capturing, name, atomic)
+
+    def parse_escape(self, in_class: bool) -> Union[Literal, CharClass]:
+        if self.index + 1 >= len(self.pattern):
+            raise self.error("bad escape (end of pattern)")
+        char = self.pattern[self.index + 1]
+        self.index += 2
+        if char in CATEGORIES:
+            return CharClass('\\' + char, categories=frozenset(char))
+        if char in 'nt':
+            return Literal('\n' if char == 'n' else '\t')
+        if char.isalnum():
+            raise self.error("unsupported escape \\" + char)
+        return Literal(char)
+
+    def parse_class(self) -> CharClass:
+        start = self.index
+        self.index += 1
+        negated = self.peek() == '^'
+        if negated:
+            self.index += 1
+        chars, ranges, categories = set(), [], set()
+        first = True
+        while True:
+            char = self.peek()
+            if char is None:
+                raise self.error("unterminated character set")
+            if char == ']' and not first:
+                self.index += 1
+                break
+            first = False
+            low = self.parse_class_char()
+            if isinstance(low, CharClass):
+                categories |= low.categories
+                continue
+            if self.peek() == '-' and self.index + 1 < len(self.pattern) and self.pattern[self.index + 1] != ']':
+                self.index += 1
+                high = self.parse_class_char()
+                if isinstance(high, CharClass) or high < low:
+                    raise self.error("bad character range")
+                ranges.append((low, high))
+            else:
+                chars.add(low)
+        return CharClass(self.pattern[start:self.index], frozenset(chars), tuple(ranges), frozenset(categories),
+                         negated)
+
+    def parse_class_char(self) -> Union[str, CharClass]:
+        if self.peek() == '\\':
+            escaped = self.parse_escape(in_class=True)
+            return escaped if isinstance(escaped, CharClass) else escaped.char
+        char = self.pattern[self.index]
+        self.index += 1
+        return char
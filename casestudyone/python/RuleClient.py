@@ -0,0 +1,118 @@
+import asyncio
+import itertools
+import json
+from typing import Dict, List, Optional, Set, Tuple
+
+from casestudyone.python.RuleService import MAX_LINE_BYTES, RuleServiceError
+
+# (rule id or None, dsl or None, mode): requests with the same key can share one batch.
+BatchKey = Tuple[Optional[str], Optional[str], str]
+
+
+class RuleClient:
+    """Client of a RuleService. Single texts passed to match within one event loop iteration, for example
+    from tasks run with asyncio.gather, go out as one batch per rule; a lone request is sent right away."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, max_batch: int = 1024):
+        self.reader = reader
+        self.writer = writer
+        self.max_batch = max_batch
+        self.requests_sent = 0
+        self._ids = itertools.count()
+        self._waiting: Dict[int, List[asyncio.Future]] = {}
+        self._batches: Dict[BatchKey, List[Tuple[str, asyncio.Future]]] = {}
+        # Batches being written, which wait for the writer to drain when the service does not keep up.
+        self._sending: Set[asyncio.Task] = set()
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @staticmethod
+    async def connect_unix(path: str, max_batch: int = 1024) -> 'RuleClient':
+        reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE_BYTES)
+        return RuleClient(reader, writer, max_batch)
+
+    @staticmethod
+    async def connect_tcp(host: str, port: int, max_batch: int = 1024) -> 'RuleClient':
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+        return RuleClient(reader, writer, max_batch)
+
+    async def match(self, text: str, rule: Optional[str] = None, dsl: Optional[str] = None,
+                    mode: str = 'fullmatch') -> bool:
+        key = RuleClient.batch_key(rule, dsl, mode)
+        future = asyncio.get_running_loop().create_future()
+        batch = self._batches.setdefault(key, [])
+        batch.append((text, future))
+        if len(batch) == 1:
+            asyncio.get_running_loop().call_soon(self._flush, key)
+        elif len(batch) >= self.max_batch:
+            self._flush(key)
+        return await future
+
+    async def match_many(self, texts: List[str], rule: Optional[str] = None, dsl: Optional[str] = None,
+                         mode: str = 'fullmatch') -> List[bool]:
+        key = RuleClient.batch_key(rule, dsl, mode)
+        futures = [asyncio.get_running_loop().create_future() for _ in texts]
+        await self._send(key, list(texts), futures)
+        return list(await asyncio.gather(*futures))
+
+    @staticmethod
+    def batch_key(rule: Optional[str], dsl: Optional[str], mode: str) -> BatchKey:
+        if (rule is None) == (dsl is None):
+            raise ValueError("pass either a rule id or a DSL rule")
+        return rule, dsl, mode
+
+    def _flush(self, key: BatchKey):
+        batch = self._batches.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._send(key, [text for text, _ in batch], [future for _, future in batch]))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, key: BatchKey, texts: List[str], futures: List[asyncio.Future]):
+        # Errors of the connection go to the futures of the batch, as the response would have.
+        try:
+            if self._receiver.done():
+                raise RuleServiceError("the connection to the rule service is closed")
+            rule, dsl, mode = key
+            request_id = next(self._ids)
+            request = {'id': request_id, 'texts': texts, 'mode': mode}
+            request.update({'rule': rule} if rule is not None else {'dsl': dsl})
+            self._waiting[request_id] = futures
+            self.writer.write(json.dumps(request).encode() + b'\n')
+            self.requests_sent += 1
+            await self.writer.drain()
+        except (RuleServiceError, ConnectionError) as error:
+            RuleClient._fail(futures, error)
+
+    async def _receive(self):
+        try:
+            while line := await self.reader.readline():
+                response = json.loads(line)
+                if 'error' in response:
+                    if response['id'] is None:
+                        # The service could not tell which request failed, e.g. one longer than its line limit, and
+                        # closes the connection; none of the outstanding requests will be answered.
+                        futures = [future for futures in self._waiting.values() for future in futures]
+                        self._waiting.clear()
+                    else:
+                        futures = self._waiting.pop(response['id'], [])
+                    RuleClient._fail(futures, RuleServiceError(response['error']))
+                    continue
+                futures = self._waiting.pop(response['id'], [])
+                for future, matched in zip(futures, response['matches']):
+                    if not future.done():
+                        future.set_result(matched)
+        finally:
+            for futures in self._waiting.values():
+                RuleClient._fail(futures, RuleServiceError("the connection to the rule service was closed"))
+            self._waiting.clear()
+
+    @staticmethod
+    def _fail(futures: List[asyncio.Future], error: Exception):
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await asyncio.gather(self._receiver, *self._sending, return_exceptions=True)
@@ -0,0 +1,126 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from casestudyone.python.BulkMatcher import MATCH_MODES
+from casestudyone.python.DslCompiler import DslCompiler
+
+# Requests and responses are single lines of JSON, so a batch of texts has to fit into one line.
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+class RuleServiceError(Exception):
+    pass
+
+
+class RuleService:
+    """A local asyncio server that matches batches of texts against DSL rules it keeps compiled.
+
+    Every request is one JSON line {"id": ..., "rule": rule id or "dsl": rule text, "texts": [...],
+    "mode": "fullmatch" or "search"} and is answered by {"id": ..., "matches": [...]} or
+    {"id": ..., "error": message}. Answers on one connection can come in any order. Translation and matching
+    run on a bounded thread pool so the event loop only moves bytes. At most max_pending requests are in
+    flight across all connections; beyond that the server stops reading, and the socket buffers push back on
+    the clients. A line longer than max_line_bytes gets an error with a null id, after which the connection is
+    closed once the requests before it are answered.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, str]] = None, workers: int = 4, max_pending: int = 64,
+                 max_line_bytes: int = MAX_LINE_BYTES):
+        if workers < 1:
+            raise ValueError("workers must be at least 1, got {0}".format(workers))
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1, got {0}".format(max_pending))
+        self.rules: Dict[str, str] = dict(rules or {})
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rule-service')
+        self.max_pending = max_pending
+        self.max_line_bytes = max_line_bytes
+        self.requests = 0
+        self._pending: Optional[asyncio.Semaphore] = None
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        self._pending = asyncio.Semaphore(self.max_pending)
+        return await asyncio.start_unix_server(self.handle_connection, path, limit=self.max_line_bytes)
+
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        self._pending = asyncio.Semaphore(self.max_pending)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=self.max_line_bytes)
+
+    def compile_rules(self):
+        # Warms the compiled rule cache before the first request arrives.
+        for dsl in self.rules.values():
+            DslCompiler.compile_rule(dsl)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    # The rest of the line cannot be told apart from the next request, so nothing after it is
+                    # read. It is answered with an error, and the requests before it still get their answers.
+                    error = RuleServiceError("request line longer than {0} bytes".format(self.max_line_bytes))
+                    await RuleService.write(RuleService.error_response(None, error), writer, write_lock)
+                    break
+                if not line:
+                    break
+                await self._pending.acquire()
+                task = asyncio.ensure_future(self.answer(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def answer(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        try:
+            self.requests += 1
+            response = await asyncio.get_running_loop().run_in_executor(self.executor, self.evaluate, line)
+            await RuleService.write(response, writer, write_lock)
+        except ConnectionError:
+            pass
+        finally:
+            self._pending.release()
+
+    @staticmethod
+    async def write(response: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        async with write_lock:
+            writer.write(response)
+            await writer.drain()
+
+    def evaluate(self, line: bytes) -> bytes:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            response = {'id': request_id, 'matches': self.match(request)}
+        except Exception as error:
+            return RuleService.error_response(request_id, error)
+        return json.dumps(response).encode() + b'\n'
+
+    @staticmethod
+    def error_response(request_id, error: Exception) -> bytes:
+        response = {'id': request_id, 'error': '{0}: {1}'.format(type(error).__name__, error)}
+        return json.dumps(response).encode() + b'\n'
+
+    def match(self, request: dict) -> List[bool]:
+        if 'rule' in request:
+            if request['rule'] not in self.rules:
+                raise RuleServiceError("unknown rule {0!r}".format(request['rule']))
+            dsl = self.rules[request['rule']]
+        else:
+            dsl = request['dsl']
+        mode = request.get('mode', 'fullmatch')
+        if mode not in MATCH_MODES:
+            raise RuleServiceError("mode must be one of {0}, got {1!r}".format(MATCH_MODES, mode))
+        match = getattr(DslCompiler.compile_rule(dsl), mode)
+        return [match(text) is not None for text in request['texts']]
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,128 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from casestudyone.python.DslCompiler import DslCompiler
+from casestudyone.python.PatternCache import PatternCache
+from casestudyone.python.RegexSyntaxTree import RegexSyntaxError, RegexSyntaxTree
+
+MATCH_MODES = ('fullmatch', 'search')
+
+
+class RuleSet:
+    """Matches a record against many named DSL rules with one regex call per combined pattern.
+
+    The rules of a pass are joined into one alternation (?:rule0)(?P<r0>)|(?:rule1)(?P<r1>)|... and the empty
+    marker group of the branch that matched names the rule. Groups inside the rules are made non-capturing,
+    so a failing branch never touches a group and the cost of a scan does not grow with the group count.
+    The ^ and $ the builders emit stay inside their branch and keep their meaning there.
+
+    An alternation only reports the first rule that matches, so a record that matches k rules needs k + 1
+    scans. With fullmatch, the rules before the reported one have failed and the next scan covers only the
+    rules after it. With search, the rules before it cannot match at or left of the reported position and the
+    rules after it cannot match left of it, so both ranges are searched again from there. A range is scanned as
+    a few aligned power of two blocks of rules, compiled on first use and kept in an LRU cache.
+    """
+
+    def __init__(self, rules: Union[Mapping[str, str], Iterable[Tuple[str, str]]], mode: str = 'fullmatch',
+                 optimize: bool = False, rules_per_pattern: int = 1000, block_cache_size: int = 4096):
+        if mode not in MATCH_MODES:
+            raise ValueError("mode must be one of {0}, got {1!r}".format(MATCH_MODES, mode))
+        if rules_per_pattern < 1:
+            raise ValueError("rules_per_pattern must be at least 1, got {0}".format(rules_per_pattern))
+        self.rules: Dict[str, str] = dict(rules.items() if isinstance(rules, Mapping) else rules)
+        self.mode = mode
+        self.optimize = optimize
+        self.rules_per_pattern = rules_per_pattern
+        self.block_patterns = PatternCache(block_cache_size)
+
+        names = list(self.rules)
+        self.branches: List[Tuple[str, ...]] = []
+        self.passes: List[Tuple[re.Pattern, Tuple[str, ...]]] = []
+        for start in range(0, len(names), rules_per_pattern):
+            chunk = tuple(names[start:start + rules_per_pattern])
+            self.branches.append(tuple(
+                '(?:{0})(?P<r{1}>)'.format(RuleSet.branch_regex(DslCompiler.translate(self.rules[name], optimize)),
+                                           index)
+                for index, name in enumerate(chunk)))
+            self.passes.append((self.block_pattern(len(self.passes), 0, len(chunk)), chunk))
+
+    @staticmethod
+    def branch_regex(regex: str) -> str:
+        try:
+            return RegexSyntaxTree.emit(RegexSyntaxTree.without_captures(RegexSyntaxTree.parse(regex)))
+        except RegexSyntaxError:
+            return regex
+
+    def block_pattern(self, pass_index: int, start: int, stop: int) -> re.Pattern:
+        if start == 0 and stop == len(self.branches[pass_index]) and pass_index < len(self.passes):
+            return self.passes[pass_index][0]
+        return self.block_patterns.get_or_create(
+            (pass_index, start, stop), lambda: re.compile('|'.join(self.branches[pass_index][start:stop])))
+
+    def range_patterns(self, pass_index: int, start: int, stop: int) -> List[re.Pattern]:
+        # Splits the range into aligned power of two blocks, so all ranges share at most n log n compiled branches.
+        if start == 0 and stop == len(self.branches[pass_index]):
+            return [self.block_pattern(pass_index, start, stop)]
+        patterns = []
+        while start < stop:
+            size = 1
+            while start % (size * 2) == 0 and start + size * 2 <= stop:
+                size *= 2
+            patterns.append(self.block_pattern(pass_index, start, start + size))
+            start += size
+        return patterns
+
+    def matching_indexes(self, pass_index: int, text: str) -> List[int]:
+        size = len(self.branches[pass_index])
+        result = []
+        if self.mode == 'fullmatch':
+            start = 0
+            while start < size:
+                match = next(filter(None, (pattern.fullmatch(text)
+                                           for pattern in self.range_patterns(pass_index, start, size))), None)
+                if match is None:
+                    break
+                index = int(match.lastgroup[1:])
+                result.append(index)
+                start = index + 1
+            return result
+
+        pending = [(0, size, 0)]
+        while pending:
+            start, stop, position = pending.pop()
+            found = [(match.start(), int(match.lastgroup[1:]))
+                     for match in (pattern.search(text, position)
+                                   for pattern in self.range_patterns(pass_index, start, stop)) if match is not None]
+            if not found:
+                continue
+            match_start, index = min(found)
+            result.append(index)
+            if start < index:
+                pending.append((start, index, match_start + 1))
+            if index + 1 < stop:
+                pending.append((index + 1, stop, match_start))
+        return sorted(result)
+
+    def matches(self, text: str) -> List[str]:
+        result = []
+        for pass_index, (_, names) in enumerate(self.passes):
+            result.extend(names[index] for index in self.matching_indexes(pass_index, text))
+        return result
+
+    def first_match(self, text: str) -> Optional[str]:
+        for pass_index, (pattern, names) in enumerate(self.passes):
+            if self.mode == 'fullmatch':
+                match = pattern.fullmatch(text)
+                if match is not None:
+                    return names[int(match.lastgroup[1:])]
+            elif pattern.search(text) is not None:
+                # The leftmost match need not come from the first rule, so the remaining ranges decide.
+                return names[self.matching_indexes(pass_index, text)[0]]
+        return None
+
+    def classify(self, texts: Iterable[str]) -> Iterator[Tuple[str, List[str]]]:
+        for text in texts:
+            yield text, self.matches(text)
+
+    def __len__(self):
+        return len(self.rules)
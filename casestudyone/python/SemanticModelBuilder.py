@@ -31,25 +31,50 @@ class SemanticModelBuilder:
 
     @staticmethod
     def starts_with_builder(content) -> str:
-        result = [str(item) if not isinstance(item, list) else str(item[0]) for item in content]
-        return "^({0})".format(Constants.OR_SYMBOL_DELIMITER.join(result))
+        return ''.join(SemanticModelBuilder.starts_with_fragments(content))
 
     @staticmethod
     def followed_with_builder(content) -> str:
-        result = ''
+        return ''.join(SemanticModelBuilder.followed_with_fragments(content))
+
+    @staticmethod
+    def ends_with_builder(content) -> str:
+        return ''.join(SemanticModelBuilder.ends_with_fragments(content))
+
+    # The fragment builders lay out a clause without joining it. A list in the content stands for the clauses
+    # of an inner regex, and its elements are passed through as they are, so a caller can expand them later
+    # instead of copying the text of every nested clause into each enclosing one.
+    @staticmethod
+    def starts_with_fragments(content) -> list:
+        result = [item[0] if isinstance(item, list) else str(item) for item in content]
+        return ['^('] + SemanticModelBuilder.separated(result) + [')']
+
+    @staticmethod
+    def followed_with_fragments(content) -> list:
         if any(isinstance(element, list) for element in content):
-            for (element) in content:
+            result = ['(']
+            for element in content:
                 if isinstance(element, str):
-                    result += element + '|'
+                    result.append(element + '|')
                 if isinstance(element, list):
-                    result += ''.join(element)
-            return "({0})".format(result)
-        return "({0})".format(Constants.OR_SYMBOL_DELIMITER.join(content))
+                    result.extend(element)
+            result.append(')')
+            return result
+        return ['('] + SemanticModelBuilder.separated(content) + [')']
 
     @staticmethod
-    def ends_with_builder(content) -> str:
-        result = [str(item) if not isinstance(item, list) else str(item[0]) for item in content]
-        return "({0})$".format(Constants.OR_SYMBOL_DELIMITER.join(result))
+    def ends_with_fragments(content) -> list:
+        result = [item[0] if isinstance(item, list) else str(item) for item in content]
+        return ['('] + SemanticModelBuilder.separated(result) + [')$']
+
+    @staticmethod
+    def separated(items: list) -> list:
+        result = []
+        for item in items:
+            if result:
+                result.append(Constants.OR_SYMBOL_DELIMITER)
+            result.append(item)
+        return result
 
     @staticmethod
     def build_regex(starts_with_opt: str, followed_with_opt: list[str], ends_with_opt: str) -> str:
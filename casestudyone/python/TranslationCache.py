@@ -0,0 +1,146 @@
+import ast
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from functools import lru_cache
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Modules whose source lies below this directory belong to the project; the rest are libraries or the stdlib.
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@lru_cache(maxsize=None)
+def translator_modules(root: str = 'casestudyone.python.DslCompiler') -> Tuple[Tuple[str, str], ...]:
+    """The name and source file of root and of every project module it imports, directly or through another one.
+
+    Imports are read from the source, so those made inside functions, such as the ones of a lazily built
+    grammar, count as well.
+    """
+    found: Dict[str, str] = {}
+    pending = [root]
+    while pending:
+        name = pending.pop()
+        if name in found:
+            continue
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, AttributeError, ValueError):
+            # The name of a class or function in a "from module import name".
+            continue
+        if spec is None or spec.origin is None or not spec.origin.endswith('.py') \
+                or not spec.origin.startswith(SOURCE_ROOT + os.sep):
+            continue
+        found[name] = spec.origin
+        with open(spec.origin, 'rb') as source:
+            tree = ast.parse(source.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module)
+                pending.extend(node.module + '.' + alias.name for alias in node.names)
+    return tuple(sorted(found.items()))
+
+
+@lru_cache(maxsize=None)
+def translator_fingerprint() -> str:
+    # The Python version is part of it because the optimizer reads Unicode categories off the re module.
+    digest = hashlib.sha256('{0}.{1}'.format(*sys.version_info[:2]).encode())
+    for name, path in translator_modules():
+        with open(path, 'rb') as source:
+            digest.update(name.encode() + b'\0' + source.read() + b'\0')
+    return digest.hexdigest()
+
+
+class TranslationCache:
+    """Translated regexes of DSL rules in a file, so that a restarted process does not parse its rules again.
+
+    There is one append-only file per translator fingerprint: a change to the grammar or the translation
+    starts a new, empty file and the stale one is never read again. The file is read with a single read when
+    the cache is opened. Every new translation is appended as one JSON line with a single O_APPEND write, so
+    processes can share a file. Each line starts with a newline, so a line torn by a crashed writer is cut off
+    from the next one and is the only one skipped on load.
+
+    Files are never compacted; a translation that is put again with another regex adds a line, and the last
+    one wins. Files of old fingerprints stay in the directory until prune() removes them.
+    """
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'translations-{0}.jsonl'.format(translator_fingerprint()[:32]))
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, str] = {}
+        self._lock = Lock()
+        self.load()
+
+    @staticmethod
+    def key(dsl: str, optimize: bool = False, atomic: bool = False) -> str:
+        return hashlib.sha256('{0:d}{1:d}'.format(optimize, atomic).encode() + dsl.encode('utf-8')).hexdigest()
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as file:
+                content = file.read()
+        except FileNotFoundError:
+            return
+        entries = {}
+        for line in content.splitlines():
+            try:
+                entry = json.loads(line)
+                entries[entry['key']] = entry['regex']
+            except (ValueError, KeyError, TypeError):
+                continue
+        with self._lock:
+            self._entries.update(entries)
+
+    def get(self, dsl: str, optimize: bool = False, atomic: bool = False) -> Optional[str]:
+        with self._lock:
+            return self._entries.get(TranslationCache.key(dsl, optimize, atomic))
+
+    def put(self, dsl: str, regex: str, optimize: bool = False, atomic: bool = False):
+        key = TranslationCache.key(dsl, optimize, atomic)
+        with self._lock:
+            if self._entries.get(key) == regex:
+                return
+            self._entries[key] = regex
+        line = '\n' + json.dumps({'key': key, 'regex': regex}, ensure_ascii=False)
+        descriptor = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(descriptor, line.encode('utf-8'))
+        finally:
+            os.close(descriptor)
+
+    def get_or_translate(self, dsl: str, optimize: bool, atomic: bool, translate: Callable[[], str]) -> str:
+        with self._lock:
+            regex = self._entries.get(TranslationCache.key(dsl, optimize, atomic))
+            if regex is not None:
+                self.hits += 1
+                return regex
+            self.misses += 1
+        # Rules that do not translate raise here and are never stored, so their errors are raised every time.
+        regex = translate()
+        self.put(dsl, regex, optimize, atomic)
+        return regex
+
+    def prune(self) -> List[str]:
+        """Removes the files of other translator fingerprints from the directory and returns their paths.
+
+        Only call this once no process runs an older translator on the same directory; such a process would
+        start its file again from scratch.
+        """
+        pattern = os.path.join(glob.escape(os.path.dirname(self.path)), 'translations-*.jsonl')
+        stale = [path for path in sorted(glob.glob(pattern)) if path != self.path]
+        for path in stale:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return stale
+
+    def __len__(self):
+        return len(self._entries)
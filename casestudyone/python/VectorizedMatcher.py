@@ -0,0 +1,112 @@
+import sys
+from itertools import repeat
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("VectorizedMatcher needs numpy, install it with 'pip install numpy'") from error
+
+from casestudyone.python.BulkMatcher import MATCH_MODES
+from casestudyone.python.DslCompiler import DslCompiler
+
+# The required literal prefilter only pays off if it rules out most rows of a chunk; above this share of
+# occurrences per row every row is matched directly.
+MAX_CANDIDATE_SHARE = 0.25
+SAMPLE_ROWS = 2000
+
+
+class VectorizedMatcher:
+    """Applies one DSL rule to a whole column of strings, a NumPy array, a pandas Series or a list.
+
+    Rows are matched in chunks with the pattern's C matcher mapped over the chunk, without a Python call per
+    row. If the rule requires a literal that is rare in a chunk, the chunk is joined once and the literal is
+    searched in the joined text, and only the rows it occurs in are matched. Entries that are not strings,
+    such as None, NaN or pd.NA, are missing: the mask holds na for them and the extracted groups hold None,
+    which a DataFrame shows as NaN.
+    """
+
+    def __init__(self, dsl: str, mode: str = 'fullmatch', chunk_size: int = 100_000):
+        if mode not in MATCH_MODES:
+            raise ValueError("mode must be one of {0}, got {1!r}".format(MATCH_MODES, mode))
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1, got {0}".format(chunk_size))
+        compiled_rule = DslCompiler.compile_rule(dsl)
+        self.dsl = dsl
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.pattern = compiled_rule.pattern
+        self.match = getattr(self.pattern, mode)
+        # Rows are joined with new lines, so a literal containing one could straddle two rows.
+        self.required_literals = tuple(literal for literal in compiled_rule.required_literals if '\n' not in literal)
+
+    def mask(self, values, na: bool = False):
+        column, strings = VectorizedMatcher.split_missing(values)
+        result = np.full(len(column), na, dtype=bool)
+        result[strings] = self.match_strings(column[strings].tolist())
+        return VectorizedMatcher.like(values, result)
+
+    def extract(self, values):
+        # One column per group, named like pandas' str.extract: the group name, or the group number from 0.
+        column, strings = VectorizedMatcher.split_missing(values)
+        matched = strings[self.match_strings(column[strings].tolist())]
+        result = np.full((len(column), self.pattern.groups), None, dtype=object)
+        for row, text in zip(matched.tolist(), column[matched].tolist()):
+            result[row] = self.match(text).groups()
+        names = {index: name for name, index in self.pattern.groupindex.items()}
+        columns = [names.get(index, index - 1) for index in range(1, self.pattern.groups + 1)]
+        pandas = sys.modules.get('pandas')
+        if pandas is not None and isinstance(values, pandas.Series):
+            return pandas.DataFrame(result, index=values.index, columns=columns)
+        return result
+
+    def match_strings(self, strings: List[str]) -> 'np.ndarray':
+        result = np.zeros(len(strings), dtype=bool)
+        for start in range(0, len(strings), self.chunk_size):
+            chunk = strings[start:start + self.chunk_size]
+            candidates = self.candidates(chunk)
+            if candidates is None:
+                result[start:start + len(chunk)] = np.fromiter(map(bool, map(self.match, chunk)), bool, len(chunk))
+            elif len(candidates):
+                texts = [chunk[row] for row in candidates.tolist()]
+                result[candidates + start] = np.fromiter(map(bool, map(self.match, texts)), bool, len(texts))
+        return result
+
+    def candidates(self, chunk: List[str]) -> Optional['np.ndarray']:
+        # The rows of the chunk that contain every required literal, or None if too many rows may.
+        if not self.required_literals:
+            return None
+        # The rarest literal is estimated on a sample, so that a chunk where all literals are common costs little.
+        sample = '\n'.join(chunk[:SAMPLE_ROWS])
+        occurrences, literal = min((sample.count(literal), literal) for literal in self.required_literals)
+        if occurrences > MAX_CANDIDATE_SHARE * min(len(chunk), SAMPLE_ROWS):
+            return None
+        joined = '\n'.join(chunk)
+        positions = []
+        position = joined.find(literal)
+        while position >= 0:
+            positions.append(position)
+            position = joined.find(literal, position + 1)
+        row_ends = np.cumsum(np.fromiter(map(len, chunk), np.intp, len(chunk)) + 1)
+        rows = np.unique(np.searchsorted(row_ends, np.array(positions, dtype=np.intp), side='right'))
+        for other in self.required_literals:
+            if other == literal:
+                continue
+            rows = rows[np.fromiter((other in chunk[row] for row in rows.tolist()), bool, len(rows))]
+        return rows
+
+    @staticmethod
+    def split_missing(values):
+        # The values as an object array, and the positions of the entries that are strings.
+        column = np.asarray(values, dtype=object)
+        if column.ndim != 1:
+            raise ValueError("expected a one-dimensional column, got shape {0}".format(column.shape))
+        is_string = np.fromiter(map(isinstance, column, repeat(str)), bool, len(column))
+        return column, np.flatnonzero(is_string)
+
+    @staticmethod
+    def like(values, result: 'np.ndarray'):
+        pandas = sys.modules.get('pandas')
+        if pandas is not None and isinstance(values, pandas.Series):
+            return pandas.Series(result, index=values.index, name=values.name)
+        return result
@@ -0,0 +1,81 @@
+import re
+import unittest
+
+from casestudyone.python.BacktrackingAnalyzer import ADJACENT_QUANTIFIERS, BacktrackingAnalyzer, EXPONENTIAL, \
+    LINEAR, NESTED_QUANTIFIERS, POLYNOMIAL
+from casestudyone.python.CharSet import CharSet
+from casestudyone.python.DslCompiler import DslCompiler
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.python.RegexSyntaxTree import RegexSyntaxTree
+from casestudyone.test.RuleGenerator import DIFFERENTIAL_SHAPE, RuleGenerator
+
+
+class BacktrackingAnalyzerTest(unittest.TestCase):
+    def test_adjacent_quantifiers_over_the_same_characters_are_polynomial(self):
+        # GIVEN
+        regex_dsl = '''starts with something
+followed with "@"
+followed with something
+followed with "."
+ends with "com" or "de" or "net"'''
+
+        # WHEN
+        report = DslCompiler.analyze(regex_dsl)
+
+        # THEN
+        self.assertEqual(POLYNOMIAL, report.complexity)
+        self.assertEqual('O(n^2)', report.bound)
+        self.assertEqual([ADJACENT_QUANTIFIERS], [finding.kind for finding in report.findings])
+
+    def test_chains_raise_the_degree(self):
+        self.assertEqual(3, BacktrackingAnalyzer.analyze('^(.*)(a)(.*)(.+)x$').degree)
+        self.assertEqual(2, DslCompiler.analyze('starts with "a" occurs indefinitely followed with anything').degree)
+
+    def test_separated_or_disjoint_quantifiers_are_linear(self):
+        for regex in ['^(\\d+)(x)(\\d+)$', '^([a-z]+)(\\d+)$', '(a+b)+', '^(x)*(y)+z$']:
+            with self.subTest(regex=regex):
+                self.assertEqual(LINEAR, BacktrackingAnalyzer.analyze(regex).complexity)
+        self.assertEqual(LINEAR, DslCompiler.analyze('starts with numbers').complexity)
+
+    def test_nested_quantifiers_are_exponential(self):
+        for regex in ['(a+)+b', '(.*a)+', '((a)|(a+))*c', '(\\s*x?)*$']:
+            with self.subTest(regex=regex):
+                report = BacktrackingAnalyzer.analyze(regex)
+                self.assertEqual(EXPONENTIAL, report.complexity)
+                self.assertEqual('O(2^n)', report.bound)
+                self.assertIn(NESTED_QUANTIFIERS, [finding.kind for finding in report.findings])
+
+    def test_rewrite_adds_possessive_quantifiers_and_atomic_groups(self):
+        self.assertEqual('^(x)*+(y)++z$', BacktrackingAnalyzer.rewrite('^(x)*(y)+z$'))
+        self.assertEqual('^([-+]?+((?>\\d++(\\.\\d*+)?+|\\.\\d++))([eE][-+]?+\\d++)?+)',
+                         DslCompiler.translate('starts with numbers', atomic=True))
+        self.assertEqual('(a+)+b', BacktrackingAnalyzer.rewrite('(a+)+b'))
+        self.assertEqual('^(.+)(@)(.++)$', BacktrackingAnalyzer.rewrite('^(.+)(@)(.+)$'))
+        self.assertEqual('^(.*+)$', BacktrackingAnalyzer.rewrite('^(.*)$'))
+        self.assertEqual('(\\s*)$', BacktrackingAnalyzer.rewrite('(\\s*)$'))
+
+    def test_differential_rewrite(self):
+        rules = RuleGenerator(DIFFERENTIAL_SHAPE, seed=8)
+        for _ in range(400):
+            regex_dsl = rules.rule()
+            regex = RegexParser.regex_parser.parse(regex_dsl)
+            rewritten = DslCompiler.build_regex(regex_dsl, atomic=True)
+            matching = rules.samples(regex, 20)
+            candidates = matching + rules.near_misses(matching, 'ab1.e\n') + [text + '\n' for text in matching] + [text[:-1] for text in matching]
+            original_pattern, rewritten_pattern = re.compile(regex), re.compile(rewritten)
+            for candidate in candidates:
+                for method in ('fullmatch', 'match', 'search'):
+                    expected = getattr(original_pattern, method)(candidate)
+                    result = getattr(rewritten_pattern, method)(candidate)
+                    self.assertEqual(expected and expected.regs, result and result.regs,
+                                     '{0} {1!r} on {2!r} => {3!r}'.format(method, regex, candidate, rewritten))
+
+    def test_char_set_categories_are_exact(self):
+        digits = CharSet.of_node(RegexSyntaxTree.parse('\\d').items[0])
+        self.assertIn('٣', digits)
+        self.assertFalse(digits.intersects(CharSet.of_node(RegexSyntaxTree.parse('[^\\d]').items[0])))
+        self.assertTrue(digits.issubset(CharSet.of_node(RegexSyntaxTree.parse('\\w').items[0])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import io
+import re
+import unittest
+
+from casestudyone.python.BulkMatcher import BulkMatcher
+from casestudyone.python.RegexParser import RegexParser
+
+
+class BulkMatcherTest(unittest.TestCase):
+    email_dsl = '''starts with something
+followed with "@"
+followed with something
+followed with "."
+ends with "com" or "de" or "net"'''
+
+    lines = ['name{0}@gmx.{1}'.format(number, 'de' if number % 3 else 'ch') for number in range(1000)]
+
+    def test_results_match_single_line_fullmatch_in_order(self):
+        # GIVEN
+        regex = RegexParser.regex_parser.parse(self.email_dsl)
+        matcher = BulkMatcher(self.email_dsl, processes=2, chunk_size=64, max_pending_chunks=3)
+
+        # WHEN
+        results = list(matcher.match_lines(self.lines))
+
+        # THEN
+        self.assertEqual(self.lines, [result.line for result in results])
+        self.assertEqual([re.fullmatch(regex, line) is not None for line in self.lines],
+                         [result.matched for result in results])
+        self.assertEqual(list(range(1, 1001)), [result.line_number for result in results])
+        self.assertEqual(1000, matcher.stats.lines)
+        self.assertEqual(666, matcher.stats.matches)
+        self.assertGreater(matcher.stats.lines_per_second, 0)
+
+    def test_search_mode_in_process(self):
+        # GIVEN
+        matcher = BulkMatcher('followed with "ERROR"', mode='search', processes=1)
+        log = io.StringIO('INFO started\nERROR disk full\r\nWARN ERROR-ish\nDEBUG\n')
+
+        # WHEN
+        result = list(matcher.matching_lines(log))
+
+        # THEN
+        self.assertEqual(['ERROR disk full', 'WARN ERROR-ish'], result)
+
+    def test_invalid_rule_fails_before_matching(self):
+        with self.assertRaises(Exception):
+            BulkMatcher('starts with 4 or 5')
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            BulkMatcher('starts with "4"', mode='match')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import re
+import unittest
+
+from casestudyone.python.DslCompiler import DslCompiler
+from casestudyone.python.LiteralExtractor import LiteralExtractor
+from casestudyone.python.RegexParser import RegexParser
+
+
+class CompiledRuleTest(unittest.TestCase):
+    def test_literals_of_mandatory_terms_are_required(self):
+        # GIVEN
+        regex_dsl = '''starts with something
+followed with "@"
+followed with something
+followed with "."
+ends with "com" or "de" or "net"'''
+
+        # WHEN
+        result = DslCompiler.compile_rule(regex_dsl).required_literals
+
+        # THEN
+        self.assertEqual(('@', '.'), result)
+
+    def test_adjacent_terms_form_one_literal(self):
+        regex = RegexParser.regex_parser.parse('''starts with inner regex(followed with "John")
+      followed with "Doe" or "Mustermann"
+      followed with inner regex(followed with "a" followed with "b" or "c")
+      ends with "end"''')
+        self.assertEqual(('John', 'end', 'a'), LiteralExtractor.required_literals(regex))
+
+    def test_optional_and_alternated_terms_are_not_required(self):
+        for regex_dsl in ['starts with "aa" occurs 1..2 or "b" occurs 3..3',
+                          'ends with "aa" occurs indefinitely',
+                          'followed with "gmail" or "gmx"']:
+            with self.subTest(regex_dsl=regex_dsl):
+                self.assertEqual((), DslCompiler.compile_rule(regex_dsl).required_literals)
+
+    def test_quantified_term_with_minimum_is_required(self):
+        self.assertEqual(('ERRORERROR', 'x'), LiteralExtractor.required_literals('(ERROR){2,3}(.*)(x)'))
+        self.assertEqual(('ERRORERROR',), LiteralExtractor.required_literals('(ERROR){2,}'))
+
+    def test_prefilter_agrees_with_pattern(self):
+        # GIVEN
+        rule = DslCompiler.compile_rule('''followed with anything
+followed with "ERROR"
+followed with ": disk " or ": memory "
+ends with something''')
+        lines = ['2023 ERROR: disk full', 'INFO: disk full', '2023 ERROR: cpu', 'ERROR: memory low', 'ERRO: disk x',
+                 '', 'ERROR', 'ERROR: disk ']
+
+        # THEN
+        self.assertEqual(('ERROR',), rule.required_literals)
+        for line in lines:
+            for method in ('fullmatch', 'match', 'search'):
+                expected = getattr(rule.pattern, method)(line)
+                result = getattr(rule, method)(line)
+                self.assertEqual(expected and expected.span(), result and result.span())
+
+    def test_prefilter_on_bytes(self):
+        rule = DslCompiler.compile_rule('followed with anything followed with "Grüße" followed with anything')
+        self.assertTrue(rule.might_match('Viele Grüße'.encode('utf-8')))
+        self.assertFalse(rule.might_match(b'Viele Gruesse'))
+        self.assertFalse(rule.might_match('Viele Gruesse'))
+
+    def test_unsupported_regex_has_no_literals(self):
+        self.assertEqual((), LiteralExtractor.required_literals('(?=abc)'))
+        self.assertEqual((), LiteralExtractor.required_literals(re.escape('(') + '('))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import re
+import unittest
+
+from casestudyone.python.Dfa import DfaLimitError, DfaMatcher, MAX_REPETITIONS
+from casestudyone.python.DslCompiler import DslCompiler
+from casestudyone.python.RegexSyntaxTree import RegexSyntaxError
+from casestudyone.python.SemanticModelBuilder import SemanticModelBuilder
+from casestudyone.test.RuleGenerator import RuleGenerator, RuleShape
+
+MODES = ('fullmatch', 'match', 'search')
+
+
+class DfaTest(unittest.TestCase):
+
+    def assert_agrees_with_re(self, regex: str, texts):
+        pattern = re.compile(regex)
+        matcher = DfaMatcher(regex)
+        for mode in MODES:
+            for text in texts:
+                with self.subTest(regex=regex, mode=mode, text=text):
+                    expected = getattr(pattern, mode)(text) is not None
+                    self.assertEqual(expected, getattr(matcher, mode)(text))
+                    self.assertEqual(expected, getattr(matcher, mode)(text.encode('utf-8')))
+
+    def test_generated_rules_agree_with_re(self):
+        generator = RuleGenerator(RuleShape(alternatives=2, clauses=2, depth=1, predefined=0.3), seed=17)
+        for dsl in generator.rules(12):
+            regex = DslCompiler.translate(dsl)
+            texts = generator.corpus(regex, 30)
+            self.assert_agrees_with_re(regex, texts + [text + '\n' for text in texts[:10]] + ['', '\n'])
+
+    def test_rules_without_anchors_agree_with_re(self):
+        generator = RuleGenerator(RuleShape(alternatives=2, clauses=2), seed=3)
+        for dsl in generator.rules(12):
+            regex = DslCompiler.translate('\n'.join(dsl.split('\n')[1:-1]))
+            texts = generator.corpus(regex, 20)
+            self.assert_agrees_with_re(regex, texts + ['ä ' + text + '\nx' for text in texts])
+
+    def test_build_regex_translation(self):
+        # GIVEN
+        regex = SemanticModelBuilder.build_regex(
+            SemanticModelBuilder.starts_with_builder(['ERROR', '[0-9]+']),
+            [SemanticModelBuilder.followed_with_builder(['.*'])],
+            SemanticModelBuilder.ends_with_builder(['failed', 'timeout']))
+
+        # THEN
+        self.assert_agrees_with_re(regex, ['ERROR disk failed', 'ERROR failed\n', '42 timeout', 'ERROR\nfailed',
+                                           'x ERROR failed', 'ERROR failed\n\n', 'ERRORtimeout!', '٣ timeout'])
+
+    def test_dollar_before_a_final_newline_and_caret_only_at_the_start(self):
+        self.assert_agrees_with_re('(a|b)$', ['a', 'a\n', 'a\n\n', 'ba', 'a\nb', '\n'])
+        self.assert_agrees_with_re('a$\n', ['a\n', 'a', 'a\n\n'])
+        self.assert_agrees_with_re('(x|^a)b', ['ab', 'cab', 'xb', 'cxb', 'b'])
+
+    def test_bounded_repetitions_expand_linearly(self):
+        # GIVEN
+        matcher = DslCompiler.compile_dfa('followed with "ab" occurs 1..{0}'.format(MAX_REPETITIONS))
+
+        # THEN
+        self.assertTrue(matcher.fullmatch('ab' * MAX_REPETITIONS))
+        self.assertFalse(matcher.fullmatch('ab' * (MAX_REPETITIONS + 1)))
+        self.assertEqual(2 * MAX_REPETITIONS + 2, matcher.dfa('fullmatch').state_count)
+        with self.assertRaises(DfaLimitError):
+            DslCompiler.compile_dfa('followed with "ab" occurs 1..{0}'.format(MAX_REPETITIONS + 1))
+
+    def test_invalid_utf8_is_never_part_of_a_match(self):
+        matcher = DslCompiler.compile_dfa('followed with "a" or something')
+        self.assertTrue(matcher.search(b'\xff\xfea'))
+        self.assertFalse(matcher.fullmatch(b'\xc3'))
+        self.assertFalse(matcher.search(b'\xff\n\xfe'))
+        self.assertTrue(matcher.fullmatch('\udcff'))
+
+    def test_long_texts_do_not_backtrack(self):
+        matcher = DslCompiler.compile_dfa('followed with something\nfollowed with something\nends with "x"')
+        self.assertFalse(matcher.fullmatch('a' * 100_000))
+        self.assertTrue(matcher.search('a' * 100_000 + 'x'))
+
+    def test_possessive_repetitions_are_rejected(self):
+        with self.assertRaises(RegexSyntaxError):
+            DfaMatcher('a*+b')
+
+    def test_compiled_dfas_are_cached(self):
+        self.assertIs(DslCompiler.compile_dfa('followed with "x"'), DslCompiler.compile_dfa('followed with "x"'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from parsy import ParseError, regex, string
+
+from common.python.Dispatch import dispatch
+
+
+class DispatchTest(unittest.TestCase):
+    def assert_same(self, expected_parser, parser, texts):
+        for text in texts:
+            with self.subTest(text=text):
+                try:
+                    expected = expected_parser.parse(text)
+                except ParseError as error:
+                    with self.assertRaises(ParseError) as context:
+                        parser.parse(text)
+                    self.assertEqual(str(error), str(context.exception))
+                else:
+                    self.assertEqual(expected, parser.parse(text))
+
+    def test_results_and_errors_are_those_of_the_alternation(self):
+        # GIVEN
+        class_parser = string('class ') >> regex(r'\w+')
+        enum_parser = string('enum ') >> regex(r'\w+').map(str.upper)
+        name_parser = regex(r'\w+').desc('a name') << string('!')
+        branches = ((('class ',), class_parser), (('enum ',), enum_parser), (None, name_parser))
+
+        # WHEN
+        parser = dispatch(*branches).many()
+
+        # THEN
+        self.assert_same((class_parser | enum_parser | name_parser).many(), parser,
+                         ['class A', 'enum B', 'class!', 'enum!class C', 'classy!', 'class', 'enum ', '', '?', 'x'])
+
+    def test_branches_with_several_keys(self):
+        words = string('anything') | string('something')
+        parser = dispatch((('anything', 'something'), words), (('"',), regex('"[^"]+"').desc('a term')))
+        self.assert_same(words | regex('"[^"]+"').desc('a term'), parser,
+                         ['anything', 'something', '"a"', '"', 'any', 'nothing'])
+
+    def test_branches_with_keys_have_to_fail_at_their_start(self):
+        parser = dispatch((('a',), string('').result(None)))
+        with self.assertRaises(ValueError):
+            parser.parse('a')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import gc
+import unittest
+
+from casestudyone.python.DslAst import EndsWith, FollowedWith, InnerRegex, Predefined, Quantified, Rule, StartsWith, \
+    Term, _interned_nodes
+from casestudyone.python.FastRegexParser import FastRegexParser
+from casestudyone.python.RegexEmitter import RegexEmitter
+from casestudyone.python.RegexParser import RegexParser
+
+
+class DslAstTest(unittest.TestCase):
+    def test_rule_is_parsed_into_typed_nodes(self):
+        # GIVEN
+        regex_dsl = '''starts with inner regex(followed with "John" or "Steve") or "Hello"
+        followed with "a" occurs 1..2 or letters
+        ends with "end"'''
+
+        # WHEN
+        result: Rule = RegexParser.rule_parser.parse(regex_dsl)
+
+        # THEN
+        self.assertIsInstance(result.starts_with, StartsWith)
+        inner, hello = result.starts_with.alternation.items
+        self.assertIsInstance(inner, InnerRegex)
+        self.assertEqual((Term('John'), Term('Steve')), inner.clauses[0].alternation.items)
+        self.assertEqual(Term('Hello'), hello)
+        quantified, letters = result.followed_with[0].alternation.items
+        self.assertEqual(Quantified(Term('a'), '{1,2}'), quantified)
+        self.assertEqual((1, 2), (quantified.minimum, quantified.maximum))
+        self.assertEqual(Predefined('letters'), letters)
+        self.assertIsInstance(result.ends_with, EndsWith)
+
+    def test_emitter_reproduces_regex_parser_output(self):
+        regex_dsl = '''starts with "domain "
+followed with inner regex(followed with "specific " followed with inner regex(followed with "modeling" or "design")) or "driven design"
+ends with anything'''
+        self.assertEqual('^(domain )((specific )((modeling|design))driven design|)(.*)$',
+                         RegexEmitter.emit(RegexParser.rule_parser.parse(regex_dsl)))
+
+    def test_identical_subtrees_are_shared_across_rules(self):
+        # GIVEN
+        first = FastRegexParser.parse_ast('starts with "x" followed with inner regex(followed with "a" or "b")')
+        second = RegexParser.rule_parser.parse('followed with inner regex(followed with "a" or "b")\nends with "y"')
+
+        # THEN
+        self.assertIs(first.followed_with[0], second.followed_with[0])
+        self.assertIs(first, FastRegexParser.parse_ast(
+            'starts with "x"\nfollowed with inner regex(followed with "a" or "b")'))
+
+    def test_shared_clauses_are_translated_once(self):
+        # GIVEN
+        clause = RegexParser.rule_parser.parse('followed with "translated once" or numbers').followed_with[0]
+        RegexEmitter.emit_clause(clause)
+        hits = RegexEmitter.cache_info().hits
+
+        # WHEN
+        for prefix in ['starts with "a"', 'starts with "b"', 'starts with "c"']:
+            RegexParser.regex_parser.parse(prefix + '\nfollowed with "translated once" or numbers')
+
+        # THEN
+        self.assertGreaterEqual(RegexEmitter.cache_info().hits - hits, 3)
+
+    def test_shared_inner_clauses_are_translated_once(self):
+        # GIVEN
+        inner = 'inner regex(followed with "shared inner" or numbers)'
+        rules = [RegexParser.rule_parser.parse('followed with {0} or "{1}"'.format(inner, prefix)) for prefix in 'abc']
+        inner_clause = rules[0].followed_with[0].alternation.items[0].clauses[0]
+        info = RegexEmitter.cache_info()
+
+        # WHEN
+        regexes = [RegexEmitter.emit(rule) for rule in rules]
+
+        # THEN
+        after = RegexEmitter.cache_info()
+        self.assertEqual((2, 4), (after.hits - info.hits, after.misses - info.misses))
+        self.assertEqual(RegexEmitter.clause_cache.get(inner_clause), RegexEmitter.emit_clause(inner_clause))
+        self.assertEqual([RegexParser.regex_parser.parse(
+            'followed with {0} or "{1}"'.format(inner, prefix)) for prefix in 'abc'], regexes)
+
+    def test_interned_nodes_are_released_when_no_longer_referenced(self):
+        # GIVEN
+        gc.collect()
+        before = len(_interned_nodes)
+
+        # WHEN
+        rules = [FastRegexParser.parse_ast('starts with "released {0}" followed with "x{0}"'.format(index))
+                 for index in range(1000)]
+        during = len(_interned_nodes)
+        del rules
+        gc.collect()
+
+        # THEN
+        self.assertGreaterEqual(during - before, 1000)
+        self.assertLessEqual(len(_interned_nodes), before)
+
+    def test_nodes_are_hashable_and_compare_by_type(self):
+        alternation = RegexParser.rule_parser.parse('starts with "a"').starts_with.alternation
+        self.assertNotEqual(StartsWith(alternation), FollowedWith(alternation))
+        self.assertEqual(2, len({StartsWith(alternation), FollowedWith(alternation), StartsWith(alternation)}))
+
+
+if __name__ == '__main__':
+    unittest.main()
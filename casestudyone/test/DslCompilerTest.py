@@ -0,0 +1,92 @@
+import re
+import unittest
+
+from casestudyone.python.DslCompiler import DslCompiler, compile_dsl
+from casestudyone.python.PatternCache import PatternCache
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.python.SemanticError import SemanticError
+
+
+class DslCompilerTest(unittest.TestCase):
+    def setUp(self):
+        DslCompiler.cache_clear()
+
+    def test_compile_dsl_returns_compiled_pattern_of_translated_regex(self):
+        # GIVEN
+        regex_dsl = '''starts with "T"
+followed with anything
+ends with "s."'''
+
+        # WHEN
+        result = compile_dsl(regex_dsl)
+
+        # THEN
+        self.assertIsInstance(result, re.Pattern)
+        self.assertEqual(RegexParser.regex_parser.parse(regex_dsl), result.pattern)
+        self.assertTrue(result.fullmatch('This matches.'))
+
+    def test_same_rule_is_translated_once(self):
+        # GIVEN
+        regex_dsl = 'starts with "first" or "second"'
+
+        # WHEN
+        first = compile_dsl(regex_dsl)
+        second = compile_dsl(regex_dsl)
+
+        # THEN
+        self.assertIs(first, second)
+        self.assertEqual((1, 1, 0), DslCompiler.cache_info()[:3])
+
+    def test_indentation_before_clauses_is_normalized(self):
+        # GIVEN
+        indented = '''
+        starts with something
+        followed with "@"
+        ends with "com" or "de"'''
+        flat = '''starts with something
+followed with "@"
+ends with "com" or "de"'''
+
+        # WHEN
+        first = compile_dsl(indented)
+        second = compile_dsl(flat)
+
+        # THEN
+        self.assertIs(first, second)
+        self.assertEqual(1, DslCompiler.cache_info().hits)
+
+    def test_whitespace_inside_terms_is_not_normalized(self):
+        self.assertEqual(DslCompiler.normalize('starts with "a\n  followed with b"'),
+                         'starts with "a\n  followed with b"')
+        self.assertNotEqual(compile_dsl('starts with "a  b"'), compile_dsl('starts with "a b"'))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        # GIVEN
+        cache = PatternCache(max_size=2)
+
+        # WHEN
+        cache.get_or_create('a', lambda: 1)
+        cache.get_or_create('b', lambda: 2)
+        cache.get_or_create('a', lambda: 3)
+        cache.get_or_create('c', lambda: 4)
+
+        # THEN
+        self.assertEqual(1, cache.get_or_create('a', lambda: 5))
+        self.assertEqual(6, cache.get_or_create('b', lambda: 6))
+        self.assertEqual((2, 4, 2, 2, 2), tuple(cache.info()))
+
+    def test_errors_are_not_cached(self):
+        # GIVEN
+        regex_dsl = 'starts with "first" occurs 2..1'
+
+        # WHEN
+        for _ in range(2):
+            with self.assertRaises(SemanticError):
+                compile_dsl(regex_dsl)
+
+        # THEN
+        self.assertEqual((0, 2, 0), DslCompiler.cache_info()[:3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import ast
+import os
+import unittest
+
+from parsy import ParseError
+
+from casestudyone.python.FastRegexParser import FastRegexParser
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.test.RuleGenerator import RuleGenerator, RuleShape
+
+
+def collect_regex_dsl_test_cases() -> list:
+    path = os.path.join(os.path.dirname(__file__), 'RegexDslTest.py')
+    with open(path, encoding='utf-8') as source:
+        tree = ast.parse(source.read())
+    return [node.value.value for node in ast.walk(tree)
+            if isinstance(node, ast.Assign)
+            and any(isinstance(target, ast.Name) and target.id == 'regex_dsl' for target in node.targets)
+            and isinstance(node.value, ast.Constant)]
+
+
+# Every layout the grammar takes, malformed quantifications and words that look like keywords.
+PARSER_SHAPE = RuleShape(alternatives=3, depth=3, clauses=3, quantified=0.25, predefined=0.25,
+                         words=('a', 'b.c', 'or', 'Hello World', '@', '1'), varied=True, inner=0.15, indefinitely=0.2,
+                         malformed=0.1, any_layout=True)
+
+
+class FastRegexParserTest(unittest.TestCase):
+    def assert_same_outcome(self, regex_dsl: str):
+        try:
+            expected = RegexParser.regex_parser.parse(regex_dsl)
+        except Exception as error:
+            with self.assertRaises(type(error)) as context:
+                FastRegexParser.parse(regex_dsl)
+            self.assertEqual(str(error), str(context.exception))
+            return
+        self.assertEqual(expected, FastRegexParser.parse(regex_dsl))
+
+    def test_parity_with_regex_dsl_test_cases(self):
+        cases = collect_regex_dsl_test_cases()
+        self.assertGreater(len(cases), 40)
+        for regex_dsl in cases:
+            with self.subTest(regex_dsl=regex_dsl):
+                self.assert_same_outcome(regex_dsl)
+
+    def test_parity_with_generated_rules(self):
+        rules = RuleGenerator(PARSER_SHAPE, seed=20231018)
+        for _ in range(2000):
+            regex_dsl = rules.rule()
+            with self.subTest(regex_dsl=regex_dsl):
+                self.assert_same_outcome(regex_dsl)
+
+    def test_parity_for_edge_cases(self):
+        for regex_dsl in ['', '   ', 'starts with ', 'starts with \n', 'starts with ""', 'followed with "a" or',
+                          'followed with inner regex()', 'starts with inner regex()', 'ends with "a"\n',
+                          'ends with "a"\n\n', 'starts with anythingelse', 'followed with "a" occurs 01..1',
+                          'followed with inner regex(followed with "a"\n)', 'starts with "a"orletters']:
+            with self.subTest(regex_dsl=regex_dsl):
+                self.assert_same_outcome(regex_dsl)
+
+    def test_deeply_nested_inner_regexes_are_parsed_without_recursion(self):
+        # GIVEN
+        def nested(depth: int) -> str:
+            return 'followed with ' + 'inner regex(followed with "a" or ' * depth + '"z"' + ')' * depth
+
+        for depth in range(1, 6):
+            self.assert_same_outcome(nested(depth))
+
+        # WHEN
+        result = FastRegexParser.parse(nested(10_000))
+
+        # THEN
+        self.assertEqual('(' + '(a|' * 10_000 + 'z' + ')' * 10_000 + ')', result)
+
+    def test_the_grammar_parses_rules_nested_too_deep_for_its_recursion(self):
+        # GIVEN
+        nested = 'followed with ' + 'inner regex(followed with "a" or ' * 10_000 + '"z"' + ')' * 10_000
+
+        # WHEN
+        result = RegexParser.regex_parser.parse(nested)
+
+        # THEN
+        self.assertEqual(FastRegexParser.parse(nested), result)
+        self.assertEqual(FastRegexParser.parse_ast(nested), RegexParser.rule_parser.parse(nested))
+        with self.assertRaises(ParseError) as context:
+            RegexParser.regex_parser.parse(nested + ')')
+        self.assertEqual(len(nested), context.exception.index)
+
+    def test_deeply_nested_syntax_errors_raise_a_parse_error(self):
+        # GIVEN rules nested too deep for parsy, with one bracket too many and one too few
+        depth = 3_000
+        nested = 'followed with ' + 'inner regex(followed with "a" or ' * depth + '"z"' + ')' * depth
+
+        for dsl in [nested + ')', nested[:-1]]:
+            with self.subTest(end=dsl[-2:]):
+                # WHEN
+                with self.assertRaises(ParseError) as context:
+                    FastRegexParser.parse(dsl)
+
+                # THEN
+                self.assertEqual(FastRegexParser.parse_rule(dsl)[1], context.exception.index)
+                with self.assertRaises(ParseError):
+                    FastRegexParser.parse_ast(dsl)
+        self.assertEqual(len(nested), FastRegexParser.parse_rule(nested + ')')[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import io
+import unittest
+
+from casestudyone.python.RegexParser import RegexParser
+from common.python.GrammarProfiler import GrammarProfiler
+
+
+class GrammarProfilerTest(unittest.TestCase):
+    dsl = 'starts with inner regex(followed with "John" or "Steve") or "Hello"\nfollowed with anything\n' \
+          'ends with "a" or numbers'
+
+    def test_every_named_parser_is_measured_and_restored(self):
+        # GIVEN
+        originals = {name: parser.wrapped_fn for name, parser in RegexParser.parsers().items()}
+
+        # WHEN
+        with GrammarProfiler(RegexParser) as profiler:
+            for _ in range(3):
+                result = RegexParser.regex_parser.parse(self.dsl)
+
+        # THEN
+        self.assertEqual(RegexParser.regex_parser.parse(self.dsl), result)
+        self.assertEqual(originals, {name: parser.wrapped_fn for name, parser in RegexParser.parsers().items()})
+        stats = profiler.stats
+        self.assertEqual(3, stats['regex_parser'].calls)
+        self.assertEqual(3 * len(self.dsl), stats['rule_parser'].consumed)
+        self.assertGreater(stats['or_parser'].backtracks, 0)
+        self.assertGreater(stats['whitespace_opt_parser'].repeats, 0)
+        self.assertEqual(0, stats['regex_parser'].repeats)
+        self.assertGreaterEqual(stats['regex_parser'].cumulative_seconds, stats['rule_parser'].cumulative_seconds)
+        self.assertAlmostEqual(stats['regex_parser'].cumulative_seconds,
+                               sum(parser.self_seconds for parser in stats.values()), delta=1e-6)
+
+    def test_report_and_collapsed_stacks(self):
+        # GIVEN
+        with GrammarProfiler(RegexParser) as profiler:
+            RegexParser.regex_parser.parse(self.dsl)
+        collapsed = io.StringIO()
+
+        # WHEN
+        report = profiler.report('calls').splitlines()
+        profiler.write_collapsed(collapsed)
+
+        # THEN
+        self.assertTrue(report[0].startswith('parser'))
+        calls = [int(line.split()[1]) for line in report[1:]]
+        self.assertEqual(sorted(calls, reverse=True), calls)
+        for line in collapsed.getvalue().splitlines():
+            stack, microseconds = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith('regex_parser'))
+            self.assertGreater(int(microseconds), 0)
+        self.assertIn('regex_parser;rule_parser;starts_with_parser;split_by_or_parser;item_parser;inner_regex_parser;'
+                      'followed_with_parser', collapsed.getvalue())
+        with self.assertRaises(ValueError):
+            profiler.report('name')
+
+
+if __name__ == '__main__':
+    unittest.main()
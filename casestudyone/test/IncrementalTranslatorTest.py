@@ -0,0 +1,116 @@
+import unittest
+from unittest import mock
+
+from casestudyone.python.FastRegexParser import FastRegexParser
+from casestudyone.python.IncrementalTranslator import IncrementalTranslator
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.test.RuleGenerator import DIFFERENTIAL_SHAPE, RuleGenerator
+
+FRAGMENTS = ['"a"', '"b c"', ' or ', '\n', ' ', 'followed with ', 'ends with ', 'starts with ', 'inner regex(',
+             ')', ' occurs 1..2', ' occurs 2..1', ' occurs indefinitely', 'anything', '"', 'o', 'r', 'x']
+
+
+def full_parse(text: str):
+    try:
+        return RegexParser.regex_parser.parse(text), None
+    except Exception as error:
+        return None, (type(error), str(error))
+
+
+class IncrementalTranslatorTest(unittest.TestCase):
+    rule = '''starts with "a"
+followed with "b" or "c"
+followed with inner regex(followed with "x" followed with something)
+followed with "d" occurs 1..3
+ends with "z"'''
+
+    def test_edit_inside_one_clause_reparses_only_that_clause(self):
+        # GIVEN
+        translation = IncrementalTranslator.translate(self.rule)
+        start = self.rule.index('"c"') + 1
+
+        # WHEN
+        result = IncrementalTranslator.update(translation, start, start + 1, 'cd')
+
+        # THEN
+        self.assertEqual(1, result.reparsed)
+        self.assertEqual(RegexParser.regex_parser.parse(result.text), result.regex)
+        self.assertEqual(FastRegexParser.parse_ast(result.text), result.rule)
+        self.assertIs(translation.clauses[0], result.clauses[0])
+        self.assertEqual(translation.clauses[3].regex, result.clauses[3].regex)
+
+    def test_inserting_a_clause(self):
+        translation = IncrementalTranslator.translate(self.rule)
+        start = self.rule.index('ends with')
+        result = IncrementalTranslator.update(translation, start, start, 'followed with numbers\n')
+        self.assertEqual(1, result.reparsed)
+        self.assertEqual(RegexParser.regex_parser.parse(result.text), result.regex)
+
+    def test_joining_a_clause_with_or_on_the_next_line(self):
+        translation = IncrementalTranslator.translate(self.rule)
+        start = self.rule.index('followed with "d"')
+        result = IncrementalTranslator.update(translation, start, start + len('followed with'), 'or')
+        self.assertEqual(RegexParser.regex_parser.parse(result.text), result.regex)
+
+    def test_errors_are_the_errors_of_a_full_parse(self):
+        translation = IncrementalTranslator.translate(self.rule)
+        for start, end, replacement in [(0, 1, ''), (len(self.rule), len(self.rule), ' x'),
+                                        (len(self.rule), len(self.rule), ' '),
+                                        (self.rule.index('1..3'), self.rule.index('1..3') + 4, '3..1')]:
+            with self.subTest(replacement=replacement):
+                text = self.rule[:start] + replacement + self.rule[end:]
+                with self.assertRaises(Exception) as expected:
+                    RegexParser.regex_parser.parse(text)
+                with self.assertRaises(type(expected.exception)) as result:
+                    IncrementalTranslator.update(translation, start, end, replacement)
+                self.assertEqual(str(expected.exception), str(result.exception))
+
+    def test_texts_the_incremental_parse_rejects_fall_back_to_the_full_parse(self):
+        # GIVEN
+        translation = IncrementalTranslator.translate(self.rule)
+        start = self.rule.index('"c"') + 1
+
+        parse_clause = IncrementalTranslator.parse_clause
+        for failing_calls, full_parses in [(1, 0), (10_000, 1)]:
+            with self.subTest(failing_calls=failing_calls):
+                calls = iter(range(failing_calls))
+
+                def rejecting_parse_clause(*arguments):
+                    return None if next(calls, None) is not None else parse_clause(*arguments)
+
+                # WHEN the clause parse rejects the text once, or every time
+                rejecting = mock.patch.object(IncrementalTranslator, 'parse_clause', side_effect=rejecting_parse_clause)
+                counting = mock.patch.object(FastRegexParser, 'parse_rule', wraps=FastRegexParser.parse_rule)
+                with rejecting, counting as parse_rule:
+                    result = IncrementalTranslator.update(translation, start, start + 1, 'cd')
+
+                # THEN the whole text is parsed at most once
+                self.assertEqual(full_parses, parse_rule.call_count)
+                self.assertEqual(RegexParser.regex_parser.parse(result.text), result.regex)
+                self.assertEqual(FastRegexParser.parse_ast(result.text), result.rule)
+                update = IncrementalTranslator.update(result, 0, 0, ' ')
+                self.assertEqual(RegexParser.regex_parser.parse(update.text), update.regex)
+
+    def test_random_edit_sequences_match_a_full_parse(self):
+        rules = RuleGenerator(DIFFERENTIAL_SHAPE, seed=10)
+        generator = rules.generator
+        for _ in range(150):
+            translation = IncrementalTranslator.translate(rules.rule().replace('\n', '\n' + ' ' * 2))
+            for _ in range(15):
+                start = generator.randint(0, len(translation.text))
+                end = min(len(translation.text), start + generator.choice([0, 0, 1, 2, 5]))
+                replacement = ''.join(generator.choice(FRAGMENTS) for _ in range(generator.randint(0, 2)))
+                text = translation.text[:start] + replacement + translation.text[end:]
+                expected, error = full_parse(text)
+                try:
+                    result = IncrementalTranslator.update(translation, start, end, replacement)
+                except Exception as raised:
+                    self.assertEqual(error, (type(raised), str(raised)), text)
+                    continue
+                self.assertEqual((expected, None), (result.regex, error), text)
+                self.assertEqual(FastRegexParser.parse_ast(text), result.rule)
+                translation = result
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from casestudyone.python.BytesRegex import BytesRegex
+from casestudyone.python.MappedGrep import MappedGrep
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.test.RuleGenerator import DIFFERENTIAL_SHAPE, RuleGenerator
+
+
+def byte_offset(text: str, index: int) -> int:
+    return len(text[:index].encode('utf-8'))
+
+
+class MappedGrepTest(unittest.TestCase):
+    def test_bytes_pattern_keeps_unicode_classes(self):
+        for regex, text in [('\\d+', 'x٣٤y'), ('[a-zA-ZäÄüÜöÖß\\s]+', '1 Grüße 2'), ('(.)(.)$', 'a日本'),
+                            ('\\w+?', '日'), ('[^a]', 'äa')]:
+            with self.subTest(regex=regex):
+                expected = re.search(regex, text)
+                result = re.search(BytesRegex.translate(regex), text.encode('utf-8'))
+                self.assertEqual((byte_offset(text, expected.start()), byte_offset(text, expected.end())),
+                                 result.span())
+
+    def test_line_mode(self):
+        # GIVEN
+        buffer = 'ERROR disk full\nINFO ok\nERROR bär\nnothing ERROR x\n'.encode('utf-8')
+        grep = MappedGrep('starts with "ERROR" followed with anything')
+
+        # WHEN
+        lines = [buffer[match.line_start:match.line_end] for match in grep.scan(buffer)]
+
+        # THEN
+        self.assertEqual([b'ERROR disk full', 'ERROR bär'.encode('utf-8')], lines)
+        self.assertEqual(3, MappedGrep('followed with "ERROR"').count(buffer))
+        self.assertEqual(1, MappedGrep('starts with letters', line_regexp=True).count(b'ok\n1\nok 1\n'))
+        self.assertEqual(0, MappedGrep('followed with "missing"').count(buffer))
+
+    def test_line_mode_has_no_line_after_the_last_newline(self):
+        grep = MappedGrep('followed with anything')
+        self.assertEqual(2, grep.count(b'a\nb\n'))
+        self.assertEqual(2, grep.count(b'a\nb'))
+        self.assertEqual(3, grep.count(b'a\n\n\n'))
+        self.assertEqual(1, grep.count(b'\n'))
+        self.assertEqual(0, grep.count(b''))
+
+    def test_whole_buffer_mode_reports_every_match(self):
+        grep = MappedGrep('followed with "ab" occurs 1..2', line_mode=False)
+        self.assertEqual([(0, 4), (5, 7)], [(match.start, match.end) for match in grep.scan(b'abab ab')])
+        self.assertEqual([(0, 3)], [(match.start, match.end)
+                                    for match in MappedGrep('followed with letters', line_mode=False).scan(b'a\nb1')])
+
+    def test_differential_against_str_patterns(self):
+        rules = RuleGenerator(DIFFERENTIAL_SHAPE, seed=9)
+        generator = rules.generator
+        for _ in range(200):
+            regex_dsl = rules.rule()
+            regex = RegexParser.regex_parser.parse(regex_dsl)
+            lines = rules.samples(regex, 8)
+            lines = rules.near_misses(lines, 'äß日٣x ') + lines + ['']
+            generator.shuffle(lines)
+            # A last empty line only exists if a newline ends it.
+            terminated = lines[-1] == '' or generator.random() < 0.5
+            text = '\n'.join(lines) + ('\n' if terminated else '')
+            buffer = text.encode('utf-8')
+            pattern = re.compile(regex)
+
+            expected = [line for line in lines if pattern.search(line)]
+            grep = MappedGrep(regex_dsl)
+            self.assertEqual(expected, [buffer[match.line_start:match.line_end].decode('utf-8')
+                                        for match in grep.scan(buffer)], regex)
+
+            expected = [line for line in lines if pattern.fullmatch(line)]
+            grep = MappedGrep(regex_dsl, line_regexp=True)
+            self.assertEqual(expected, [buffer[match.line_start:match.line_end].decode('utf-8')
+                                        for match in grep.scan(buffer)], regex)
+
+            expected = [(byte_offset(text, match.start()), byte_offset(text, match.end()))
+                        for match in pattern.finditer(text)]
+            grep = MappedGrep(regex_dsl, line_mode=False)
+            self.assertEqual(expected, [(match.start, match.end) for match in grep.scan(buffer)], regex)
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'log.txt')
+            empty = os.path.join(directory, 'empty.txt')
+            with open(path, 'wb') as file:
+                file.write('ERROR disk full\nINFO ok\nERROR bär\n'.encode('utf-8'))
+            open(empty, 'wb').close()
+            dsl = 'starts with "ERROR" followed with anything'
+
+            result = subprocess.run([sys.executable, '-m', 'casestudyone', 'grep', dsl, path],
+                                    capture_output=True, check=True)
+            self.assertEqual('ERROR disk full\nERROR bär\n'.encode('utf-8'), result.stdout)
+
+            result = subprocess.run([sys.executable, '-m', 'casestudyone', 'grep', '-c', dsl, path, empty],
+                                    capture_output=True, check=True)
+            self.assertEqual('{0}:2\n{1}:0\n'.format(path, empty).encode(), result.stdout)
+
+            result = subprocess.run([sys.executable, '-m', 'casestudyone', 'grep', '-c', 'followed with anything',
+                                     path, empty], capture_output=True, check=True)
+            self.assertEqual('{0}:3\n{1}:0\n'.format(path, empty).encode(), result.stdout)
+
+            result = subprocess.run([sys.executable, '-m', 'casestudyone', 'grep', '-b', dsl, path],
+                                    capture_output=True, check=True)
+            self.assertEqual(b'0:15\n24:34\n', result.stdout)
+
+            result = subprocess.run([sys.executable, '-m', 'casestudyone', 'grep', dsl, empty], capture_output=True)
+            self.assertEqual(1, result.returncode)
+
+
+if __name__ == '__main__':
+    unittest.main()
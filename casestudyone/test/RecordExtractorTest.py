@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import re
+import unittest
+
+from casestudyone.python.DslCompiler import DslCompiler
+from casestudyone.python.RecordExtractor import RecordExtractor
+from casestudyone.test.RuleGenerator import RuleGenerator, RuleShape
+
+
+class RecordExtractorTest(unittest.TestCase):
+    dsl = 'starts with "ERROR" or numbers\nfollowed with anything\nends with "failed" or "timeout"'
+    lines = ['ERROR disk failed\n', '42.5e3 "ä" timeout\r\n', 'INFO disk failed\n', 'ERROR timeout']
+
+    def test_named_translation_has_one_group_per_clause_and_no_number_groups(self):
+        # WHEN
+        pattern = DslCompiler.compile_named(self.dsl).pattern
+
+        # THEN
+        self.assertEqual({'starts_with': 1, 'followed_with_1': 2, 'ends_with': 3}, pattern.groupindex)
+        self.assertEqual(3, pattern.groups)
+        self.assertIs(DslCompiler.compile_named(self.dsl), DslCompiler.compile_named(self.dsl))
+
+    def test_named_translation_matches_the_same_lines(self):
+        generator = RuleGenerator(RuleShape(alternatives=3, clauses=3, depth=1, predefined=0.3), seed=5)
+        for dsl in generator.rules(20):
+            regex = DslCompiler.translate(dsl)
+            plain, named = re.compile(regex), DslCompiler.compile_named(dsl, alternatives=True).pattern
+            for text in generator.corpus(regex, 30):
+                with self.subTest(dsl=dsl, text=text):
+                    self.assertEqual(plain.fullmatch(text) is not None, named.fullmatch(text) is not None)
+
+    def test_records_hold_every_clause_and_alternative(self):
+        # GIVEN
+        extractor = RecordExtractor(self.dsl, alternatives=True)
+
+        # WHEN
+        records = list(extractor.dicts(self.lines))
+
+        # THEN
+        self.assertEqual(('starts_with', 'starts_with_alt1', 'starts_with_alt2', 'followed_with_1',
+                          'followed_with_1_alt1', 'ends_with', 'ends_with_alt1', 'ends_with_alt2'), extractor.fields)
+        self.assertEqual(3, len(records))
+        self.assertEqual({'starts_with': '42.5e3', 'starts_with_alt1': None, 'starts_with_alt2': '42.5e3',
+                          'followed_with_1': ' "ä" ', 'followed_with_1_alt1': ' "ä" ', 'ends_with': 'timeout',
+                          'ends_with_alt1': None, 'ends_with_alt2': 'timeout'}, records[1])
+        self.assertEqual(4, extractor.lines)
+
+    def test_jsonl_and_csv_output(self):
+        # GIVEN
+        extractor = RecordExtractor(self.dsl)
+        jsonl, comma_separated = io.StringIO(), io.StringIO()
+
+        # WHEN
+        written = extractor.write_jsonl(self.lines, jsonl), extractor.write_csv(self.lines, comma_separated)
+
+        # THEN
+        self.assertEqual((3, 3), written)
+        expected = [dict(zip(extractor.fields, record)) for record in extractor.records(self.lines)]
+        self.assertEqual(expected, [json.loads(line) for line in jsonl.getvalue().splitlines()])
+        self.assertEqual(expected, list(csv.DictReader(io.StringIO(comma_separated.getvalue()))))
+        self.assertEqual('{"starts_with": "ERROR", "followed_with_1": " disk ", "ends_with": "failed"}',
+                         jsonl.getvalue().splitlines()[0])
+
+    def test_search_mode_and_inner_regex_keep_the_clause_group_only(self):
+        # GIVEN
+        dsl = 'followed with "id=" or "ID="\nfollowed with numbers'
+        extractor = RecordExtractor(dsl, mode='search', alternatives=True)
+
+        # WHEN
+        records = list(extractor.records(['user id=17 logged in', 'no number here']))
+
+        # THEN
+        self.assertEqual([('id=', 'id=', None, '17', '17')], records)
+        inner = RecordExtractor('starts with inner regex(followed with "John" or "Steve") or "Hello"\n'
+                                'ends with something', alternatives=True)
+        self.assertEqual(('starts_with', 'ends_with', 'ends_with_alt1'), inner.fields)
+        self.assertEqual([('Steve', '!', '!')], list(inner.records(['Steve!'])))
+        with self.assertRaises(ValueError):
+            RecordExtractor(dsl, mode='findall')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import re
+import unittest
+
+from casestudyone.python.DslCompiler import DslCompiler
+from casestudyone.python.RegexOptimizer import RegexOptimizer
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.python.RegexSyntaxTree import RegexSyntaxTree
+from casestudyone.test.RuleGenerator import DIFFERENTIAL_SHAPE, RuleGenerator
+
+
+class RegexOptimizerTest(unittest.TestCase):
+    def assert_equivalent(self, regex: str, optimized: str, candidates):
+        original_pattern = re.compile(regex)
+        optimized_pattern = re.compile(optimized)
+        for candidate in candidates:
+            for method in ('fullmatch', 'match', 'search'):
+                expected = getattr(original_pattern, method)(candidate)
+                result = getattr(optimized_pattern, method)(candidate)
+                self.assertEqual(expected and expected.span(), result and result.span(),
+                                 '{0} {1!r} on {2!r} => {3!r}'.format(method, regex, candidate, optimized))
+
+    def test_examples(self):
+        self.assertEqual('^(?:first|second)', RegexOptimizer.optimize('^(first|second)'))
+        self.assertEqual('^(?:(?:aa){1,2}|b{3})', RegexOptimizer.optimize('^((aa){1,2}|(b){3})'))
+        self.assertEqual('^.+@.+\\.(?:com|de|net)$', RegexOptimizer.optimize('^(.+)(@)(.+)(\\.)(com|de|net)$'))
+        self.assertEqual('gm(?:ail|x)\\.(?:com|de)', RegexOptimizer.optimize('(gmail|gmx)(\\.)(com|de)'))
+        self.assertEqual('ab[cd]|x|ab', RegexOptimizer.optimize('(abc|abd|x|ab)'))
+        self.assertEqual('[acd]b', RegexOptimizer.optimize('(ab|cb|db)'))
+        self.assertEqual('Hello(?: World!)?', RegexOptimizer.optimize('(Hello World!|Hello)'))
+
+    def test_patterns_outside_the_supported_subset_are_returned_unchanged(self):
+        for pattern in ['(a', 'a)', '(?=a)b', '\\bword', '[a']:
+            self.assertEqual(pattern, RegexOptimizer.optimize(pattern))
+
+    def test_syntax_tree_round_trip(self):
+        rules = RuleGenerator(DIFFERENTIAL_SHAPE, seed=4)
+        for _ in range(500):
+            regex = RegexParser.regex_parser.parse(rules.rule())
+            self.assertEqual(regex, RegexSyntaxTree.emit(RegexSyntaxTree.parse(regex)))
+
+    def test_differential_against_current_output(self):
+        rules = RuleGenerator(DIFFERENTIAL_SHAPE, seed=11)
+        for _ in range(400):
+            regex_dsl = rules.rule()
+            regex = RegexParser.regex_parser.parse(regex_dsl)
+            optimized = DslCompiler.build_regex(regex_dsl, optimize=True)
+            matching = rules.samples(regex, 20)
+            mutated = rules.near_misses(matching, 'abx.')
+            truncated = [text[:-1] for text in matching] + [text + 'c' for text in matching]
+            self.assert_equivalent(regex, optimized, matching + mutated + truncated)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import random
+from typing import List, NamedTuple, Tuple
+
+from casestudyone.python.CharSet import CharSet
+from casestudyone.python.RegexSyntaxTree import Alternation, Anchor, Group, Node, RegexSyntaxTree, Repeat, Sequence, \
+    SINGLE_CHARACTER_NODES
+
+WORDS = ('ERROR', 'WARN', 'user', 'login', 'disk', 'a.b', 'x', 'timeout', '@', 'gmail', 'id', ' ')
+PREDEFINED = ['anything', 'something', 'letters', 'numbers']
+# Characters sampled for classes and the dot, so that generated texts stay short and printable.
+PRINTABLE = CharSet([(0x20, 0x7E), (0xE4, 0xE4), (0xDF, 0xDF)])
+
+
+class RuleShape(NamedTuple):
+    # Every alternation has exactly alternatives items. Nesting goes exactly depth levels deep: the first item
+    # of every alternation above that depth is an inner regex of inner_clauses clauses. Of the other items the
+    # share predefined are predefined terms, and the share quantified of the terms occur a number of times in
+    # the occurs range. Many predefined terms in one rule make failing matches backtrack polynomially.
+    alternatives: int = 3
+    depth: int = 0
+    clauses: int = 3
+    occurs: Tuple[int, int] = (1, 3)
+    quantified: float = 0.3
+    inner_clauses: int = 2
+    predefined: float = 0.2
+    # Terms are one or two of these words.
+    words: Tuple[str, ...] = WORDS
+    # With varied, every rule draws its own counts, up to the ones above: one to alternatives items per
+    # alternation, none to clauses followed with clauses, and one to inner_clauses clauses per inner regex.
+    # Starts with and ends with are there in half of the rules, and every item above depth is an inner regex
+    # with probability inner. The share indefinitely of the quantified terms occur indefinitely.
+    varied: bool = False
+    inner: float = 0.1
+    indefinitely: float = 0.0
+    # For parser tests: the share malformed of the quantifications do not translate, and with any_layout the
+    # rules use every separator and indentation the grammar takes, and inner regexes may be empty.
+    malformed: float = 0.0
+    any_layout: bool = False
+
+
+# Rules of every form that translates, for differential tests of what is done with their translations. The
+# words share prefixes and suffixes, as the optimizer factors those out.
+DIFFERENTIAL_SHAPE = RuleShape(alternatives=5, depth=2, clauses=2, occurs=(1, 2), quantified=0.35, predefined=0.12,
+                               words=('gmail', 'gmx', 'gm', 'hello', 'help', 'helium', 'a', 'ab', 'abc', 'b.c', 'c',
+                                      'bc', '@'), varied=True, indefinitely=0.33)
+
+
+class RuleGenerator:
+    """Generates DSL rules of a given shape, and texts that do or do not match their translations."""
+
+    def __init__(self, shape: RuleShape = RuleShape(), seed: int = 7):
+        self.shape = shape
+        self.generator = random.Random(seed)
+
+    def rules(self, count: int) -> List[str]:
+        return [self.rule() for _ in range(count)]
+
+    def rule(self) -> str:
+        shape = self.shape
+        if not shape.varied:
+            clauses = (['starts with ' + self.alternation(0)]
+                       + ['followed with ' + self.alternation(0) for _ in range(shape.clauses)]
+                       + ['ends with ' + self.alternation(0)])
+        else:
+            clauses = []
+            if self.generator.random() < 0.5:
+                clauses.append('starts with ' + self.alternation(0))
+            clauses.extend(self.layout('', '  ', '\t') + 'followed with ' + self.alternation(0)
+                           for _ in range(self.generator.randint(0, shape.clauses)))
+            if self.generator.random() < 0.5:
+                clauses.append('ends with ' + self.alternation(0))
+        return self.layout('\n', '\n\n', ' ').join(clauses)
+
+    def alternation(self, depth: int) -> str:
+        count = self.generator.randint(1, self.shape.alternatives) if self.shape.varied else self.shape.alternatives
+        return self.layout(' or ', 'or', '\nor ').join(self.item(depth, index == 0) for index in range(count))
+
+    def item(self, depth: int, first: bool) -> str:
+        shape = self.shape
+        if depth < shape.depth and (self.generator.random() < shape.inner if shape.varied else first):
+            count = shape.inner_clauses
+            if shape.varied:
+                count = self.generator.randint(0 if shape.any_layout else 1, count)
+            return 'inner regex({0})'.format(' '.join(
+                'followed with ' + self.alternation(depth + 1) for _ in range(count)))
+        if self.generator.random() < shape.predefined:
+            return self.generator.choice(PREDEFINED)
+        term = '"{0}"'.format(''.join(self.generator.sample(shape.words, self.generator.randint(1, 2))))
+        if self.generator.random() < shape.quantified:
+            term += self.quantification()
+        return term
+
+    def quantification(self) -> str:
+        shape = self.shape
+        if shape.malformed and self.generator.random() < shape.malformed:
+            return self.generator.choice([' occurs 2..1', ' occurs x'])
+        if shape.indefinitely and self.generator.random() < shape.indefinitely:
+            return ' occurs indefinitely'
+        low, high = shape.occurs
+        minimum = self.generator.randint(low, high)
+        return ' occurs {0}..{1}'.format(minimum, self.generator.randint(minimum, high))
+
+    def layout(self, usual: str, *others: str) -> str:
+        return self.generator.choice((usual,) + others) if self.shape.any_layout else usual
+
+    def corpus(self, regex: str, count: int) -> List[str]:
+        # Half of the texts are samples of the pattern, the other half are samples with one character changed;
+        # a mutation may still match, the proportions are what matters.
+        tree = RegexSyntaxTree.parse(regex)
+        texts = []
+        for index in range(count):
+            text = self.sample(tree)
+            if index % 2 and text:
+                position = self.generator.randrange(len(text))
+                text = text[:position] + self.generator.choice('#~7Z') + text[position + 1:]
+            texts.append(text)
+        return texts
+
+    def samples(self, regex: str, count: int) -> List[str]:
+        tree = RegexSyntaxTree.parse(regex)
+        return [self.sample(tree) for _ in range(count)]
+
+    def near_misses(self, texts: List[str], characters: str) -> List[str]:
+        # Every text with one of characters written over one of its characters, or appended to it.
+        return [text[:position] + self.generator.choice(characters) + text[position + 1:]
+                for text in texts for position in [self.generator.randint(0, len(text))]]
+
+    def sample(self, node: Node) -> str:
+        if isinstance(node, SINGLE_CHARACTER_NODES):
+            char_set = CharSet.of_node(node)
+            printable = char_set.intersection(PRINTABLE)
+            low, high = self.generator.choice((printable or char_set).intervals)
+            return chr(self.generator.randint(low, high))
+        if isinstance(node, Anchor):
+            return ''
+        if isinstance(node, Sequence):
+            return ''.join(self.sample(item) for item in node.items)
+        if isinstance(node, Alternation):
+            return self.sample(self.generator.choice(node.branches))
+        if isinstance(node, Group):
+            return self.sample(node.body)
+        if isinstance(node, Repeat):
+            maximum = node.min + 3 if node.max is None else node.max
+            return ''.join(self.sample(node.body) for _ in range(self.generator.randint(node.min, maximum)))
+        raise TypeError("not a regex syntax node: {0!r}".format(node))
+
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.python.RuleClient import RuleClient
+from casestudyone.python.RuleService import RuleService, RuleServiceError
+
+
+class RuleServiceTest(unittest.IsolatedAsyncioTestCase):
+    rules = {
+        'error': 'starts with "ERROR"\nfollowed with anything\nends with "failed" or "timeout"',
+        'number': 'starts with numbers\nends with anything',
+    }
+    texts = ['ERROR disk failed', 'ERROR timeout', 'INFO disk failed', '42 apples', 'ERROR ok']
+
+    async def asyncSetUp(self):
+        self.service = RuleService(self.rules, workers=2, max_pending=4)
+        self.service.compile_rules()
+        self.addCleanup(self.service.close)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    async def start_unix(self) -> RuleClient:
+        path = os.path.join(self.directory.name, 'rules.sock')
+        server = await self.service.start_unix(path)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        client = await RuleClient.connect_unix(path)
+        self.addAsyncCleanup(client.close)
+        return client
+
+    def expected(self, dsl: str, mode: str = 'fullmatch'):
+        pattern = re.compile(RegexParser.regex_parser.parse(dsl))
+        return [getattr(pattern, mode)(text) is not None for text in self.texts]
+
+    async def test_concurrent_matches_over_a_unix_socket_go_out_as_one_batch(self):
+        # GIVEN
+        client = await self.start_unix()
+
+        # WHEN
+        result = await asyncio.gather(*(client.match(text, rule='error') for text in self.texts))
+
+        # THEN
+        self.assertEqual(self.expected(self.rules['error']), result)
+        self.assertEqual(1, client.requests_sent)
+        self.assertEqual(1, self.service.requests)
+
+    async def test_sequential_matches_and_dsl_requests_over_tcp(self):
+        # GIVEN
+        server = await self.service.start_tcp('127.0.0.1', 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        client = await RuleClient.connect_tcp('127.0.0.1', server.sockets[0].getsockname()[1])
+        self.addAsyncCleanup(client.close)
+        dsl = 'starts with anything\nends with "failed"'
+
+        # WHEN
+        sequential = [await client.match(text, rule='number', mode='search') for text in self.texts]
+        inline = await client.match_many(self.texts, dsl=dsl)
+
+        # THEN
+        self.assertEqual(self.expected(self.rules['number'], 'search'), sequential)
+        self.assertEqual(self.expected(dsl), inline)
+        self.assertEqual(len(self.texts) + 1, self.service.requests)
+
+    async def test_more_requests_than_max_pending_are_all_answered(self):
+        client = await self.start_unix()
+        results = await asyncio.gather(*(client.match_many(self.texts, rule=rule) for rule in self.rules
+                                         for _ in range(10)))
+        self.assertEqual([self.expected(self.rules[rule]) for rule in self.rules for _ in range(10)], results)
+
+    async def test_errors_fail_only_their_request(self):
+        # GIVEN
+        client = await self.start_unix()
+
+        # WHEN
+        unknown, invalid, valid = await asyncio.gather(
+            client.match('ERROR failed', rule='missing'), client.match('ERROR failed', dsl='starts with'),
+            client.match('ERROR failed', rule='error'), return_exceptions=True)
+
+        # THEN
+        self.assertIsInstance(unknown, RuleServiceError)
+        self.assertIn("unknown rule 'missing'", str(unknown))
+        self.assertIsInstance(invalid, RuleServiceError)
+        self.assertTrue(valid)
+        with self.assertRaises(ValueError):
+            await client.match('ERROR failed', rule='error', dsl=self.rules['error'])
+
+    async def test_every_request_waits_for_the_writer_to_drain(self):
+        client = await self.start_unix()
+        with mock.patch.object(client.writer, 'drain', wraps=client.writer.drain) as drain:
+            await asyncio.gather(client.match_many(self.texts, rule='error'), client.match('ERROR ok', rule='number'))
+        self.assertEqual(2, drain.await_count)
+
+    async def test_an_over_long_request_fails_with_the_error_of_the_service(self):
+        # GIVEN a client of a service that takes lines of at most 1 KiB
+        path = os.path.join(self.directory.name, 'rules.sock')
+        service = RuleService(self.rules, workers=2, max_pending=4, max_line_bytes=1024)
+        self.addCleanup(service.close)
+        server = await service.start_unix(path)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        client = await RuleClient.connect_unix(path)
+        self.addAsyncCleanup(client.close)
+
+        # WHEN
+        with self.assertRaises(RuleServiceError) as context:
+            await client.match_many(['x' * 2048], rule='error')
+
+        # THEN
+        self.assertIn('request line longer than 1024 bytes', str(context.exception))
+
+    async def test_an_over_long_line_is_answered_after_the_requests_before_it(self):
+        # GIVEN a service that takes lines of at most 1 KiB
+        path = os.path.join(self.directory.name, 'rules.sock')
+        service = RuleService(self.rules, workers=2, max_pending=4, max_line_bytes=1024)
+        self.addCleanup(service.close)
+        server = await service.start_unix(path)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        reader, writer = await asyncio.open_unix_connection(path)
+        self.addCleanup(writer.close)
+
+        # WHEN
+        requests = [{'id': index, 'rule': 'error', 'texts': self.texts} for index in range(3)]
+        writer.write(b''.join(json.dumps(request).encode() + b'\n' for request in requests))
+        writer.write(json.dumps({'id': 3, 'rule': 'error', 'texts': ['x' * 2048]}).encode() + b'\n')
+        await writer.drain()
+        responses = [json.loads(line) for line in (await reader.read()).splitlines()]
+
+        # THEN
+        self.assertEqual([{'id': index, 'matches': self.expected(self.rules['error'])} for index in range(3)],
+                         sorted((response for response in responses if response['id'] is not None),
+                                key=lambda response: response['id']))
+        self.assertEqual([{'id': None, 'error': 'RuleServiceError: request line longer than 1024 bytes'}],
+                         [response for response in responses if response['id'] is None])
+
+
+if __name__ == '__main__':
+    unittest.main()
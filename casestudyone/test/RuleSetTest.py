@@ -0,0 +1,76 @@
+import re
+import unittest
+
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.python.RuleSet import RuleSet
+
+
+class RuleSetTest(unittest.TestCase):
+    rules = {
+        'email': '''starts with something
+followed with "@"
+followed with something
+followed with "."
+ends with "com" or "de" or "net"''',
+        'gmx': '''starts with something
+followed with "@gmx."
+ends with "de" or "net"''',
+        'starts with T': 'starts with "T" followed with anything',
+        'ends with s.': 'followed with anything ends with "s."',
+        'number': 'starts with numbers',
+    }
+    records = ['name@gmail.com', 'name@gmx.de', 'This matches.', 'Tests', '12.5e3', 'name@gmx.ch', '', 'x\n']
+
+    def naive(self, text, method):
+        return [name for name, dsl in self.rules.items()
+                if getattr(re, method)(RegexParser.regex_parser.parse(dsl), text) is not None]
+
+    def test_one_pass_reports_all_matching_rules(self):
+        # GIVEN
+        rule_set = RuleSet(self.rules)
+
+        # THEN
+        self.assertEqual(1, len(rule_set.passes))
+        self.assertEqual(['email', 'gmx'], rule_set.matches('name@gmx.de'))
+        self.assertEqual(['starts with T', 'ends with s.'], rule_set.matches('This matches.'))
+        for record in self.records:
+            with self.subTest(record=record):
+                self.assertEqual(self.naive(record, 'fullmatch'), rule_set.matches(record))
+
+    def test_search_mode(self):
+        rule_set = RuleSet(self.rules, mode='search')
+        for record in self.records + ['see name@gmx.de now', 'xTs.']:
+            with self.subTest(record=record):
+                self.assertEqual(self.naive(record, 'search'), rule_set.matches(record))
+
+    def test_rules_are_split_over_several_passes(self):
+        # GIVEN
+        rule_set = RuleSet(self.rules, rules_per_pattern=2, optimize=True)
+
+        # THEN
+        self.assertEqual(3, len(rule_set.passes))
+        for record in self.records:
+            with self.subTest(record=record):
+                self.assertEqual(self.naive(record, 'fullmatch'), rule_set.matches(record))
+        self.assertEqual('starts with T', rule_set.first_match('This matches.'))
+        self.assertIsNone(rule_set.first_match('nothing'))
+
+    def test_search_mode_reports_rules_left_of_the_first_match(self):
+        # GIVEN
+        rule_set = RuleSet([('late', 'followed with "zz"'), ('early', 'followed with "a"'),
+                            ('anchored', 'starts with "a"'), ('second a', 'followed with "a" followed with "zz"')],
+                           mode='search')
+
+        # THEN
+        self.assertEqual(['late', 'early', 'second a'], rule_set.matches('baazz'))
+        self.assertEqual(['late', 'early', 'anchored', 'second a'], rule_set.matches('azz'))
+        self.assertEqual('late', rule_set.first_match('baazz'))
+
+    def test_rules_with_capturing_groups_of_their_own(self):
+        rule_set = RuleSet([('a', 'starts with "aa" occurs 1..2 or "b" occurs 3..3'), ('b', 'starts with "bbb"')])
+        self.assertEqual(['a', 'b'], rule_set.matches('bbb'))
+        self.assertEqual(['a'], rule_set.matches('aaaa'))
+
+
+if __name__ == '__main__':
+    unittest.main()
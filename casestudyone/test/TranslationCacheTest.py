@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from casestudyone.python import TranslationCache as translation_cache_module
+from casestudyone.python.DslCompiler import DslCompiler
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.python.SemanticError import SemanticError
+from casestudyone.python.TranslationCache import TranslationCache, translator_modules
+
+
+class TranslationCacheTest(unittest.TestCase):
+    rule = '''starts with "T"
+followed with anything
+ends with "s."'''
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(DslCompiler.use_translation_cache, None)
+
+    def test_restarted_process_reads_translations_from_the_file(self):
+        # GIVEN
+        DslCompiler.use_translation_cache(self.directory.name)
+        DslCompiler.translate(self.rule)
+        DslCompiler.translate(self.rule, optimize=True)
+
+        # WHEN
+        cache = DslCompiler.use_translation_cache(self.directory.name)
+        with mock.patch.object(DslCompiler, 'translate_dsl', side_effect=AssertionError('translated again')):
+            result = DslCompiler.translate(self.rule)
+
+        # THEN
+        self.assertEqual(RegexParser.regex_parser.parse(self.rule), result)
+        self.assertEqual(2, len(cache))
+        self.assertEqual((1, 0), (cache.hits, cache.misses))
+
+    def test_changed_translator_starts_a_new_file(self):
+        # GIVEN
+        first = TranslationCache(self.directory.name)
+        first.put(self.rule, 'stale')
+
+        # WHEN
+        with mock.patch.object(translation_cache_module, 'translator_fingerprint', return_value='0' * 64):
+            second = TranslationCache(self.directory.name)
+
+        # THEN
+        self.assertNotEqual(first.path, second.path)
+        self.assertIsNone(second.get(self.rule))
+        self.assertEqual('stale', TranslationCache(self.directory.name).get(self.rule))
+
+    def test_fingerprint_covers_every_module_the_translator_imports(self):
+        modules = dict(translator_modules())
+        for name in ['casestudyone.python.DslCompiler', 'casestudyone.python.RegexParser',
+                     'common.python.Dispatch', 'common.python.LazyGrammar']:
+            self.assertIn(name, modules)
+        self.assertNotIn('parsy', modules)
+        self.assertNotIn('casestudyone.python.Cli', modules)
+
+    def test_prune_removes_the_files_of_other_fingerprints(self):
+        # GIVEN
+        with mock.patch.object(translation_cache_module, 'translator_fingerprint', return_value='0' * 64):
+            stale = TranslationCache(self.directory.name)
+            stale.put(self.rule, 'stale')
+        cache = TranslationCache(self.directory.name)
+        cache.put(self.rule, '^(T)(.*)(s\\.)$')
+
+        # WHEN
+        removed = cache.prune()
+
+        # THEN
+        self.assertEqual([stale.path], removed)
+        self.assertEqual([os.path.basename(cache.path)], os.listdir(self.directory.name))
+
+    def test_torn_lines_of_concurrent_writers_are_skipped(self):
+        # GIVEN
+        cache = TranslationCache(self.directory.name)
+        other_writer = TranslationCache(self.directory.name)
+        cache.put('starts with "a"', '^(a)')
+        with open(cache.path, 'a') as file:
+            # The first bytes of a line whose writer crashed.
+            file.write('\n{"key": "a torn li')
+        other_writer.put('starts with "b"', '^(b)')
+
+        # WHEN
+        result = TranslationCache(self.directory.name)
+
+        # THEN
+        self.assertEqual('^(a)', result.get('starts with "a"'))
+        self.assertEqual('^(b)', result.get('starts with "b"'))
+        self.assertEqual(2, len(result))
+
+    def test_errors_are_not_cached(self):
+        cache = DslCompiler.use_translation_cache(self.directory.name)
+        for _ in range(2):
+            with self.assertRaises(SemanticError):
+                DslCompiler.translate('starts with "first" occurs 2..1')
+        self.assertEqual((0, 2), (cache.hits, cache.misses))
+        self.assertFalse(os.path.exists(cache.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import random
+import re
+import unittest
+
+from casestudyone.python.RegexParser import RegexParser
+from casestudyone.test.RuleGenerator import RuleGenerator, RuleShape
+
+try:
+    import numpy as np
+    from casestudyone.python.VectorizedMatcher import VectorizedMatcher
+except ImportError:
+    np = None
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class VectorizedMatcherTest(unittest.TestCase):
+    rule = '''starts with "ERROR"
+followed with anything
+ends with "failed" or "timeout"'''
+
+    def test_mask_of_numpy_array(self):
+        # GIVEN
+        values = np.array(['ERROR disk failed', 'ERROR timeout', 'INFO disk failed', None, 'ERROR x failed\n'],
+                          dtype=object)
+
+        # WHEN
+        result = VectorizedMatcher(self.rule).mask(values)
+
+        # THEN
+        self.assertEqual([True, True, False, False, False], result.tolist())
+        self.assertEqual([True, True, False, True, False],
+                         VectorizedMatcher(self.rule).mask(values, na=True).tolist())
+
+    def test_generated_rules_match_like_a_python_loop(self):
+        generator = RuleGenerator(RuleShape(alternatives=3, clauses=2, predefined=0.1), seed=4)
+        rows = random.Random(5)
+        for dsl in generator.rules(40):
+            pattern = re.compile(RegexParser.regex_parser.parse(dsl))
+            texts = generator.corpus(pattern.pattern, 60) + ['ERROR', '', 'timeout\nfailed']
+            # Small chunks, and rows that contain a required literal nowhere else, exercise the prefilter.
+            texts += [text + ' ' + literal for text in texts[:3] for literal in VectorizedMatcher(dsl).required_literals]
+            rows.shuffle(texts)
+            for mode in ('fullmatch', 'search'):
+                with self.subTest(dsl=dsl, mode=mode):
+                    expected = [getattr(pattern, mode)(text) is not None for text in texts]
+                    result = VectorizedMatcher(dsl, mode=mode, chunk_size=16).mask(texts)
+                    self.assertEqual(expected, result.tolist())
+
+    def test_rare_literal_selects_the_candidate_rows(self):
+        texts = ['INFO disk ok'] * 5000 + ['ERROR disk failed', 'ERROR failed but no'] + ['INFO disk ok'] * 5000
+        result = VectorizedMatcher(self.rule).mask(texts)
+        self.assertEqual([5000], np.flatnonzero(result).tolist())
+
+    def test_extract_groups(self):
+        values = np.array(['ERROR disk failed', 'INFO', None], dtype=object)
+        result = VectorizedMatcher(self.rule).extract(values)
+        self.assertEqual(re.fullmatch(VectorizedMatcher(self.rule).pattern, 'ERROR disk failed').groups(),
+                         tuple(result[0]))
+        self.assertTrue(all(group is None for group in result[1:].flat))
+
+    @unittest.skipIf(pd is None, 'pandas is not installed')
+    def test_pandas_series_keeps_its_index(self):
+        # GIVEN
+        series = pd.Series(['ERROR disk failed', None, float('nan'), 'INFO'], index=[10, 20, 30, 40], name='log')
+
+        # WHEN
+        mask = VectorizedMatcher(self.rule).mask(series)
+        groups = VectorizedMatcher(self.rule).extract(series)
+
+        # THEN
+        self.assertEqual([True, False, False, False], mask.tolist())
+        self.assertEqual([10, 20, 30, 40], mask.index.tolist())
+        self.assertEqual('log', mask.name)
+        self.assertEqual([0, 1, 2], groups.columns.tolist())
+        self.assertEqual('ERROR', groups.loc[10, 0])
+        self.assertTrue(pd.isna(groups.loc[40, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
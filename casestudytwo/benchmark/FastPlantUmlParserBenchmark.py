@@ -0,0 +1,42 @@
+import argparse
+import time
+from typing import Callable
+
+from casestudytwo.benchmark.PlantUmlGenerator import DiagramShape, PlantUmlGenerator
+from casestudytwo.python.FastPlantUmlParser import FastPlantUmlParser
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from casestudytwo.python.PythonToPlantUml import PythonToPlantUml
+
+
+def measure(parse: Callable[[str], object], text: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the parsy grammar with the hand-written parser.')
+    parser.add_argument('--concepts', type=int, default=5_000)
+    parser.add_argument('--members', type=int, default=6)
+    parser.add_argument('--dependencies', type=float, default=0.3)
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    shape = DiagramShape(dependencies=arguments.dependencies, members=arguments.members)
+    text = PlantUmlGenerator(shape).text(arguments.concepts)
+    render = PythonToPlantUml.map_plant_uml_to_plant_uml_string
+    assert render(FastPlantUmlParser.parse(text)) == render(PlantUmlParser.plant_uml_parser.parse(text))
+
+    parsy_seconds = measure(PlantUmlParser.plant_uml_parser.parse, text, arguments.repeat)
+    fast_seconds = measure(FastPlantUmlParser.parse, text, arguments.repeat)
+    print("{0} concepts, {1:,} characters".format(arguments.concepts, len(text)))
+    print("parsy:        {0:8.3f}s  {1:12,.0f} chars/sec".format(parsy_seconds, len(text) / parsy_seconds))
+    print("hand-written: {0:8.3f}s  {1:12,.0f} chars/sec".format(fast_seconds, len(text) / fast_seconds))
+    print("speedup:      {0:8.1f}x".format(parsy_seconds / fast_seconds))
+
+
+if __name__ == '__main__':
+    main()
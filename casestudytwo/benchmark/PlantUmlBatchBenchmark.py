@@ -0,0 +1,61 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from casestudytwo.benchmark.PlantUmlGenerator import DiagramShape, PlantUmlGenerator
+from casestudytwo.python.PlantUmlBatch import BatchParser, find_files
+
+
+def write_tree(directory: str, files: int, concepts: int, members: int):
+    generator = PlantUmlGenerator(DiagramShape(members=members))
+    for index in range(files):
+        package = os.path.join(directory, 'package{0}'.format(index % 10))
+        os.makedirs(package, exist_ok=True)
+        with open(os.path.join(package, 'diagram{0}.puml'.format(index)), 'w') as file:
+            file.write(generator.text(concepts))
+
+
+def files_per_second(paths: List[str], processes: int, chunk_size: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        batch = BatchParser(processes=processes, chunk_size=chunk_size)
+        started = time.perf_counter()
+        errors = sum(not result.ok for result in batch.parse_paths(paths))
+        best = min(best, time.perf_counter() - started)
+        if errors:
+            raise AssertionError('{0} of the generated files did not parse'.format(errors))
+    return len(paths) / best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description='Measure how batch parsing of a PlantUML tree scales with processes.')
+    parser.add_argument('--files', type=int, default=2_000)
+    parser.add_argument('--concepts', type=int, default=20, help='concepts per generated file')
+    parser.add_argument('--members', type=int, default=6)
+    parser.add_argument('--chunk-size', type=int, default=16)
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--processes', type=int, nargs='+',
+                        default=sorted({2 ** power for power in range(cores.bit_length())} | {cores}))
+    arguments = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_tree(directory, arguments.files, arguments.concepts, arguments.members)
+        paths = find_files(directory)
+        kib = sum(os.path.getsize(path) for path in paths) / 1024
+        print('{0} files, {1:.0f} KiB, {2} cores'.format(len(paths), kib, cores))
+        print('{0:>10}{1:>14}{2:>10}{3:>12}'.format('processes', 'files/sec', 'speedup', 'efficiency'))
+        single = None
+        for processes in arguments.processes:
+            rate = files_per_second(paths, processes, arguments.chunk_size, arguments.repeat)
+            single = single or rate
+            print('{0:>10}{1:>14,.0f}{2:>9.2f}x{3:>11.0%}'.format(
+                processes, rate, rate / single, rate / single / processes))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
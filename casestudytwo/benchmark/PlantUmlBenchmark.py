@@ -0,0 +1,97 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from casestudytwo.benchmark.PlantUmlGenerator import DiagramShape, PlantUmlGenerator
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from common.python.GrammarProfiler import GrammarProfiler
+
+
+class Scenario(NamedTuple):
+    concepts: int
+    shape: DiagramShape = DiagramShape()
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    'small': Scenario(50),
+    'large': Scenario(5_000),
+    'dependencies': Scenario(5_000, DiagramShape(dependencies=0.8)),
+    'members': Scenario(1_000, DiagramShape(members=30)),
+}
+
+# Time is microseconds per KiB of input. Calls and backtracks are the named parsers entered and failed per KiB;
+# they do not depend on the machine, so they show a change to the grammar even where timings are noisy.
+METRICS = ('parse_us_per_kib', 'calls_per_kib', 'backtracks_per_kib')
+
+
+def best_of(repeat: int, text: str) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        PlantUmlParser.plant_uml_parser.parse(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(scenario: Scenario, repeat: int) -> Dict[str, float]:
+    text = PlantUmlGenerator(scenario.shape).text(scenario.concepts)
+    kib = len(text.encode('utf-8')) / 1024
+    with GrammarProfiler(PlantUmlParser) as profiler:
+        PlantUmlParser.plant_uml_parser.parse(text)
+    return {
+        'parse_us_per_kib': best_of(repeat, text) * 1e6 / kib,
+        'calls_per_kib': sum(stats.calls for stats in profiler.stats.values()) / kib,
+        'backtracks_per_kib': sum(stats.backtracks for stats in profiler.stats.values()) / kib,
+        'kib': kib,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    regressions = []
+    for scenario, metrics in results.items():
+        for metric in METRICS:
+            before = baseline.get(scenario, {}).get(metric)
+            if before and metrics[metric] > before * (1 + tolerance):
+                regressions.append('{0} {1}: {2:.1f} -> {3:.1f} ({4:+.0%})'.format(
+                    scenario, metric, before, metrics[metric], metrics[metric] / before - 1))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Time the PlantUML grammar on generated class diagrams.')
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='a JSON file written by an earlier --output to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='slowdown of a metric against the baseline that counts as a regression')
+    arguments = parser.parse_args(argv)
+
+    results = {}
+    print('{0:<14}{1:>8}{2:>18}{3:>15}{4:>20}'.format('scenario', 'kib', *METRICS))
+    for scenario in arguments.scenarios:
+        results[scenario] = measure(SCENARIOS[scenario], arguments.repeat)
+        print('{0:<14}{1:>8.0f}{2:>18.0f}{3:>15.0f}{4:>20.0f}'.format(
+            scenario, results[scenario]['kib'], *(results[scenario][metric] for metric in METRICS)))
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'scenarios': {name: {'concepts': SCENARIOS[name].concepts,
+                                            'shape': SCENARIOS[name].shape._asdict()} for name in results},
+                       'results': results}, file, indent=2)
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            regressions = compare(results, json.load(file)['results'], arguments.tolerance)
+        for regression in regressions:
+            print('regression: ' + regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import random
+from typing import List, NamedTuple
+
+from casestudytwo.python.PythonToPlantUml import PythonToPlantUml
+from casestudytwo.python.SemanticModel import Access, Constructor, Dependency, DependencyConcept, DependencyType, \
+    Entity, Enumeration, Field, Method, NonAccessModifier, Parameter, PlantUml
+
+WORDS = ['name', 'id', 'count', 'owner', 'items', 'parent', 'value', 'total', 'label', 'created']
+TYPES = ['int', 'String', 'boolean', 'double', 'List', 'Date', 'Order', 'Customer']
+CARDINALITIES = ['', '', '1', '0..1', '*', 'many']
+MODIFIERS = [None, None, None, NonAccessModifier.STATIC, NonAccessModifier.ABSTRACT]
+
+
+class DiagramShape(NamedTuple):
+    # Shares of the concepts that are abstract classes, enums, interfaces and dependencies; the rest are classes.
+    abstract_classes: float = 0.1
+    enums: float = 0.1
+    interfaces: float = 0.1
+    dependencies: float = 0.3
+    members: int = 6
+    parameters: int = 2
+
+
+class PlantUmlGenerator:
+    """Generates class diagrams of a given shape and renders them with PythonToPlantUml."""
+
+    def __init__(self, shape: DiagramShape = DiagramShape(), seed: int = 7):
+        self.shape = shape
+        self.generator = random.Random(seed)
+
+    def text(self, concepts: int) -> str:
+        return PythonToPlantUml.map_plant_uml_to_plant_uml_string(self.model(concepts))
+
+    def model(self, concepts: int) -> PlantUml:
+        classes, abstract_classes, enums, interfaces, dependencies = [], [], [], [], []
+        shape = self.shape
+        for index in range(concepts):
+            name = 'Concept{0}'.format(index)
+            kind = self.generator.random()
+            if kind < shape.abstract_classes:
+                abstract_classes.append(self.entity(name, is_abstract=True))
+            elif kind < shape.abstract_classes + shape.enums:
+                enums.append(Enumeration(name, [word.upper() for word in self.words(1, 5)]))
+            elif kind < shape.abstract_classes + shape.enums + shape.interfaces:
+                interfaces.append(self.entity(name, is_interface=True))
+            elif kind < shape.abstract_classes + shape.enums + shape.interfaces + shape.dependencies and index:
+                dependencies.append(self.dependency(index))
+            else:
+                classes.append(self.entity(name))
+        return PlantUml(classes, abstract_classes, enums, interfaces, dependencies)
+
+    def entity(self, name: str, is_abstract: bool = False, is_interface: bool = False) -> Entity:
+        fields, methods, constructors = [], [], []
+        for _ in range(self.generator.randint(0, self.shape.members)):
+            member = self.generator.random()
+            if member < 0.45:
+                fields.append(Field(self.access(), self.word(), self.type(), self.generator.choice(MODIFIERS)))
+            elif member < 0.9 or is_interface:
+                methods.append(Method(self.access(), self.word(), self.type(), self.parameters(),
+                                      self.generator.choice(MODIFIERS)))
+            else:
+                constructors.append(Constructor(self.access(), self.parameters()))
+        return Entity(name, fields, methods, constructors, is_abstract, is_interface)
+
+    def dependency(self, index: int) -> Dependency:
+        label = ' '.join(self.words(0, 3))
+        return Dependency(DependencyConcept('Concept{0}'.format(self.generator.randrange(index)),
+                                            self.generator.choice(CARDINALITIES)),
+                          DependencyConcept('Concept{0}'.format(self.generator.randrange(index)),
+                                            self.generator.choice(CARDINALITIES)),
+                          self.generator.choice(list(DependencyType)), label)
+
+    def parameters(self) -> List[Parameter]:
+        return [Parameter(self.word(), self.type()) for _ in range(self.generator.randint(0, self.shape.parameters))]
+
+    def access(self) -> Access:
+        return self.generator.choice(list(Access))
+
+    def word(self) -> str:
+        return self.generator.choice(WORDS) + str(self.generator.randrange(100))
+
+    def words(self, low: int, high: int) -> List[str]:
+        return [self.word() for _ in range(self.generator.randint(low, high))]
+
+    def type(self) -> str:
+        return self.generator.choice(TYPES)
@@ -0,0 +1,264 @@
+import re
+from typing import List, Optional, Tuple
+
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from casestudytwo.python.SemanticModel import Access, DependencyType, Entity, NonAccessModifier, PlantUml
+from casestudytwo.python.SemanticModelBuilder import SemanticModelBuilder
+
+PARSER_BACKENDS = ('tokens', 'parsy')
+
+# The lexer: every token with the whitespace in front of it, which the parser checks where the grammar asks for
+# exactly one space, as in "- " or "class ", or for at least one. A token is a word, a term in double quotes or a
+# symbol, and the end of the document is a token with none of them. Words are maximal, as every \w+ of the
+# grammar starts where no word character precedes it; "o--" is the word "o" and "--" for that reason. A term in
+# double quotes fails like the grammar does anywhere but at a cardinality.
+TOKENS: re.Pattern = re.compile(
+    r'(\s*)(?:(\w+)|("[^"]+")|(<\|--|\*--|--|\{abstract}|\{static}|<<Constructor>>|@startuml|@enduml|.|\Z))',
+    re.DOTALL)
+
+ACCESS = {'-': Access.private, '+': Access.public, '#': Access.protected, '~': Access.packagePrivate}
+MODIFIERS = {'{abstract}': NonAccessModifier.ABSTRACT, '{static}': NonAccessModifier.STATIC}
+ARROWS = {'<|--': DependencyType.EXTENSION, '*--': DependencyType.COMPOSITION}
+KEYWORDS = ('class', 'abstract', 'enum', 'interface')
+
+Step = Optional[Tuple[object, int]]
+
+
+class DeferToGrammar(Exception):
+    """The document does not parse as far as the hand-written parser can tell; plant_uml_parser decides."""
+
+
+class FastPlantUmlParser:
+    """A recursive-descent parser over the tokens of a document, giving the model of plant_uml_parser.
+
+    Every method takes a token index and returns (value, next_index), or None on failure. They follow the
+    combinators of PlantUmlParser, including the order in which alternatives are tried, so the SemanticModelBuilder
+    actions run on the same values as in parsy. Where parsy would go on to fail the whole document, e.g. on a class
+    body that does not close, they raise DeferToGrammar, and the document is parsed by parsy for its ParseError.
+    """
+
+    def __init__(self, text: str):
+        # One pass of the lexer; the end of the document is repeated, so that lookahead past it finds it again.
+        tokens = TOKENS.findall(text) + [('', '', '', '')] * 3
+        self.spaces, self.words, self.quoted, self.symbols = zip(*tokens)
+
+    @staticmethod
+    def parse(plant_uml: str) -> PlantUml:
+        try:
+            return FastPlantUmlParser(plant_uml).document()
+        except DeferToGrammar:
+            # Syntax errors are rare; let parsy produce its exact error message.
+            return PlantUmlParser.plant_uml_parser.parse(plant_uml)
+
+    def document(self) -> PlantUml:
+        symbols = self.symbols
+        if symbols[0] != '@startuml':
+            raise DeferToGrammar()
+        concepts = []
+        index = 1
+        while symbols[index] != '@enduml':
+            concept, index = self.concept(index)
+            concepts.append(concept)
+        if not self.at_end(index + 1):
+            raise DeferToGrammar()
+        return SemanticModelBuilder.create_plant_uml(concepts)
+
+    def at_end(self, index: int) -> bool:
+        return not (self.words[index] or self.quoted[index] or self.symbols[index])
+
+    def concept(self, index: int) -> Tuple[object, int]:
+        word = self.words[index]
+        step = None
+        if word in KEYWORDS and self.keyword(index + 1):
+            if word == 'class':
+                step = self.class_concept(index + 1)
+            elif word == 'enum':
+                step = self.enum(index + 1)
+            elif word == 'interface':
+                step = self.interface(index + 1)
+            elif self.words[index + 1] == 'class' and self.keyword(index + 2):
+                step = self.abstract_class(index + 2)
+        # A dependency starts with a name, which may well be "class" or "enum", so it is tried on every concept.
+        if step is None:
+            step = self.dependency(index)
+        if step is None:
+            raise DeferToGrammar()
+        return step
+
+    def keyword(self, index: int) -> bool:
+        # A keyword such as 'class ' is followed by exactly one space, and a name right after it.
+        return self.spaces[index] == ' ' and bool(self.words[index])
+
+    def class_concept(self, index: int) -> Step:
+        body, end = self.body(index + 1, True)
+        return SemanticModelBuilder.create_class(self.words[index], body), end
+
+    def abstract_class(self, index: int) -> Step:
+        clazz, index = self.class_concept(index)
+        return Entity(clazz.name, clazz.fields, clazz.methods, clazz.constructors, True, False), index
+
+    def interface(self, index: int) -> Step:
+        body, end = self.body(index + 1, False)
+        return SemanticModelBuilder.create_interface(self.words[index], body), end
+
+    def body(self, index: int, constructors: bool) -> Tuple[Optional[List], int]:
+        # Whatever follows an opening brace has to be members and a closing brace. If it is not, parsy leaves the
+        # body out, and the next concept starts with a brace, which no concept does.
+        symbols = self.symbols
+        if symbols[index] != '{':
+            return None, index
+        members = []
+        index += 1
+        while symbols[index] != '}':
+            step = self.member(index, constructors)
+            if step is None:
+                raise DeferToGrammar()
+            member, index = step
+            members.append(member)
+        return members, index + 1
+
+    def member(self, index: int, constructors: bool) -> Step:
+        spaces, words, symbols = self.spaces, self.words, self.symbols
+        access = ACCESS.get(symbols[index])
+        index += 1
+        if access is None or spaces[index] != ' ':
+            return None
+        modifier = MODIFIERS.get(symbols[index])
+        if modifier is not None:
+            # Only fields and methods take a modifier.
+            constructors = False
+            index += 1
+            if spaces[index] != ' ':
+                return None
+        name = words[index]
+        if not name:
+            return None
+        index += 1
+        step = self.field_rest(index, access, name, modifier)
+        if step is None:
+            step = self.method_rest(index, access, name, modifier)
+        if step is None and constructors:
+            step = self.constructor_rest(index, access)
+        return step
+
+    def field_rest(self, index: int, access: Access, name: str, modifier: Optional[NonAccessModifier]) -> Step:
+        if self.symbols[index] != ':' or not self.words[index + 1]:
+            return None
+        return SemanticModelBuilder.create_field(access, name, self.words[index + 1], modifier), index + 2
+
+    def method_rest(self, index: int, access: Access, name: str, modifier: Optional[NonAccessModifier]) -> Step:
+        spaces, symbols = self.spaces, self.symbols
+        if spaces[index] or symbols[index] != '(':
+            return None
+        parameters, index = self.parameters(index + 1, False)
+        if spaces[index] or symbols[index] != ')' or spaces[index + 1] or symbols[index + 1] != ':' \
+                or spaces[index + 2] != ' ' or not self.words[index + 2]:
+            return None
+        return SemanticModelBuilder.create_method(access, name, self.words[index + 2], parameters, modifier), \
+            index + 3
+
+    def constructor_rest(self, index: int, access: Access) -> Step:
+        spaces, symbols = self.spaces, self.symbols
+        if spaces[index] or symbols[index] != '(':
+            return None
+        parameters, index = self.parameters(index + 1, True)
+        # Only the opening bracket is followed by optional whitespace, so with parameters there is none before ")".
+        if (parameters and spaces[index]) or symbols[index] != ')' or symbols[index + 1] != '<<Constructor>>':
+            return None
+        return SemanticModelBuilder.create_constructor(access, parameters), index + 2
+
+    def parameters(self, index: int, spaced: bool) -> Tuple[List, int]:
+        # spaced: whether the first parameter may follow the opening bracket after whitespace.
+        spaces, symbols = self.spaces, self.symbols
+        parameters = []
+        step = self.parameter(index) if spaced or not spaces[index] else None
+        while step is not None:
+            parameter, index = step
+            parameters.append(parameter)
+            step = self.parameter(index + 1) if not spaces[index] and symbols[index] == ',' else None
+        return parameters, index
+
+    def parameter(self, index: int) -> Step:
+        words = self.words
+        if not words[index] or self.symbols[index + 1] != ':' or not words[index + 2]:
+            return None
+        return SemanticModelBuilder.create_parameter(words[index], words[index + 2]), index + 3
+
+    def enum(self, index: int) -> Step:
+        words, symbols = self.words, self.symbols
+        name = words[index]
+        index += 1
+        values = None
+        if symbols[index] == '{':
+            values = []
+            index += 1
+            while symbols[index] != '}':
+                if not words[index]:
+                    raise DeferToGrammar()
+                values.append(words[index])
+                index += 1
+            index += 1
+        return SemanticModelBuilder.create_enum(name, values), index
+
+    def dependency(self, index: int) -> Step:
+        spaces, words, symbols = self.spaces, self.words, self.symbols
+        name = words[index]
+        if not name or not spaces[index + 1]:
+            return None
+        cardinality, index = self.cardinality(index + 1)
+        dependency_from = SemanticModelBuilder.create_dependency_from(name, cardinality)
+
+        dependency_type = ARROWS.get(symbols[index])
+        if words[index] == 'o' and symbols[index + 1] == '--' and not spaces[index + 1]:
+            dependency_type = DependencyType.AGGREGATION
+            index += 1
+        if dependency_type is None:
+            return None
+
+        cardinality, index = self.cardinality(index + 1)
+        if not words[index]:
+            return None
+        dependency_to = SemanticModelBuilder.create_dependency_from(words[index], cardinality)
+        index += 1
+
+        label = None
+        if symbols[index] == ':':
+            label, index = self.label(index + 1)
+        return SemanticModelBuilder.create_dependency(dependency_from, dependency_to, dependency_type, label), index
+
+    def cardinality(self, index: int) -> Tuple[Optional[str], int]:
+        # A term in double quotes and the whitespace after it, which has to be there.
+        if self.quoted[index] and self.spaces[index + 1]:
+            return self.quoted[index][1:-1], index + 1
+        return None, index
+
+    def label(self, index: int) -> Tuple[str, int]:
+        # The rest of the line after the whitespace that follows the colon, made up again from the tokens on it.
+        spaces = self.spaces
+        if self.at_end(index):
+            return '', index
+        parts = []
+        while True:
+            token = self.words[index] or self.quoted[index] or self.symbols[index]
+            if '\n' in token:
+                # A term in double quotes lexed across the end of the line; the tokens after it are not known.
+                raise DeferToGrammar()
+            parts.append(token)
+            index += 1
+            line_end = spaces[index].find('\n')
+            if line_end >= 0 or self.at_end(index):
+                parts.append(spaces[index] if line_end < 0 else spaces[index][:line_end])
+                return ''.join(parts), index
+            parts.append(spaces[index])
+
+
+def parse_plant_uml(plant_uml: str, backend: str = 'tokens') -> PlantUml:
+    """Parses a PlantUML document with the hand-written parser ('tokens') or the parsy grammar ('parsy').
+
+    Both give the same model and raise the same ParseError.
+    """
+    if backend == 'tokens':
+        return FastPlantUmlParser.parse(plant_uml)
+    if backend == 'parsy':
+        return PlantUmlParser.plant_uml_parser.parse(plant_uml)
+    raise ValueError("backend must be one of {0}, got {1!r}".format(PARSER_BACKENDS, backend))
@@ -0,0 +1,125 @@
+import glob
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from casestudytwo.python.FastPlantUmlParser import PARSER_BACKENDS, parse_plant_uml
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from casestudytwo.python.SemanticModel import PlantUml
+
+PLANT_UML_SUFFIX = '.puml'
+
+
+def _init_worker(backend: str):
+    # Builds the grammar once per worker rather than on the first file of every chunk; the hand-written parser
+    # only needs it for the error message of a file that does not parse.
+    if backend == 'parsy':
+        PlantUmlParser.parsers()
+
+
+def _parse_chunk(paths: List[str], encoding: str, backend: str) -> List['FileResult']:
+    return [parse_file(path, encoding, backend) for path in paths]
+
+
+class FileResult(NamedTuple):
+    path: str
+    plant_uml: Optional[PlantUml] = None
+    # The type and message of the exception parsing failed with, such as 'ParseError: expected ... at 3:0'.
+    # Only the message is kept, as a ParseError holds the whole text of the file.
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def parse_file(path: str, encoding: str = 'utf-8', backend: str = 'tokens') -> FileResult:
+    try:
+        with open(path, encoding=encoding) as file:
+            text = file.read()
+        return FileResult(path, parse_plant_uml(text, backend))
+    except Exception as error:
+        # Whatever goes wrong with one file is that file's result, so the rest of the batch is still parsed.
+        return FileResult(path, error='{0}: {1}'.format(type(error).__name__, error))
+
+
+def find_files(target: str) -> List[str]:
+    """The .puml files below a directory, or the files a glob pattern matches, sorted by path."""
+    if os.path.isdir(target):
+        paths = glob.glob(os.path.join(glob.escape(target), '**', '*' + PLANT_UML_SUFFIX), recursive=True)
+    else:
+        paths = glob.glob(target, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+class BatchStats:
+    def __init__(self):
+        self.files = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self):
+        return "{0} files, {1} errors in {2:.3f}s ({3:,.0f} files/sec)".format(
+            self.files, self.errors, self.seconds, self.files_per_second)
+
+
+class BatchParser:
+    def __init__(self, processes: Optional[int] = None, chunk_size: int = 16,
+                 max_pending_chunks: Optional[int] = None, encoding: str = 'utf-8', backend: str = 'tokens'):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1, got {0}".format(chunk_size))
+        if backend not in PARSER_BACKENDS:
+            raise ValueError("backend must be one of {0}, got {1!r}".format(PARSER_BACKENDS, backend))
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+        self.encoding = encoding
+        self.backend = backend
+        self.stats = BatchStats()
+
+    def parse_tree(self, target: str) -> Iterator[FileResult]:
+        return self.parse_paths(find_files(target))
+
+    def parse_paths(self, paths: Iterable[str]) -> Iterator[FileResult]:
+        """Yields a FileResult per path, in the order of paths, with the files parsed in worker processes."""
+        self.stats = BatchStats()
+        started = time.perf_counter()
+        try:
+            for results in self._parse_chunks(paths):
+                for result in results:
+                    self.stats.files += 1
+                    self.stats.errors += not result.ok
+                    yield result
+        finally:
+            self.stats.seconds = time.perf_counter() - started
+
+    def _parse_chunks(self, paths: Iterable[str]) -> Iterator[List[FileResult]]:
+        chunks = BatchParser._chunked(paths, self.chunk_size)
+        if self.processes is not None and self.processes <= 1:
+            for chunk in chunks:
+                yield _parse_chunk(chunk, self.encoding, self.backend)
+            return
+
+        workers = self.processes or os.cpu_count() or 1
+        max_pending = self.max_pending_chunks or 2 * workers
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.backend,)) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_parse_chunk, chunk, self.encoding, self.backend))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    @staticmethod
+    def _chunked(paths: Iterable[str], size: int) -> Iterator[List[str]]:
+        iterator = iter(paths)
+        while chunk := list(islice(iterator, size)):
+            yield chunk
@@ -0,0 +1,127 @@
+import sys
+from typing import List, NamedTuple, Tuple
+
+from parsy import Result, eof
+
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from casestudytwo.python.SemanticModel import PlantUml
+from casestudytwo.python.SemanticModelBuilder import PlantUmlSink
+
+# The horizon of a concept that may have read to the end of the text, wherever that is after an edit.
+UNBOUNDED = sys.maxsize
+
+
+class ConceptSpan(NamedTuple):
+    # start is the end of the previous concept, whose trailing whitespace is part of it, so the spans tile the
+    # body. Parsing the concept reads nothing at or after horizon.
+    start: int
+    end: int
+    horizon: int
+    concept: object
+
+    def shifted(self, delta: int) -> 'ConceptSpan':
+        return ConceptSpan(self.start + delta, self.end + delta, self.horizon + delta, self.concept)
+
+
+class PlantUmlSession:
+    """A PlantUML document in an editor, re-parsed after every edit only where the edit can change its concepts.
+
+    Concepts whose horizon lies before the edit are kept. From the first affected concept on, concepts are parsed
+    again until one ends exactly where an old concept after the edit started; the concepts from there on are
+    reused, shifted by the length change. Kept and reused concepts are the very same Entity, Enumeration and
+    Dependency objects, and the lists of plant_uml are updated in place.
+
+    The model is the one a full parse gives. Texts that do not parse are handed to a full parse, so errors are
+    raised exactly as plant_uml_parser raises them, and the session stays at the text before the edit.
+    """
+
+    def __init__(self, text: str):
+        self.text = ''
+        self.spans: Tuple[ConceptSpan, ...] = ()
+        self.body_start = 0
+        self.start_horizon = UNBOUNDED
+        self.plant_uml = PlantUml([], [], [], [], [])
+        self.reparsed = 0
+        self.build(text, [], (), True)
+
+    def edit(self, start: int, end: int, replacement: str) -> PlantUml:
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError("edit range {0}..{1} is outside the text of length {2}".format(
+                start, end, len(self.text)))
+        text = self.text[:start] + replacement + self.text[end:]
+        delta = len(replacement) - (end - start)
+
+        kept: List[ConceptSpan] = []
+        if start >= self.start_horizon:
+            for span in self.spans:
+                if span.horizon > start:
+                    break
+                kept.append(span)
+        # Only concepts whose whole span, including the whitespace in front of them, comes after the edit.
+        reusable = tuple(span.shifted(delta) for span in self.spans[len(kept):] if span.start >= end)
+        self.build(text, kept, reusable, start < self.start_horizon)
+        return self.plant_uml
+
+    def build(self, text: str, spans: List[ConceptSpan], reusable: Tuple[ConceptSpan, ...], parse_start: bool):
+        from_scratch = parse_start and not spans and not reusable
+        body_start, start_horizon = self.body_start, self.start_horizon
+        if parse_start:
+            result = PlantUmlParser.start_uml_parser(text, 0)
+            if not result.status:
+                return self.full_build(text, from_scratch)
+            body_start, start_horizon = result.index, PlantUmlSession.horizon(text, 0, result)
+
+        reparsed = 0
+        index = spans[-1].end if spans else body_start
+        reusable_by_start = {span.start: position for position, span in enumerate(reusable)}
+        while True:
+            position = reusable_by_start.get(index)
+            if position is not None:
+                spans.extend(reusable[position:])
+                index = spans[-1].end
+                break
+            result = PlantUmlParser.concept_parser(text, index)
+            if not result.status:
+                break
+            spans.append(ConceptSpan(index, result.index, PlantUmlSession.horizon(text, index, result), result.value))
+            reparsed += 1
+            index = result.index
+        if not (PlantUmlParser.end_uml_parser << eof)(text, index).status:
+            return self.full_build(text, from_scratch)
+
+        self.text, self.spans, self.reparsed = text, tuple(spans), reparsed
+        self.body_start, self.start_horizon = body_start, start_horizon
+        sink = PlantUmlSink()
+        for span in spans:
+            sink.add(span.concept)
+        self.assign(sink)
+
+    def full_build(self, text: str, from_scratch: bool):
+        # The full parse raises the error of a text that does not parse. A text that does parse is parsed again
+        # without the old concepts; should that fail as well, the session keeps no spans, so that the next edit
+        # parses the whole text again, too.
+        plant_uml = PlantUmlParser.plant_uml_parser.parse(text)
+        if not from_scratch:
+            return self.build(text, [], (), True)
+        self.text, self.spans, self.body_start, self.start_horizon = text, (), 0, UNBOUNDED
+        self.reparsed = sum(map(len, (plant_uml.classes, plant_uml.abstract_classes, plant_uml.enums,
+                                      plant_uml.interfaces, plant_uml.dependencies)))
+        self.assign(plant_uml)
+
+    def assign(self, model):
+        # model is a PlantUml or a PlantUmlSink; the lists of plant_uml are updated in place.
+        self.plant_uml.classes[:] = model.classes
+        self.plant_uml.abstract_classes[:] = model.abstract_classes
+        self.plant_uml.enums[:] = model.enums
+        self.plant_uml.interfaces[:] = model.interfaces
+        self.plant_uml.dependencies[:] = model.dependencies
+
+    @staticmethod
+    def horizon(text: str, start: int, result: Result) -> int:
+        # As in PlantUmlStream: every token but a term in double quotes ends at a line end or at the first
+        # character that does not fit, so nothing after the line of the furthest position was read, unless a
+        # double quote is left open.
+        newline = text.find('\n', max(result.index, result.furthest))
+        if newline < 0 or text.count('"', start, newline) % 2:
+            return UNBOUNDED
+        return newline + 1
@@ -0,0 +1,112 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from parsy import eof
+
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from casestudytwo.python.SemanticModel import PlantUml
+from casestudytwo.python.SemanticModelBuilder import SemanticModelBuilder
+
+# Braces, double quotes and the first character of every line that starts with a word. Outside of braces and
+# quotes, such a line starts a class, an abstract class, an enum, an interface or a dependency.
+_TOKENS = re.compile(r'[{}"]|^[^\S\n]*(?=\w)', re.MULTILINE)
+
+_worker_text = ''
+
+
+def _init_worker(text: str):
+    global _worker_text
+    _worker_text = text
+    PlantUmlParser.parsers()
+
+
+def _parse_chunk(chunk: 'ConceptChunk') -> Tuple[list, int]:
+    return parse_chunk(_worker_text, chunk)
+
+
+class ConceptChunk(NamedTuple):
+    # Source offsets of the first concept and of the first concept of the next chunk; the last chunk has no stop
+    # and runs up to the first position no concept starts at, as concept_parser.many() does.
+    start: int
+    stop: Optional[int]
+
+
+def concept_starts(text: str, start: int = 0) -> Iterator[int]:
+    """The offsets of the lines from start on that look like the start of a top-level concept.
+
+    This is a guess from brace balance and line starts only; parse_chunk() tells whether it was right.
+    """
+    depth = 0
+    quoted = False
+    for match in _TOKENS.finditer(text, start):
+        token = match.group()
+        if token == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+        elif depth == 0:
+            yield match.end()
+
+
+def split_concepts(text: str, start: int, chunk_size: int) -> List[ConceptChunk]:
+    """Splits the concepts from start on into chunks of at least chunk_size characters, cut at concept starts."""
+    chunks = []
+    chunk_start = start
+    for offset in concept_starts(text, start):
+        if offset - chunk_start >= chunk_size:
+            chunks.append(ConceptChunk(chunk_start, offset))
+            chunk_start = offset
+    chunks.append(ConceptChunk(chunk_start, None))
+    return chunks
+
+
+def parse_chunk(text: str, chunk: ConceptChunk) -> Tuple[list, int]:
+    """Parses the concepts of a chunk in the whole text, so that every concept is parsed as in a parse of it all.
+
+    Returns the concepts and the offset after the last one, which is chunk.stop only if the chunk was cut where a
+    concept of the whole parse starts.
+    """
+    concepts = []
+    index = chunk.start
+    while chunk.stop is None or index < chunk.stop:
+        result = PlantUmlParser.concept_parser(text, index)
+        if not result.status:
+            break
+        concepts.append(result.value)
+        index = result.index
+    return concepts, index
+
+
+def parse_parallel(text: str, processes: Optional[int] = None, chunk_size: int = 1 << 20) -> PlantUml:
+    """Parses a PlantUML document as plant_uml_parser does, with its concepts split into chunks parsed in parallel.
+
+    If a chunk does not end where the next one starts, the splitter cut inside a concept, and if the document
+    does not end in @enduml after the last one, it has a syntax error. Either way the document is parsed again
+    as a whole, which returns the right model or raises the same ParseError.
+    """
+    start = PlantUmlParser.start_uml_parser(text, 0)
+    if not start.status:
+        return PlantUmlParser.plant_uml_parser.parse(text)
+    chunks = split_concepts(text, start.index, chunk_size)
+
+    if len(chunks) == 1 or (processes is not None and processes <= 1):
+        results = [parse_chunk(text, chunk) for chunk in chunks]
+    else:
+        workers = min(processes or os.cpu_count() or 1, len(chunks))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(text,)) as executor:
+            results = list(executor.map(_parse_chunk, chunks))
+
+    concepts = []
+    for chunk, (chunk_concepts, index) in zip(chunks, results):
+        if chunk.stop is not None and index != chunk.stop:
+            return PlantUmlParser.plant_uml_parser.parse(text)
+        concepts.extend(chunk_concepts)
+    if not (PlantUmlParser.end_uml_parser << eof)(text, index).status:
+        return PlantUmlParser.plant_uml_parser.parse(text)
+    return SemanticModelBuilder.create_plant_uml(concepts)
@@ -0,0 +1,145 @@
+from typing import Iterable, Iterator, Optional, Union
+
+from parsy import ParseError, Result, eof, line_info_at
+
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from casestudytwo.python.SemanticModel import PlantUml
+from casestudytwo.python.SemanticModelBuilder import PlantUmlSink
+
+# The document is read chunk by chunk and every concept is parsed on its own as soon as the input read so far
+# decides it. A result is decided once the input holds a complete line at or after the furthest position the
+# parser stopped or failed at, as every token but a term in double quotes ends at a line end or at the first
+# character that does not fit. A term may span lines, so there must not be an unclosed double quote either.
+
+Source = Union[str, Iterable[str]]
+READ_SIZE = 4096
+
+
+class StreamParseError(ParseError):
+    """A ParseError at a position of the whole stream, of which only the part from line_offset on is kept."""
+
+    def __init__(self, expected, stream: str, index: int, line_offset: int, column_offset: int):
+        super().__init__(expected, stream, index)
+        self.line_offset = line_offset
+        self.column_offset = column_offset
+
+    def line_info(self) -> str:
+        line, column = line_info_at(self.stream, self.index)
+        return '{0}:{1}'.format(line + self.line_offset, column + self.column_offset if line == 0 else column)
+
+
+class ConceptReader:
+    def __init__(self, source: Source):
+        # A str is already in memory as a whole, so there is nothing to wait for.
+        self.chunks = iter(() if isinstance(source, str) else source)
+        self.buffer = source if isinstance(source, str) else ''
+        self.exhausted = isinstance(source, str)
+        # The concepts before start are parsed; offset is the position of buffer[0] in the stream.
+        self.start = 0
+        self.offset = 0
+        self.line_offset = 0
+        self.column_offset = 0
+        # Double quotes in buffer[start:].
+        self.quotes = 0
+        # The furthest failure of everything parsed so far, in stream positions, as parsy's many() keeps it.
+        self.carried: Optional[Result] = None
+
+    def read(self, wanted: Optional[int] = None) -> bool:
+        # By default at least as much as is still unparsed is read, so a long concept is parsed a logarithmic number
+        # of times.
+        if wanted is None:
+            wanted = max(len(self.buffer) - self.start, READ_SIZE)
+        chunks = []
+        while wanted > 0:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.exhausted = True
+                break
+            chunks.append(chunk)
+            wanted -= len(chunk)
+        if not chunks:
+            return False
+        if self.start:
+            self.drop_parsed()
+        read = ''.join(chunks)
+        self.quotes += read.count('"')
+        self.buffer += read
+        return True
+
+    def drop_parsed(self):
+        parsed = self.buffer[:self.start]
+        lines = parsed.count('\n')
+        self.line_offset += lines
+        self.column_offset = len(parsed) - parsed.rfind('\n') - 1 if lines else self.column_offset + len(parsed)
+        self.offset += self.start
+        self.buffer = self.buffer[self.start:]
+        self.start = 0
+
+    def decided(self, result: Result) -> bool:
+        if self.exhausted:
+            return True
+        return self.quotes % 2 == 0 and self.buffer.find('\n', max(result.index, result.furthest)) >= 0
+
+    def end_decided(self, result: Result) -> bool:
+        # The end of the document reads no further than seven characters, '@enduml', past where it stopped or failed.
+        return self.exhausted or len(self.buffer) > max(result.index, result.furthest) + len('@enduml')
+
+    def parse(self, parser) -> Result:
+        # Tries again with more input for as long as the input read so far does not decide the result.
+        while True:
+            result = parser(self.buffer, self.start)
+            if self.decided(result) or not self.read():
+                return result
+
+    def accept(self, result: Result):
+        self.carry(result)
+        self.quotes -= self.buffer.count('"', self.start, result.index)
+        self.start = result.index
+
+    def carry(self, result: Result):
+        if result.furthest >= 0:
+            moved = Result(False, -1, None, result.furthest + self.offset, result.expected)
+            self.carried = moved.aggregate(self.carried)
+
+    def error(self, result: Result) -> StreamParseError:
+        self.carry(result)
+        return StreamParseError(self.carried.expected, self.buffer, self.carried.furthest - self.offset,
+                                self.line_offset, self.column_offset)
+
+
+def iter_concepts(source: Source, sink: Optional[PlantUmlSink] = None) -> Iterator:
+    """Yields the Entity, Enumeration and Dependency concepts of a PlantUML document one at a time.
+
+    source is a str, a text file or any iterable of str chunks. The concepts are the ones plant_uml_parser finds,
+    in document order; a syntax error raises the same ParseError once the concepts before it were yielded. If a
+    sink is given, every concept is added to it as well.
+    """
+    reader = ConceptReader(source)
+    result = reader.parse(PlantUmlParser.start_uml_parser)
+    if not result.status:
+        raise reader.error(result)
+    reader.accept(result)
+    while True:
+        result = reader.parse(PlantUmlParser.concept_parser)
+        if not result.status:
+            break
+        reader.accept(result)
+        if sink is not None:
+            sink.add(result.value)
+        yield result.value
+    # No concept starts here, so the rest of the stream has to be the end of the document. It is read a chunk at a
+    # time, up to the first character that is not whitespace after '@enduml', which is an error, or to its end.
+    reader.carry(result)
+    end_parser = PlantUmlParser.end_uml_parser << eof
+    result = end_parser(reader.buffer, reader.start)
+    while not reader.end_decided(result) and reader.read(READ_SIZE):
+        result = end_parser(reader.buffer, reader.start)
+    if not result.status:
+        raise reader.error(result)
+
+
+def parse_stream(source: Source) -> PlantUml:
+    sink = PlantUmlSink()
+    for _ in iter_concepts(source, sink):
+        pass
+    return sink.model
@@ -54,25 +54,10 @@ class SemanticModelBuilder:
     @staticmethod
     def map_concept_to_type(concepts: List) -> Tuple[
         List[Entity], List[Entity], List[Enumeration], List[Entity], List[Dependency]]:
-
-        classes: list[Entity] = []
-        abstract_classes: list[Entity] = []
-        interfaces: list[Entity] = []
-        enums: list[Enumeration] = []
-        dependencies: list[Dependency] = []
-
+        sink = PlantUmlSink()
         for obj in concepts:
-            if isinstance(obj, Entity) and obj.is_interface:
-                interfaces.append(obj)
-            elif isinstance(obj, Entity) and obj.is_abstract:
-                abstract_classes.append(obj)
-            elif isinstance(obj, Entity):
-                classes.append(obj)
-            elif isinstance(obj, Enumeration):
-                enums.append(obj)
-            elif isinstance(obj, Dependency):
-                dependencies.append(obj)
-        return classes, abstract_classes, enums, interfaces, dependencies
+            sink.add(obj)
+        return sink.classes, sink.abstract_classes, sink.enums, sink.interfaces, sink.dependencies
 
     @staticmethod
     def create_enum(class_name, enum_values):
@@ -92,3 +77,30 @@ class SemanticModelBuilder:
     @staticmethod
     def create_dependency_from(name, cardinality) -> DependencyConcept:
         return DependencyConcept(name, cardinality)
+
+
+class PlantUmlSink:
+    """Sorts concepts into the lists of a PlantUml model as they are added."""
+
+    def __init__(self):
+        self.classes: List[Entity] = []
+        self.abstract_classes: List[Entity] = []
+        self.enums: List[Enumeration] = []
+        self.interfaces: List[Entity] = []
+        self.dependencies: List[Dependency] = []
+
+    def add(self, obj):
+        if isinstance(obj, Entity) and obj.is_interface:
+            self.interfaces.append(obj)
+        elif isinstance(obj, Entity) and obj.is_abstract:
+            self.abstract_classes.append(obj)
+        elif isinstance(obj, Entity):
+            self.classes.append(obj)
+        elif isinstance(obj, Enumeration):
+            self.enums.append(obj)
+        elif isinstance(obj, Dependency):
+            self.dependencies.append(obj)
+
+    @property
+    def model(self) -> PlantUml:
+        return PlantUml(self.classes, self.abstract_classes, self.enums, self.interfaces, self.dependencies)
@@ -0,0 +1,107 @@
+import ast
+import os
+import random
+import unittest
+from enum import Enum
+
+from casestudytwo.benchmark.PlantUmlGenerator import DiagramShape, PlantUmlGenerator
+from casestudytwo.python.FastPlantUmlParser import FastPlantUmlParser, parse_plant_uml
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+
+FRAGMENTS = ['class ', 'abstract ', 'enum ', 'interface ', 'A', 'o', '\n', ' ', '  ', '\t', '{', '}', '"', '"1"',
+             ':', ': int', '- ', '+ ', '{static} ', '{abstract}', '(', ')', '): void', ',', ' ,', '<<Constructor>>',
+             ' *-- ', ' o-- ', 'o--', ' <|-- ', ' : label', '@enduml', 'x']
+
+
+def collect_plant_uml_dsl_test_cases() -> list:
+    path = os.path.join(os.path.dirname(__file__), 'PlantUmlDslTest.py')
+    with open(path, encoding='utf-8') as source:
+        tree = ast.parse(source.read())
+    return [node.value.value for node in ast.walk(tree)
+            if isinstance(node, ast.Assign)
+            and any(isinstance(target, ast.Name) and target.id == 'plant_uml' for target in node.targets)
+            and isinstance(node.value, ast.Constant)]
+
+
+def data(model):
+    # The model classes do not compare by value, so they are compared as nested lists and dicts.
+    if isinstance(model, list):
+        return [data(item) for item in model]
+    if model is None or isinstance(model, (Enum, str, int, bool)):
+        return model
+    return type(model).__name__, {key: data(value) for key, value in vars(model).items()}
+
+
+class FastPlantUmlParserTest(unittest.TestCase):
+    def assert_same_outcome(self, plant_uml: str):
+        try:
+            expected = PlantUmlParser.plant_uml_parser.parse(plant_uml)
+        except Exception as error:
+            with self.assertRaises(type(error)) as context:
+                FastPlantUmlParser.parse(plant_uml)
+            self.assertEqual(str(error), str(context.exception))
+            return
+        self.assertEqual(data(expected), data(FastPlantUmlParser.parse(plant_uml)))
+
+    def test_parity_with_plant_uml_dsl_test_cases(self):
+        cases = collect_plant_uml_dsl_test_cases()
+        self.assertGreater(len(cases), 10)
+        for plant_uml in cases:
+            with self.subTest(plant_uml=plant_uml):
+                self.assert_same_outcome(plant_uml)
+
+    def test_parity_with_generated_diagrams(self):
+        for seed in range(20):
+            shape = DiagramShape(abstract_classes=0.2, interfaces=0.2, members=seed % 8, parameters=seed % 3)
+            plant_uml = PlantUmlGenerator(shape, seed=seed).text(30)
+            with self.subTest(seed=seed):
+                self.assert_same_outcome(plant_uml)
+
+    def test_parity_with_mutated_diagrams(self):
+        # GIVEN generated diagrams with a few fragments of the grammar inserted or written over
+        generator = random.Random(20231018)
+        for seed in range(100):
+            plant_uml = PlantUmlGenerator(DiagramShape(members=5), seed=seed).text(8)
+            for _ in range(10):
+                mutated = plant_uml
+                for _ in range(generator.randint(1, 3)):
+                    start = generator.randrange(len(mutated))
+                    end = min(len(mutated), start + generator.choice([0, 0, 1, 2, 4]))
+                    replacement = ''.join(generator.choice(FRAGMENTS) for _ in range(generator.randint(0, 2)))
+                    mutated = mutated[:start] + replacement + mutated[end:]
+
+                # WHEN / THEN
+                with self.subTest(plant_uml=mutated):
+                    self.assert_same_outcome(mutated)
+
+    def test_parity_for_edge_cases(self):
+        for plant_uml in ['', '@startuml', '@startuml\n@enduml', '@startuml@enduml', ' @startuml\n@enduml\n\n',
+                          '@startuml\nclass  A\n@enduml', '@startuml\nclass A{\n}\n@enduml',
+                          '@startuml\nclass A {\n- x:int\n}\n@enduml', '@startuml\nclass A {\n-  x: int\n}\n@enduml',
+                          '@startuml\nclass A {\n+ f( a: int): int\n}\n@enduml',
+                          '@startuml\nclass A {\n+ ( a: int)<<Constructor>>\n}\n@enduml',
+                          '@startuml\nclass A {\n+ (a: int )<<Constructor>>\n}\n@enduml',
+                          '@startuml\nclass enum\nenum *-- class\n@enduml', '@startuml\nA o-- B\n@enduml',
+                          '@startuml\nA o --B\n@enduml', '@startuml\nA "1"*-- B\n@enduml',
+                          '@startuml\nA *-- B :\n\n  C *-- D\n@enduml', '@startuml\nA *-- B : a "b" c\n@enduml',
+                          '@startuml\nA *-- B : a "b\nc" d\n@enduml', '@startuml\nA *-- B :@enduml',
+                          '@startuml\nenum E {\nA B\n}\n@enduml', '@startuml\nenum E {\n}\n@enduml']:
+            with self.subTest(plant_uml=plant_uml):
+                self.assert_same_outcome(plant_uml)
+
+    def test_backend_switch(self):
+        # GIVEN
+        plant_uml = PlantUmlGenerator().text(10)
+
+        # WHEN
+        results = [data(parse_plant_uml(plant_uml, backend)) for backend in ('tokens', 'parsy')]
+
+        # THEN
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], data(parse_plant_uml(plant_uml)))
+        with self.assertRaisesRegex(ValueError, "backend must be one of"):
+            parse_plant_uml(plant_uml, 'lark')
+
+
+if __name__ == '__main__':
+    unittest.main()
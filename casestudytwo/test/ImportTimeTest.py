@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Cumulative import time of the parser module in microseconds, as python -X importtime reports it. Building the
+# grammar and importing parsy at import time took about 50 ms on the machine this budget was set on.
+IMPORT_BUDGET_MICROSECONDS = int(os.environ.get('PLANT_UML_IMPORT_BUDGET_US', 40_000))
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def import_time(module: str) -> int:
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split('|')
+        if name.strip() == module:
+            return int(cumulative)
+    raise AssertionError('no import time reported for {0}:\n{1}'.format(module, result.stderr))
+
+
+def imports_parsy(module: str) -> bool:
+    result = subprocess.run([sys.executable, '-c', 'import sys, {0}; print("parsy" in sys.modules)'.format(module)],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.strip() == 'True'
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_plant_uml_parser_import_is_within_budget(self):
+        # The best of three runs, so that a busy machine does not fail the test.
+        best = min(import_time('casestudytwo.python.PlantUmlParser') for _ in range(3))
+        self.assertLessEqual(best, IMPORT_BUDGET_MICROSECONDS)
+
+    def test_grammars_are_not_built_at_import(self):
+        self.assertFalse(imports_parsy('casestudytwo.python.PlantUmlParser'))
+        self.assertFalse(imports_parsy('casestudyone.python.RegexParser'))
+        self.assertFalse(imports_parsy('casestudyone.python.DslCompiler'))
+        self.assertFalse(imports_parsy('casestudyone.python.Cli'))
+
+    def test_grammars_are_built_on_first_use(self):
+        from casestudyone.python.RegexParser import RegexParser
+        from casestudytwo.python.PlantUmlParser import PlantUmlParser
+        self.assertEqual('^(a)', RegexParser.regex_parser.parse('starts with "a"'))
+        self.assertIs(PlantUmlParser.field_parser, PlantUmlParser.field_parser)
+        with self.assertRaises(AttributeError):
+            PlantUmlParser.no_such_parser
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from casestudytwo.benchmark.PlantUmlGenerator import PlantUmlGenerator
+from casestudytwo.python.PlantUmlBatch import BatchParser, _init_worker, find_files, parse_file
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from casestudytwo.python.PythonToPlantUml import PythonToPlantUml
+
+
+def render(plant_uml) -> str:
+    return PythonToPlantUml.map_plant_uml_to_plant_uml_string(plant_uml)
+
+
+class PlantUmlBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        generator = PlantUmlGenerator()
+        self.texts = {}
+        for index in range(12):
+            folder = os.path.join(self.directory.name, 'nested' if index % 2 else '', 'deeper' if index % 3 else '')
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, 'diagram{0:02}.puml'.format(index))
+            self.texts[path] = generator.text(5) if index != 7 else '@startuml\nclass A {\n- x int\n}\n@enduml'
+            with open(path, 'w') as file:
+                file.write(self.texts[path])
+        with open(os.path.join(self.directory.name, 'notes.txt'), 'w') as file:
+            file.write('not a diagram')
+
+    def test_find_files_takes_a_directory_or_a_glob(self):
+        self.assertEqual(sorted(self.texts), find_files(self.directory.name))
+        self.assertEqual(sorted(path for path in self.texts if os.sep + 'nested' + os.sep in path),
+                         find_files(os.path.join(self.directory.name, 'nested', '**', '*.puml')))
+
+    def test_results_are_those_of_plant_uml_parser_in_path_order(self):
+        for processes, backend in ((1, 'tokens'), (1, 'parsy'), (2, 'tokens')):
+            with self.subTest(processes=processes, backend=backend):
+                # GIVEN
+                batch = BatchParser(processes=processes, chunk_size=5, backend=backend)
+
+                # WHEN
+                results = list(batch.parse_tree(self.directory.name))
+
+                # THEN
+                self.assertEqual(sorted(self.texts), [result.path for result in results])
+                for result in results:
+                    if result.path.endswith('diagram07.puml'):
+                        self.assertIsNone(result.plant_uml)
+                        self.assertTrue(result.error.startswith('ParseError: expected'))
+                    else:
+                        self.assertTrue(result.ok)
+                        self.assertEqual(render(PlantUmlParser.plant_uml_parser.parse(self.texts[result.path])),
+                                         render(result.plant_uml))
+                self.assertEqual((12, 1), (batch.stats.files, batch.stats.errors))
+
+    def test_unknown_backend(self):
+        with self.assertRaisesRegex(ValueError, "backend must be one of"):
+            BatchParser(backend='lark')
+
+    def test_results_are_picklable_and_unreadable_files_are_errors(self):
+        result = parse_file(os.path.join(self.directory.name, 'missing.puml'))
+        self.assertTrue(result.error.startswith('FileNotFoundError: '))
+        parsed = parse_file(sorted(self.texts)[0])
+        self.assertEqual(render(parsed.plant_uml), render(pickle.loads(pickle.dumps(parsed)).plant_uml))
+
+    def test_any_exception_of_a_backend_is_the_result_of_its_file(self):
+        # GIVEN
+        batch = BatchParser(processes=1)
+
+        # WHEN
+        with mock.patch('casestudytwo.python.PlantUmlBatch.parse_plant_uml', side_effect=RecursionError('too deep')):
+            results = list(batch.parse_tree(self.directory.name))
+
+        # THEN
+        self.assertEqual(['RecursionError: too deep'] * 12, [result.error for result in results])
+        self.assertEqual((12, 12), (batch.stats.files, batch.stats.errors))
+
+    def test_workers_build_the_grammar_only_for_the_parsy_backend(self):
+        for backend, builds in (('tokens', 0), ('parsy', 1)):
+            with self.subTest(backend=backend):
+                with mock.patch.object(PlantUmlParser, 'parsers') as parsers:
+                    _init_worker(backend)
+                self.assertEqual(builds, parsers.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 
+from parsy import ParseError
+
 from casestudytwo.python.PlantUmlParser import PlantUmlParser
 from casestudytwo.python.PythonToPlantUml import PythonToPlantUml
 from casestudytwo.python.SemanticModel import Access, Field, Parameter, PlantUml, NonAccessModifier, Method, \
@@ -637,5 +639,41 @@ ClassName o-- AbstractClassName : test
         self.assertEqual(result_string.strip(), plant_uml.strip())
 
 
+
+class MemberDispatchTest(unittest.TestCase):
+    # The members of class and interface bodies, which share access, modifier and name.
+    def test_abstract_method_member(self):
+        # GIVEN
+        method = "~ {abstract} testMethod(first: int): Unit"
+
+        # WHEN
+        result: Method = PlantUmlParser.body_concept_parser.parse(method)
+
+        # THEN
+        self.assertEqual(result.access, Access.packagePrivate)
+        self.assertEqual(result.name, "testMethod")
+        self.assertEqual(result.non_access_modifier, NonAccessModifier.ABSTRACT)
+        self.assertEqual(result.parameters[0].type, "int")
+
+    def test_members_parse_like_the_single_member_parsers(self):
+        for parser, member in [(PlantUmlParser.field_parser, "# {static} testField: String"),
+                               (PlantUmlParser.method_parser, "+ {abstract} testMethod(first: int): Unit"),
+                               (PlantUmlParser.constructor_parser, "- ClassName(first: int) <<Constructor>>")]:
+            with self.subTest(member=member):
+                expected, result = parser.parse(member), PlantUmlParser.body_concept_parser.parse(member)
+                self.assertIs(type(expected), type(result))
+                self.assertEqual([vars(parameter) for parameter in getattr(expected, 'parameters', [])],
+                                 [vars(parameter) for parameter in getattr(result, 'parameters', [])])
+                self.assertEqual({key: value for key, value in vars(expected).items() if key != 'parameters'},
+                                 {key: value for key, value in vars(result).items() if key != 'parameters'})
+
+    def test_constructors_take_no_modifier_and_are_no_interface_members(self):
+        for parser, member in [(PlantUmlParser.body_concept_parser, "+ {static} ClassName() <<Constructor>>"),
+                               (PlantUmlParser.interface_body_concept_parser, "+ ClassName() <<Constructor>>")]:
+            with self.subTest(member=member):
+                with self.assertRaises(ParseError):
+                    parser.parse(member)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from common.python.GrammarProfiler import GrammarProfiler
+
+
+class PlantUmlProfilerTest(unittest.TestCase):
+    def test_members_are_parsed_without_backtracking_over_their_names(self):
+        # GIVEN
+        plant_uml = '@startuml\nclass A {\n- x: int\n+ f(a: int): str\n+ A() <<Constructor>>\n}\nA *-- B\n@enduml'
+        original = PlantUmlParser.body_concept_parser.wrapped_fn
+
+        # WHEN
+        with GrammarProfiler(PlantUmlParser) as profiler:
+            PlantUmlParser.plant_uml_parser.parse(plant_uml)
+
+        # THEN
+        self.assertIs(original, PlantUmlParser.body_concept_parser.wrapped_fn)
+        stats = profiler.stats
+        self.assertEqual(len(plant_uml), stats['plant_uml_parser'].consumed)
+        self.assertEqual(4, stats['body_concept_parser'].calls)
+        self.assertEqual(1, stats['body_concept_parser'].backtracks)
+        # Access and name are parsed once per member; only what follows the name of the method is tried as a
+        # field, and only what follows the name of the constructor as a field and as a method.
+        self.assertEqual(4, stats['access_parser'].calls)
+        self.assertEqual(3, stats['member_name_parser'].calls)
+        self.assertEqual(2 + 1, stats['field_rest_parser'].backtracks + stats['method_rest_parser'].backtracks)
+        with self.assertRaises(RuntimeError):
+            with profiler:
+                with profiler:
+                    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import random
+import unittest
+from unittest import mock
+
+from parsy import Result
+
+from casestudytwo.benchmark.PlantUmlGenerator import DiagramShape, PlantUmlGenerator
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from casestudytwo.python.PlantUmlSession import PlantUmlSession
+from casestudytwo.python.PythonToPlantUml import PythonToPlantUml
+
+FRAGMENTS = ['class ', 'abstract ', 'enum ', 'interface ', 'A', 'b', '\n', ' ', '{', '}', '"', '"1"', ':', ': int',
+             '- ', '+ ', '{static} ', '(', ')', '): void', ' *-- ', ' <|-- ', ' : label', '@enduml', 'x']
+
+
+def render(plant_uml) -> str:
+    return PythonToPlantUml.map_plant_uml_to_plant_uml_string(plant_uml)
+
+
+def full_parse(text: str):
+    try:
+        return render(PlantUmlParser.plant_uml_parser.parse(text)), None
+    except Exception as error:
+        return None, (type(error), str(error))
+
+
+class PlantUmlSessionTest(unittest.TestCase):
+    plant_uml = '@startuml\nclass Car {\n- speed: int\n+ drive(to: Place): void\n}\nenum Color {\nRED\nBLUE\n}\n' \
+                'Car "1" *-- "many" Wheel : has\ninterface Place\n@enduml\n'
+
+    def test_edit_inside_one_class_reparses_only_that_class(self):
+        # GIVEN
+        session = PlantUmlSession(self.plant_uml)
+        plant_uml = session.plant_uml
+        car, color, place = plant_uml.classes[0], plant_uml.enums[0], plant_uml.interfaces[0]
+        start = self.plant_uml.index('speed')
+
+        # WHEN
+        session.edit(start, start + len('speed'), 'velocity')
+
+        # THEN
+        self.assertEqual(1, session.reparsed)
+        self.assertIs(plant_uml, session.plant_uml)
+        self.assertEqual('velocity', plant_uml.classes[0].fields[0].name)
+        self.assertIsNot(car, plant_uml.classes[0])
+        self.assertIs(color, plant_uml.enums[0])
+        self.assertIs(place, plant_uml.interfaces[0])
+        self.assertEqual(full_parse(session.text)[0], render(plant_uml))
+
+    def test_inserting_and_removing_concepts(self):
+        session = PlantUmlSession(self.plant_uml)
+        start = self.plant_uml.index('enum')
+        session.edit(start, start, 'abstract class Vehicle\n')
+        self.assertEqual(['Vehicle'], [entity.name for entity in session.plant_uml.abstract_classes])
+        # Car looked ahead at the line it is inserted on, to see that no class body follows.
+        self.assertEqual(2, session.reparsed)
+        session.edit(start, start + len('abstract class Vehicle\n'), '')
+        self.assertEqual([], session.plant_uml.abstract_classes)
+        self.assertEqual(full_parse(self.plant_uml)[0], render(session.plant_uml))
+
+    def test_errors_are_those_of_a_full_parse_and_keep_the_session(self):
+        session = PlantUmlSession(self.plant_uml)
+        model = render(session.plant_uml)
+        for start, end, replacement in [(0, 1, ''), (self.plant_uml.index('speed:'), self.plant_uml.index('speed:') + 6,
+                                                     'speed'), (len(self.plant_uml), len(self.plant_uml), 'class B')]:
+            with self.subTest(replacement=replacement):
+                text = self.plant_uml[:start] + replacement + self.plant_uml[end:]
+                with self.assertRaises(Exception) as expected:
+                    PlantUmlParser.plant_uml_parser.parse(text)
+                with self.assertRaises(type(expected.exception)) as result:
+                    session.edit(start, end, replacement)
+                self.assertEqual(str(expected.exception), str(result.exception))
+                self.assertEqual((self.plant_uml, model), (session.text, render(session.plant_uml)))
+
+    def test_texts_the_concept_parse_rejects_fall_back_to_a_full_parse(self):
+        # GIVEN
+        session = PlantUmlSession(self.plant_uml)
+        start = self.plant_uml.index('speed')
+        concept_parser = PlantUmlParser.concept_parser
+        for failing_calls in [1, 10_000]:
+            with self.subTest(failing_calls=failing_calls):
+                calls = iter(range(failing_calls))
+
+                def rejecting_concept_parser(text, index):
+                    if next(calls, None) is not None:
+                        return Result.failure(index, 'a concept')
+                    return concept_parser(text, index)
+
+                # WHEN the concept parse rejects the text once, or every time
+                with mock.patch.object(PlantUmlParser, 'concept_parser', rejecting_concept_parser):
+                    session.edit(start, start + 1, 's')
+
+                # THEN
+                self.assertEqual(full_parse(session.text)[0], render(session.plant_uml))
+                session.edit(start, start + len('speed'), 'velocity')
+                self.assertEqual(full_parse(session.text)[0], render(session.plant_uml))
+                session.edit(start, start + len('velocity'), 'speed')
+
+    def test_random_edit_sequences_match_a_full_parse(self):
+        generator = random.Random(24)
+        for seed in range(60):
+            session = PlantUmlSession(PlantUmlGenerator(DiagramShape(members=4), seed=seed).text(8))
+            for _ in range(20):
+                start = generator.randint(0, len(session.text))
+                end = min(len(session.text), start + generator.choice([0, 0, 1, 2, 5, 20]))
+                replacement = ''.join(generator.choice(FRAGMENTS) for _ in range(generator.randint(0, 2)))
+                text = session.text[:start] + replacement + session.text[end:]
+                expected, error = full_parse(text)
+                try:
+                    session.edit(start, end, replacement)
+                except Exception as raised:
+                    self.assertEqual(error, (type(raised), str(raised)), text)
+                    continue
+                self.assertEqual((expected, None), (render(session.plant_uml), error), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
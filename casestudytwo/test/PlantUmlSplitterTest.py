@@ -0,0 +1,72 @@
+import unittest
+
+from parsy import ParseError
+
+from casestudytwo.benchmark.PlantUmlGenerator import DiagramShape, PlantUmlGenerator
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from casestudytwo.python.PlantUmlSplitter import ConceptChunk, concept_starts, parse_chunk, parse_parallel, \
+    split_concepts
+from casestudytwo.python.PythonToPlantUml import PythonToPlantUml
+
+
+def render(plant_uml) -> str:
+    return PythonToPlantUml.map_plant_uml_to_plant_uml_string(plant_uml)
+
+
+class PlantUmlSplitterTest(unittest.TestCase):
+    plant_uml = '@startuml\nclass Car {\n- speed: int\n}\nenum Color {\nRED\n}\n' \
+                'Car "1\nor more" *-- Wheel\n  abstract class Place\n@enduml\n'
+
+    def test_concepts_start_at_top_level_lines_that_start_with_a_word(self):
+        starts = list(concept_starts(self.plant_uml))
+        self.assertEqual([['class', 'Car'], ['enum', 'Color'], ['Car', '"1'], ['abstract', 'class']],
+                         [self.plant_uml[start:].split(maxsplit=2)[:2] for start in starts])
+
+    def test_chunks_keep_the_source_offsets_of_their_concepts(self):
+        # GIVEN
+        text = PlantUmlGenerator().text(30)
+        start = PlantUmlParser.start_uml_parser(text, 0).index
+
+        # WHEN
+        chunks = split_concepts(text, start, 200)
+
+        # THEN
+        self.assertEqual(start, chunks[0].start)
+        self.assertEqual([chunk.stop for chunk in chunks[:-1]], [chunk.start for chunk in chunks[1:]])
+        self.assertIsNone(chunks[-1].stop)
+        concepts = [concept for chunk in chunks for concept in parse_chunk(text, chunk)[0]]
+        self.assertEqual(30, len(concepts))
+
+    def test_parallel_parse_is_the_parse_of_plant_uml_parser(self):
+        for seed in range(3):
+            text = PlantUmlGenerator(DiagramShape(members=10), seed=seed).text(40)
+            expected = render(PlantUmlParser.plant_uml_parser.parse(text))
+            for processes, chunk_size in ((1, 1), (1, 500), (2, 500)):
+                with self.subTest(seed=seed, processes=processes, chunk_size=chunk_size):
+                    self.assertEqual(expected, render(parse_parallel(text, processes, chunk_size)))
+
+    def test_a_chunk_cut_inside_a_concept_is_parsed_again_as_a_whole(self):
+        # GIVEN a label on the line after its dependency, which looks like a dependency of its own
+        text = '@startuml\nA *-- B :\nC *-- D\n@enduml'
+
+        # WHEN
+        chunks = split_concepts(text, len('@startuml\n'), 1)
+
+        # THEN
+        self.assertEqual(ConceptChunk(10, 20), chunks[0])
+        self.assertNotEqual(20, parse_chunk(text, chunks[0])[1])
+        self.assertEqual(render(PlantUmlParser.plant_uml_parser.parse(text)), render(parse_parallel(text, 1, 1)))
+
+    def test_errors_are_those_of_plant_uml_parser(self):
+        for text in ['class A', self.plant_uml.replace('@enduml', ''), self.plant_uml + 'class B',
+                     self.plant_uml.replace('speed:', 'speed'), self.plant_uml.replace('}\nenum', '\nenum')]:
+            with self.subTest(text=text):
+                with self.assertRaises(ParseError) as expected:
+                    PlantUmlParser.plant_uml_parser.parse(text)
+                with self.assertRaises(ParseError) as parallel:
+                    parse_parallel(text, 1, 1)
+                self.assertEqual(str(expected.exception), str(parallel.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import io
+import unittest
+
+from parsy import ParseError
+
+from casestudytwo.benchmark.PlantUmlGenerator import DiagramShape, PlantUmlGenerator
+from casestudytwo.python.PlantUmlParser import PlantUmlParser
+from casestudytwo.python.PlantUmlStream import iter_concepts, parse_stream
+from casestudytwo.python.PythonToPlantUml import PythonToPlantUml
+from casestudytwo.python.SemanticModel import Dependency, Entity, Enumeration
+from casestudytwo.python.SemanticModelBuilder import PlantUmlSink
+
+
+def render(plant_uml) -> str:
+    return PythonToPlantUml.map_plant_uml_to_plant_uml_string(plant_uml)
+
+
+def pieces(text: str, size: int):
+    return (text[index:index + size] for index in range(0, len(text), size))
+
+
+class PlantUmlStreamTest(unittest.TestCase):
+    plant_uml = '@startuml\nclass Car {\n- speed: int\n+ drive(to: Place): void\n}\nenum Color {\nRED\nBLUE\n}\n' \
+                'Car "1" *-- "many" Wheel : has\ninterface Place\n@enduml\n'
+
+    def test_concepts_are_yielded_in_order(self):
+        concepts = list(iter_concepts(io.StringIO(self.plant_uml)))
+        self.assertEqual([Entity, Enumeration, Dependency, Entity], [type(concept) for concept in concepts])
+        self.assertEqual(['Car', 'Color', 'Place'], [concept.name for concept in concepts
+                                                     if not isinstance(concept, Dependency)])
+        self.assertTrue(concepts[-1].is_interface)
+
+    def test_concepts_are_yielded_before_the_document_is_read(self):
+        # GIVEN
+        lines = PlantUmlGenerator().text(1000).splitlines(keepends=True)
+        read = []
+
+        def source():
+            for line in lines:
+                read.append(line)
+                yield line
+
+        # WHEN
+        concepts = iter_concepts(source())
+        first, second = next(concepts), next(concepts)
+
+        # THEN
+        self.assertIsNot(first, second)
+        self.assertLess(len(read), len(lines) / 10)
+        self.assertEqual(998, sum(1 for _ in concepts))
+        self.assertEqual(len(lines), len(read))
+
+    def test_the_sink_builds_the_model_of_plant_uml_parser(self):
+        for seed in range(5):
+            text = PlantUmlGenerator(DiagramShape(members=10), seed=seed).text(40)
+            expected = render(PlantUmlParser.plant_uml_parser.parse(text))
+            for source in (text, io.StringIO(text), pieces(text, 7)):
+                with self.subTest(seed=seed, source=type(source).__name__):
+                    sink = PlantUmlSink()
+                    self.assertEqual(40, sum(1 for _ in iter_concepts(source, sink)))
+                    self.assertEqual(expected, render(sink.model))
+        self.assertEqual(render(PlantUmlParser.plant_uml_parser.parse(self.plant_uml)),
+                         render(parse_stream(pieces(self.plant_uml, 1))))
+
+    def test_a_quoted_cardinality_may_span_lines(self):
+        text = '@startuml\nCar "one\nor more" *-- Wheel\n@enduml'
+        self.assertEqual(render(PlantUmlParser.plant_uml_parser.parse(text)),
+                         render(parse_stream(io.StringIO(text))))
+
+    def test_errors_are_those_of_plant_uml_parser(self):
+        for text in ['class A', '@startuml\nclass A {\n- x int\n}\n@enduml', self.plant_uml.replace('@enduml', ''),
+                     self.plant_uml + 'class B', self.plant_uml.replace('drive(to', 'drive((to'),
+                     self.plant_uml.replace('@enduml', '@end'), self.plant_uml.replace('@enduml', '@enduml x'),
+                     self.plant_uml + ' ' * 10_000 + '@enduml']:
+            with self.subTest(text=text):
+                with self.assertRaises(ParseError) as expected:
+                    PlantUmlParser.plant_uml_parser.parse(text)
+                with self.assertRaises(ParseError) as streamed:
+                    parse_stream(pieces(text, 3))
+                self.assertEqual(str(expected.exception), str(streamed.exception))
+
+
+    def test_the_stream_is_read_only_up_to_a_section_after_the_end_of_the_document(self):
+        # GIVEN a document followed by a large section of something else
+        read = []
+
+        def source():
+            yield self.plant_uml
+            for _ in range(1000):
+                read.append(1)
+                yield 'x' * 4096
+
+        # WHEN
+        with self.assertRaises(ParseError) as streamed:
+            parse_stream(source())
+
+        # THEN
+        self.assertLess(len(read), 4)
+        with self.assertRaises(ParseError) as expected:
+            PlantUmlParser.plant_uml_parser.parse(self.plant_uml + 'x')
+        self.assertEqual(str(expected.exception), str(streamed.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+from typing import Dict, Optional, Tuple
+
+from parsy import Parser, Result
+
+# A branch is (keys, parser). A parser with keys has to start by matching one of them with string(), so that it
+# fails right where it starts whenever the input there does not begin with a key. A parser without keys is always
+# tried. Branches are kept in order and failures are merged like parsy's alt does, so results and error messages
+# are the same as with parser | parser | ..., but branches whose keys cannot match are never called.
+Branch = Tuple[Optional[Tuple[str, ...]], Parser]
+Step = Tuple[Optional[Parser], Optional[Tuple[str, ...]], frozenset]
+
+
+def dispatch(*branches: Branch) -> Parser:
+    plans: Dict[str, Tuple[Step, ...]] = {}
+
+    def build_plans():
+        # Built on the first parse, as branches may be forward declarations that become parsers later on.
+        first_chars = {key[0] for keys, _ in branches if keys is not None for key in keys}
+        expected = [None if keys is None else first_token_expected(parser) for keys, parser in branches]
+        plan_by_char = {char: plan(char, expected) for char in first_chars}
+        plan_by_char[None] = plan(None, expected)
+        plans.update(plan_by_char)
+
+    def plan(char: Optional[str], expected) -> Tuple[Step, ...]:
+        steps = []
+        for (keys, parser), failure in zip(branches, expected):
+            if keys is not None:
+                keys = tuple(key for key in keys if key[0] == char)
+            if keys == ():
+                if steps and steps[-1][0] is None:
+                    steps[-1] = (None, None, steps[-1][2] | failure)
+                else:
+                    steps.append((None, None, failure))
+            else:
+                steps.append((parser, keys, failure))
+        return tuple(steps)
+
+    @Parser
+    def dispatch_parser(stream, index: int) -> Result:
+        if not plans:
+            build_plans()
+        result = None
+        for parser, keys, expected in plans.get(stream[index:index + 1]) or plans[None]:
+            if parser is None or (keys is not None and not stream.startswith(keys, index)):
+                result = Result(False, -1, None, index, expected).aggregate(result)
+            else:
+                result = parser(stream, index).aggregate(result)
+                if result.status:
+                    return result
+        return result
+
+    return dispatch_parser
+
+
+def first_token_expected(parser: Parser) -> frozenset:
+    result = parser('', 0)
+    if result.status or result.furthest != 0:
+        raise ValueError("a branch with keys has to fail at its start on input without them")
+    return result.expected
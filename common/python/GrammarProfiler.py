@@ -0,0 +1,133 @@
+import time
+from typing import Dict, List, TextIO, Tuple
+
+# Profiling swaps the function inside every named parsy parser for one that measures it, and puts the original
+# back afterwards. The combinators call their children through Parser.__call__, which looks the function up on
+# every call, so the grammar is measured as built and a grammar that is not being profiled runs untouched.
+
+SORT_KEYS = ('self_seconds', 'cumulative_seconds', 'calls', 'backtracks', 'repeats', 'consumed')
+
+
+class ParserStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        # Calls that failed, after which the calling combinator goes back to where this parser started.
+        self.backtracks = 0
+        # Calls at an index of the same parse this parser had already been tried at.
+        self.repeats = 0
+        self.cumulative_seconds = 0.0
+        self.self_seconds = 0.0
+        # Characters of a str input, bytes of a bytes input, taken by the successful calls.
+        self.consumed = 0
+        self.active = 0
+        self.parse_number = 0
+        self.visited = set()
+
+    def __str__(self):
+        return "{0:<36} {1:>9} {2:>10} {3:>9} {4:>13.3f} {5:>10.3f} {6:>10}".format(
+            self.name, self.calls, self.backtracks, self.repeats, self.cumulative_seconds * 1000,
+            self.self_seconds * 1000, self.consumed)
+
+
+class GrammarProfiler:
+    """Measures the named parsers of a LazyGrammar class while used as a context manager.
+
+    Not thread safe: parse in one thread only while the profiler is active.
+    """
+
+    def __init__(self, grammar: type):
+        self.grammar = grammar
+        self.stats: Dict[str, ParserStats] = {}
+        # Self time per stack of parser names, as flamegraph.pl reads them from collapsed stacks.
+        self.stacks: Dict[Tuple[str, ...], float] = {}
+        self.originals: List[Tuple[object, object]] = []
+        self.path: List[str] = []
+        self.child_seconds: List[float] = []
+        self.parses = [0]
+
+    def __enter__(self) -> 'GrammarProfiler':
+        if self.originals:
+            raise RuntimeError("the profiler is already active")
+        instrumented = set()
+        for name, parser in self.grammar.parsers().items():
+            # forward_declaration.become shares __dict__, so the same function can sit on two parser objects.
+            if id(parser.__dict__) in instrumented:
+                continue
+            instrumented.add(id(parser.__dict__))
+            self.originals.append((parser, parser.wrapped_fn))
+            parser.wrapped_fn = self.instrument(name, parser.wrapped_fn)
+        return self
+
+    def __exit__(self, *exception):
+        for parser, original in reversed(self.originals):
+            parser.wrapped_fn = original
+        self.originals = []
+
+    def instrument(self, name: str, parse):
+        stats = self.stats.setdefault(name, ParserStats(name))
+        stacks, path, child_seconds, parses = self.stacks, self.path, self.child_seconds, self.parses
+        clock = time.perf_counter
+
+        def profiled(stream, index):
+            stats.calls += 1
+            if not path:
+                parses[0] += 1
+            if stats.parse_number != parses[0]:
+                stats.parse_number, stats.visited = parses[0], set()
+            if index in stats.visited:
+                stats.repeats += 1
+            else:
+                stats.visited.add(index)
+            path.append(name)
+            child_seconds.append(0.0)
+            stats.active += 1
+            started = clock()
+            try:
+                result = parse(stream, index)
+            finally:
+                elapsed = clock() - started
+                stats.active -= 1
+                own = elapsed - child_seconds.pop()
+                stats.self_seconds += own
+                # A parser that (indirectly) calls itself counts its time once, at the outermost call.
+                if not stats.active:
+                    stats.cumulative_seconds += elapsed
+                key = tuple(path)
+                stacks[key] = stacks.get(key, 0.0) + own
+                path.pop()
+                if child_seconds:
+                    child_seconds[-1] += elapsed
+            if result.status:
+                stats.consumed += result.index - index
+            else:
+                stats.backtracks += 1
+            return result
+
+        return profiled
+
+    def sorted_stats(self, key: str = 'self_seconds') -> List[ParserStats]:
+        if key not in SORT_KEYS:
+            raise ValueError("key must be one of {0}, got {1!r}".format(SORT_KEYS, key))
+        return sorted((stats for stats in self.stats.values() if stats.calls),
+                      key=lambda stats: getattr(stats, key), reverse=True)
+
+    def report(self, key: str = 'self_seconds') -> str:
+        header = "{0:<36} {1:>9} {2:>10} {3:>9} {4:>13} {5:>10} {6:>10}".format(
+            'parser', 'calls', 'backtracks', 'repeats', 'cumulative ms', 'self ms', 'consumed')
+        return '\n'.join([header] + [str(stats) for stats in self.sorted_stats(key)]) + '\n'
+
+    def write_collapsed(self, output: TextIO):
+        # One "outer;inner microseconds" line per stack, the input format of flamegraph.pl and speedscope.
+        for stack, seconds in sorted(self.stacks.items()):
+            microseconds = round(seconds * 1_000_000)
+            if microseconds:
+                output.write('{0} {1}\n'.format(';'.join(stack), microseconds))
+
+    def clear(self):
+        for stats in self.stats.values():
+            stats.reset()
+        self.stacks.clear()
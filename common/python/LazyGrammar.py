@@ -0,0 +1,26 @@
+from threading import RLock
+
+
+class LazyGrammar(type):
+    """Metaclass for grammars whose parsers are built, and parsy imported, only when one is first used.
+
+    The class defines a staticmethod build_grammar returning the parsers by name; on the first access to an
+    attribute the class lacks, they are all set as class attributes, so later accesses are plain lookups.
+    """
+
+    _lock = RLock()
+
+    def __getattr__(cls, name: str):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        cls.parsers()
+        return type.__getattribute__(cls, name)
+
+    def parsers(cls) -> dict:
+        with LazyGrammar._lock:
+            if '_grammar_parsers' not in cls.__dict__:
+                parsers = type.__getattribute__(cls, 'build_grammar')()
+                for parser_name, parser in parsers.items():
+                    setattr(cls, parser_name, parser)
+                cls._grammar_parsers = parsers
+        return cls._grammar_parsers